@@ -0,0 +1,104 @@
+import os
+from asyncio import get_running_loop
+from hashlib import sha256
+from logging import getLogger
+from shutil import rmtree
+from tempfile import NamedTemporaryFile
+from time import time
+from typing import Any, Callable, Final, Optional
+from uuid import uuid4
+
+from oaff.app.cache.page_cache import PageCache
+
+LOGGER: Final = getLogger(__file__)
+
+
+class FilePageCache(PageCache):
+    """
+    Holds pages as files in a directory shared by every worker on a host.
+    Placing the directory on a memory-backed file system such as /dev/shm avoids
+    disk I/O. Files are replaced atomically, so workers never read partial pages.
+    """
+
+    # puts between removals of expired pages from a layer's directory
+    SWEEP_INTERVAL: Final = 100
+
+    def __init__(self, ttl: int, directory: str):
+        super().__init__(ttl)
+        self.directory = directory
+        self._puts = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    async def get(self, layer_id: str, key: str) -> Optional[bytes]:
+        return await self._run(self._read, self._page_path(layer_id, key))
+
+    async def put(self, layer_id: str, key: str, page: bytes) -> None:
+        self._puts += 1
+        await self._run(
+            self._write,
+            self._layer_path(layer_id),
+            self._page_path(layer_id, key),
+            page,
+            self._puts % self.SWEEP_INTERVAL == 0,
+        )
+
+    async def invalidate(self, layer_id: Optional[str] = None) -> None:
+        await self._run(
+            self._remove, self._layer_path(layer_id) if layer_id is not None else None
+        )
+
+    def _read(self, page_path: str) -> Optional[bytes]:
+        try:
+            with open(page_path, "rb") as page_file:
+                if os.fstat(page_file.fileno()).st_mtime + self.ttl < time():
+                    return None
+                return page_file.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, layer_path: str, page_path: str, page: bytes, sweep: bool) -> None:
+        try:
+            os.makedirs(layer_path, exist_ok=True)
+            with NamedTemporaryFile(dir=layer_path, prefix=".", delete=False) as temp:
+                temp.write(page)
+            os.replace(temp.name, page_path)
+            if sweep:
+                self._sweep(layer_path)
+        except OSError as e:
+            # the layer may have been invalidated mid-write, the page is not needed
+            LOGGER.debug(f"page not cached: {e}")
+
+    def _sweep(self, layer_path: str) -> None:
+        expired_before = time() - self.ttl
+        for entry in os.scandir(layer_path):
+            try:
+                if entry.stat().st_mtime < expired_before:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _remove(self, layer_path: Optional[str]) -> None:
+        for path in (
+            [layer_path]
+            if layer_path is not None
+            else [entry.path for entry in os.scandir(self.directory)]
+        ):
+            # renaming first removes the pages from use at once for every worker
+            removed_path = f"{path}.{uuid4().hex}.removed"
+            try:
+                os.rename(path, removed_path)
+            except OSError:
+                continue
+            rmtree(removed_path, ignore_errors=True)
+
+    def _layer_path(self, layer_id: str) -> str:
+        return os.path.join(self.directory, sha256(layer_id.encode("utf-8")).hexdigest())
+
+    def _page_path(self, layer_id: str, key: str) -> str:
+        return os.path.join(
+            self._layer_path(layer_id), sha256(key.encode("utf-8")).hexdigest()
+        )
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        # file system calls block, so run outside the event loop
+        return await get_running_loop().run_in_executor(None, function, *args)
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from typing import Any, Callable, Final, Hashable, Optional
+from weakref import WeakSet
+
+_instances: Final["WeakSet[LruCache]"] = WeakSet()
+
+
+class LruCache:
+    """
+    In-process cache that evicts the least recently used entry once max_size entries
+    are held. A max_size of 0 disables caching.
+    Intended for use from the event loop only, so no locking is applied.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        # counts clears, so values computed before a clear can be recognised as stale
+        self.generation = 0
+        _instances.add(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.generation += 1
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> None:
+        # removes the entries whose keys match, values being computed are also stale
+        for key in [key for key in self._entries.keys() if predicate(key)]:
+            del self._entries[key]
+        self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def clear_lru_caches() -> None:
+    # cached content derives from layer configuration, so is discarded on discovery
+    for cache in list(_instances):
+        cache.clear()
@@ -0,0 +1,38 @@
+from time import monotonic
+from typing import Dict, Optional
+
+from oaff.app.cache.lru_cache import LruCache
+from oaff.app.cache.page_cache import PageCache
+
+
+class MemoryPageCache(PageCache):
+    """
+    Holds pages in the worker process, so each worker has its own cache.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        super().__init__(ttl)
+        self._pages = LruCache(max_size)
+        # invalidated pages are left to expire or be evicted rather than searched for
+        self._layer_generations: Dict[str, int] = dict()
+
+    async def get(self, layer_id: str, key: str) -> Optional[bytes]:
+        entry = self._pages.get(self._key(layer_id, key))
+        if entry is None:
+            return None
+        expires, page = entry
+        return page if monotonic() < expires else None
+
+    async def put(self, layer_id: str, key: str, page: bytes) -> None:
+        self._pages.put(self._key(layer_id, key), (monotonic() + self.ttl, page))
+
+    async def invalidate(self, layer_id: Optional[str] = None) -> None:
+        if layer_id is None:
+            self._pages.clear()
+        else:
+            self._layer_generations[layer_id] = (
+                self._layer_generations.get(layer_id, 0) + 1
+            )
+
+    def _key(self, layer_id: str, key: str):
+        return (layer_id, self._layer_generations.get(layer_id, 0), key)
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Optional
+
+
+class PageCacheType(str, Enum):
+    NONE = "none"
+    MEMORY = "memory"
+    FILE = "file"
+    REDIS = "redis"
+
+
+class PageCache(ABC):
+    """
+    Stores encoded item pages for ttl seconds, grouped by layer so that a layer's
+    pages can be discarded together when its data or configuration changes.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @abstractmethod
+    async def get(self, layer_id: str, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def put(self, layer_id: str, key: str, page: bytes) -> None:
+        pass
+
+    @abstractmethod
+    async def invalidate(self, layer_id: Optional[str] = None) -> None:
+        # discards a single layer's pages, or every page if no layer is given
+        pass
+
+    async def close(self) -> None:
+        pass
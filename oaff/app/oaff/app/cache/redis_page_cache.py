@@ -0,0 +1,54 @@
+from hashlib import sha256
+from typing import Final, Optional
+
+from redis.asyncio import Redis
+
+from oaff.app.cache.page_cache import PageCache
+
+
+class RedisPageCache(PageCache):
+    """
+    Holds pages in a Redis-compatible server, which may be shared by several hosts.
+    Requires the optional redis dependency.
+    """
+
+    KEY_PREFIX: Final = "oaff:page"
+    # keys removed per round trip during invalidation
+    INVALIDATION_BATCH: Final = 500
+
+    def __init__(self, ttl: int, url: str):
+        super().__init__(ttl)
+        self.redis = Redis.from_url(url)
+
+    async def get(self, layer_id: str, key: str) -> Optional[bytes]:
+        return await self.redis.get(self._key(layer_id, key))
+
+    async def put(self, layer_id: str, key: str, page: bytes) -> None:
+        await self.redis.set(self._key(layer_id, key), page, ex=self.ttl)
+
+    async def invalidate(self, layer_id: Optional[str] = None) -> None:
+        pattern = (
+            f"{self._layer_prefix(layer_id)}:*"
+            if layer_id is not None
+            else f"{self.KEY_PREFIX}:*"
+        )
+        keys = []
+        async for key in self.redis.scan_iter(
+            match=pattern, count=self.INVALIDATION_BATCH
+        ):
+            keys.append(key)
+            if len(keys) == self.INVALIDATION_BATCH:
+                await self.redis.unlink(*keys)
+                keys = []
+        if len(keys) > 0:
+            await self.redis.unlink(*keys)
+
+    async def close(self) -> None:
+        await self.redis.close()
+
+    def _layer_prefix(self, layer_id: str) -> str:
+        # hashing keeps glob characters in layer IDs out of invalidation patterns
+        return f"{self.KEY_PREFIX}:{sha256(layer_id.encode('utf-8')).hexdigest()}"
+
+    def _key(self, layer_id: str, key: str) -> str:
+        return f"{self._layer_prefix(layer_id)}:{sha256(key.encode('utf-8')).hexdigest()}"
@@ -1,83 +1,306 @@
+from asyncio import Task, create_task, gather, wait
+from functools import partial
 from logging import getLogger
-from threading import Lock
-from typing import Dict, Final, List
+from types import MappingProxyType
+from typing import (
+    Dict,
+    Final,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from oaff.app import settings
+from oaff.app.cache.lru_cache import clear_lru_caches
+from oaff.app.configuration.page_cache import (
+    close_page_cache,
+    configure_page_cache,
+    invalidate_pages,
+)
 from oaff.app.data.sources.common.data_source import DataSource
 from oaff.app.data.sources.common.layer import Layer
+from oaff.app.data.sources.common.request_limiter import RequestLimiter
+from oaff.app.responses.collection_fragment import prepare_collection_fragments
 
 LOGGER: Final = getLogger(__file__)
-_data_sources: Final[Dict[str, DataSource]] = dict()
-_data_sources_lock: Final = Lock()
-_layers: Final[Dict[str, Layer]] = dict()
-_layers_lock: Final = Lock()
 
 
-async def discover() -> None:  # noqa: C901
-    with _data_sources_lock:
-        for data_source in _data_sources.values():
-            await data_source.disconnect()
-        _data_sources.clear()
-        for data_source_type in settings.DATA_SOURCE_TYPES():
-            manager = None
-            if data_source_type == "postgresql":
-                try:
-                    from oaff.app.data.sources.postgresql.postgresql_manager import (
-                        PostgresqlManager,
-                    )
-
-                    manager = PostgresqlManager()
-                except Exception as e:
-                    LOGGER.error(f"error creating data source manager: {e}")
-                    continue
-            else:
-                LOGGER.warning(f"Unknown data source type {data_source_type}")
-                continue
+class _Registry(NamedTuple):
+    data_sources: Mapping[str, DataSource]
+    layers: Mapping[str, Layer]
+    # layers in the order collections are listed, by title
+    collections: Tuple[Layer, ...]
+    # IDs of data sources whose layers are configured
+    started: FrozenSet[str]
 
-            try:
-                for data_source in manager.get_data_sources():
-                    _data_sources[data_source.id] = data_source
-            except Exception as e:
-                LOGGER.error(f"error retrieving data sources from manager: {e}")
 
-    with _layers_lock:
-        _layers.clear()
-        for data_source in _data_sources.values():
-            LOGGER.info(f"initializing data source {data_source.name}")
-            try:
-                await data_source.initialize()
-            except Exception as e:
-                LOGGER.error(f"error initializing {data_source.name}: {e}")
-                continue
-            LOGGER.info(f"configuring layers in {data_source.name}")
+def _create_registry(
+    data_sources: Dict[str, DataSource],
+    layers: Dict[str, Layer],
+    started: FrozenSet[str],
+) -> _Registry:
+    return _Registry(
+        MappingProxyType(data_sources),
+        MappingProxyType(layers),
+        # data sources start concurrently, so their discovery order varies and
+        # layer IDs are hashes; titles give a stable order meaningful to users
+        tuple(sorted(layers.values(), key=lambda layer: (layer.title, layer.id))),
+        started,
+    )
+
+
+# a published registry cannot be modified. Discovery builds its replacement and
+# publishes it with a single assignment, so requests read it without locking
+_registry: _Registry = _create_registry(dict(), dict(), frozenset())
+# data sources still connecting continue to start after discovery returns
+_startup_tasks: Final[Set[Task]] = set()
+# retired data sources still serving requests disconnect once these complete
+_retirements: Final[Set[Task]] = set()
+# counts full discoveries, so that one superseded by a later call is discarded
+_discoveries = 0
+
+
+async def discover(incremental: bool = False) -> None:
+    global _discoveries
+    if incremental and len(_registry.started) > 0:
+        await _rediscover()
+        return
+    _discoveries += 1
+    discovery = _discoveries
+    await _cancel_startup()
+    data_sources = _create_data_sources()
+    startup_tasks = {
+        data_source_id: create_task(_start(data_source))
+        for data_source_id, data_source in data_sources.items()
+    }
+    for startup_task in startup_tasks.values():
+        _startup_tasks.add(startup_task)
+        startup_task.add_done_callback(_startup_tasks.discard)
+    if len(startup_tasks) > 0:
+        # sources are initialized concurrently and healthy sources are served
+        # without waiting on those that are slow or unavailable
+        await wait(startup_tasks.values(), timeout=settings.DATA_SOURCE_STARTUP_WAIT())
+    if discovery != _discoveries:
+        await _disconnect(data_sources.values())
+        return
+
+    layers: Dict[str, Layer] = dict()
+    started: Set[str] = set()
+    for data_source_id, startup_task in startup_tasks.items():
+        if not startup_task.done():
+            startup_task.add_done_callback(
+                partial(_register_late_start, data_sources[data_source_id])
+            )
+        elif not startup_task.cancelled() and startup_task.result() is not None:
+            _add_layers(layers, data_sources[data_source_id], startup_task.result())
+            started.add(data_source_id)
+    # the previous data sources serve requests until the new registry is published
+    retired_data_sources = _registry.data_sources.values()
+    previous_layers = _registry.layers
+    _publish(_create_registry(data_sources, layers, frozenset(started)))
+    for data_source_id in started:
+        data_sources[data_source_id].layers_published()
+    await _retire(retired_data_sources)
+    await configure_page_cache()
+    await _invalidate_changed_pages(previous_layers, _registry.layers)
+
+
+def _create_data_sources() -> Dict[str, DataSource]:
+    data_sources: Dict[str, DataSource] = dict()
+    for data_source_type in settings.DATA_SOURCE_TYPES():
+        manager = None
+        if data_source_type == "postgresql":
             try:
-                layers = await data_source.get_layers()
+                from oaff.app.data.sources.postgresql.postgresql_manager import (
+                    PostgresqlManager,
+                )
+
+                manager = PostgresqlManager()
             except Exception as e:
-                LOGGER.error(f"error configuring layers for {data_source.name}: {e}")
+                LOGGER.error(f"error creating data source manager: {e}")
                 continue
-            for layer in layers:
-                if layer.id in _layers:
-                    LOGGER.warning(
-                        f"layer ID clash on {layer.id}, latest wins ({data_source.name})"
-                    )
-                _layers[layer.id] = layer
+        else:
+            LOGGER.warning(f"Unknown data source type {data_source_type}")
+            continue
+
+        try:
+            for data_source in manager.get_data_sources():
+                data_sources[data_source.id] = data_source
+        except Exception as e:
+            LOGGER.error(f"error retrieving data sources from manager: {e}")
+    return data_sources
+
+
+async def _start(data_source: DataSource) -> Optional[List[Layer]]:
+    LOGGER.info(f"initializing data source {data_source.name}")
+    try:
+        await data_source.initialize()
+    except Exception as e:
+        LOGGER.error(f"error initializing {data_source.name}: {e}")
+        return None
+    return await _get_layers(data_source)
+
+
+def _register_late_start(data_source: DataSource, startup_task: Task) -> None:
+    if startup_task.cancelled() or startup_task.result() is None:
+        return
+    # a later discovery may have replaced the data source while it started
+    if _registry.data_sources.get(data_source.id) is data_source:
+        _publish(_with_layers(_registry, data_source, startup_task.result()))
+        data_source.layers_published()
+
+
+async def _rediscover() -> None:
+    # started data sources keep their connections and rediscover their layers,
+    # while any still starting register their layers when ready
+    data_sources = [
+        _registry.data_sources[data_source_id] for data_source_id in _registry.started
+    ]
+    rediscovered = await gather(
+        *[_get_layers(data_source) for data_source in data_sources]
+    )
+    previous_layers = _registry.layers
+    registry = _registry
+    published: List[DataSource] = list()
+    for data_source, layers in zip(data_sources, rediscovered):
+        # a source that fails to rediscover keeps its previous layers
+        if (
+            layers is not None
+            and registry.data_sources.get(data_source.id) is data_source
+        ):
+            registry = _with_layers(registry, data_source, layers)
+            published.append(data_source)
+    _publish(registry)
+    for data_source in published:
+        data_source.layers_published()
+    await _invalidate_changed_pages(previous_layers, registry.layers)
+
+
+async def _get_layers(data_source: DataSource) -> Optional[List[Layer]]:
+    LOGGER.info(f"configuring layers in {data_source.name}")
+    try:
+        return await data_source.get_layers()
+    except Exception as e:
+        LOGGER.error(f"error configuring layers for {data_source.name}: {e}")
+        return None
+
+
+def update_layers(data_source: DataSource, layers: List[Layer]) -> None:
+    # publishes revised layers of a configured data source, such as refined extents
+    if _registry.data_sources.get(data_source.id) is data_source:
+        _publish(_with_layers(_registry, data_source, layers))
+
+
+def _with_layers(
+    registry: _Registry, data_source: DataSource, layers: List[Layer]
+) -> _Registry:
+    # a copy of the registry in which the source's previous layers are replaced
+    registry_layers = {
+        layer_id: layer
+        for layer_id, layer in registry.layers.items()
+        if layer.data_source_id != data_source.id
+    }
+    _add_layers(registry_layers, data_source, layers)
+    return _create_registry(
+        dict(registry.data_sources),
+        registry_layers,
+        registry.started | {data_source.id},
+    )
+
+
+def _add_layers(
+    registry_layers: Dict[str, Layer], data_source: DataSource, layers: List[Layer]
+) -> None:
+    for layer in layers:
+        if layer.id in registry_layers:
+            LOGGER.warning(
+                f"layer ID clash on {layer.id}, latest wins ({data_source.name})"
+            )
+        registry_layers[layer.id] = layer
+
+
+async def _invalidate_changed_pages(
+    previous_layers: Mapping[str, Layer], layers: Mapping[str, Layer]
+) -> None:
+    # pages may be shared with other workers, so only those of layers that were
+    # removed or changed are discarded. A worker starting without layers keeps them
+    for layer_id, previous_layer in previous_layers.items():
+        layer = layers.get(layer_id)
+        if layer is None or layer.fingerprint() != previous_layer.fingerprint():
+            await invalidate_pages(layer_id)
+
+
+def _publish(registry: _Registry) -> None:
+    global _registry
+    _registry = registry
+    # cached collection metadata predates the published layers
+    clear_lru_caches()
+    prepare_collection_fragments(registry.collections)
+
+
+async def _disconnect(data_sources: Iterable[DataSource]) -> None:
+    for data_source in data_sources:
+        try:
+            await data_source.disconnect()
+        except Exception as e:
+            LOGGER.error(f"error disconnecting {data_source.name}: {e}")
+
+
+async def _retire(data_sources: Iterable[DataSource]) -> None:
+    # requests that read a data source before its registry was replaced, including
+    # streamed responses, continue to use its connections until they complete
+    for data_source in data_sources:
+        limiter = data_source.request_limiter
+        if limiter is None or limiter.idle():
+            await _disconnect([data_source])
+        else:
+            retirement = create_task(_disconnect_when_drained(data_source, limiter))
+            _retirements.add(retirement)
+            retirement.add_done_callback(_retirements.discard)
+
+
+async def _disconnect_when_drained(
+    data_source: DataSource, limiter: RequestLimiter
+) -> None:
+    if not await limiter.drained(settings.DATA_SOURCE_DRAIN_TIMEOUT()):
+        LOGGER.warning(f"disconnecting {data_source.name} with requests in flight")
+    await _disconnect([data_source])
+
+
+async def _cancel_startup() -> None:
+    startup_tasks = list(_startup_tasks)
+    for startup_task in startup_tasks:
+        startup_task.cancel()
+    await gather(*startup_tasks, return_exceptions=True)
 
 
 async def cleanup() -> None:
-    for data_source in _data_sources.values():
-        await data_source.disconnect()
-    _data_sources.clear()
+    global _discoveries
+    _discoveries += 1
+    await _cancel_startup()
+    retired_data_sources = _registry.data_sources.values()
+    _publish(_create_registry(dict(), dict(), frozenset()))
+    await _retire(retired_data_sources)
+    await gather(*list(_retirements), return_exceptions=True)
+    await close_page_cache()
 
 
 def get_data_source(data_source_id: str) -> DataSource:
-    return _data_sources[data_source_id]
+    return _registry.data_sources[data_source_id]
+
+
+def get_data_sources() -> List[DataSource]:
+    return list(_registry.data_sources.values())
 
 
-def get_layers() -> List[Layer]:
-    with _layers_lock:
-        return list(_layers.values())
+def get_layers() -> Tuple[Layer, ...]:
+    return _registry.collections
 
 
 def get_layer(layer_id: str) -> Layer:
-    with _layers_lock:
-        return _layers[layer_id] if layer_id in _layers else None
+    return _registry.layers.get(layer_id)
@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import Callable, Optional
 
 from pydantic import BaseModel
 
@@ -9,7 +9,7 @@ class FrontendConfiguration(BaseModel):
     asset_url_base: str
     api_url_base: str
     endpoint_format_switcher: Callable[[str, ResponseFormat], str]
-    next_page_link_generator: Callable[[str], str]
+    next_page_link_generator: Callable[[str, Optional[str]], str]
     prev_page_link_generator: Callable[[str], str]
     openapi_path_html: str
     openapi_path_json: str
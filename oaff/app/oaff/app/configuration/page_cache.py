@@ -0,0 +1,61 @@
+from logging import getLogger
+from typing import Final, Optional
+
+from oaff.app import settings
+from oaff.app.cache.page_cache import PageCache, PageCacheType
+
+LOGGER: Final = getLogger(__file__)
+_page_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> Optional[PageCache]:
+    return _page_cache
+
+
+async def configure_page_cache() -> None:
+    global _page_cache
+    await close_page_cache()
+    try:
+        page_cache_type = PageCacheType(settings.PAGE_CACHE())
+    except ValueError:
+        LOGGER.warning(f"Unknown page cache type {settings.PAGE_CACHE()}")
+        return
+    try:
+        if page_cache_type == PageCacheType.MEMORY:
+            from oaff.app.cache.memory_page_cache import MemoryPageCache
+
+            _page_cache = MemoryPageCache(
+                settings.PAGE_CACHE_TTL(), settings.PAGE_CACHE_SIZE()
+            )
+        elif page_cache_type == PageCacheType.FILE:
+            from oaff.app.cache.file_page_cache import FilePageCache
+
+            _page_cache = FilePageCache(
+                settings.PAGE_CACHE_TTL(), settings.PAGE_CACHE_DIRECTORY()
+            )
+        elif page_cache_type == PageCacheType.REDIS:
+            from oaff.app.cache.redis_page_cache import RedisPageCache
+
+            _page_cache = RedisPageCache(
+                settings.PAGE_CACHE_TTL(), settings.PAGE_CACHE_REDIS_URL()
+            )
+    except Exception as e:
+        LOGGER.error(f"error creating page cache, pages will not be cached: {e}")
+
+
+async def close_page_cache() -> None:
+    global _page_cache
+    if _page_cache is not None:
+        try:
+            await _page_cache.close()
+        except Exception as e:
+            LOGGER.error(f"error closing page cache: {e}")
+        _page_cache = None
+
+
+async def invalidate_pages(layer_id: Optional[str] = None) -> None:
+    if _page_cache is not None:
+        try:
+            await _page_cache.invalidate(layer_id)
+        except Exception as e:
+            LOGGER.error(f"error invalidating cached pages: {e}")
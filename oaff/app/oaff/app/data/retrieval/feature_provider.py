@@ -17,6 +17,10 @@ class FeatureProvider(ABC):
     async def as_geojson(self) -> str:
         pass
 
+    @abstractmethod
+    async def as_flatgeobuf(self) -> bytes:
+        pass
+
     @abstractmethod
     async def as_html_compatible(self) -> CollectionItemHtml:
         pass
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Callable, List
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
 
 from oaff.app.responses.models.collection_items_html import CollectionItemsHtml
-from oaff.app.responses.models.link import Link
+from oaff.app.responses.models.link import Link, PageLinkRel
 
 
 class FeatureSetProvider(ABC):
@@ -13,16 +13,34 @@ class FeatureSetProvider(ABC):
     If the source format and the target format are equivalent, or if a data source has
     specialised functionality to provide data in the target format, it may be
     significantly faster to bypass a common format conversion.
+    GeoJSON is returned as an iterator of document chunks so that large pages can be
+    streamed to the client without being held in memory.
     """
 
     @abstractmethod
     async def as_geojson(
-        self, links: List[Link], page_links_provider: Callable[[int, int], List[Link]]
-    ) -> str:
+        self,
+        links: List[Link],
+        page_links_provider: Callable[[bool, Any], Dict[PageLinkRel, Link]],
+    ) -> AsyncIterator[str]:
+        pass
+
+    @abstractmethod
+    async def as_geojsonseq(self) -> AsyncIterator[str]:
+        pass
+
+    @abstractmethod
+    async def as_flatgeobuf(
+        self,
+        page_links_provider: Callable[[bool, Any], Dict[PageLinkRel, Link]],
+        spatial_index: bool,
+    ) -> Tuple[bytes, Dict[PageLinkRel, Link]]:
         pass
 
     @abstractmethod
     async def as_html_compatible(
-        self, links: List[Link], page_links_provider: Callable[[int, int], List[Link]]
+        self,
+        links: List[Link],
+        page_links_provider: Callable[[bool, Any], Dict[PageLinkRel, Link]],
     ) -> CollectionItemsHtml:
         pass
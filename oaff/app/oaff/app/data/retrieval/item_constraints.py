@@ -1,6 +1,9 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class ItemConstraints(BaseModel):
     limit: int
     offset: int
+    cursor: Optional[str] = None
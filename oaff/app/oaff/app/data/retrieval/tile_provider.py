@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+from typing import Tuple
+
+
+class TileProvider(ABC):
+    """
+    Allow different data sources to customise how they render vector tiles.
+    Bounds are expressed in EPSG:3857, the CRS of the WebMercatorQuad tile matrix set.
+    """
+
+    @abstractmethod
+    async def as_mvt(self, bounds: Tuple[float, float, float, float]) -> bytes:
+        pass
@@ -0,0 +1,58 @@
+import re
+from functools import lru_cache
+from typing import Final, NamedTuple, Optional
+
+from pyproj import CRS
+from pyproj.exceptions import CRSError
+
+CRS84: Final = "http://www.opengis.net/def/crs/OGC/1.3/CRS84"
+EPSG_URI_PREFIX: Final = "http://www.opengis.net/def/crs/EPSG/0/"
+# points added along each edge of a bounding box transformed to another CRS, so that
+# edges that curve when transformed are not cut off by a box spanning the corners
+DENSIFY_POINTS: Final = 21
+_EPSG_PATTERN: Final = re.compile(
+    rf"^(?:{re.escape(EPSG_URI_PREFIX)}|EPSG:)(?P<code>\d+)$", re.IGNORECASE
+)
+
+
+class Crs(NamedTuple):
+    uri: str
+    # EPSG code, which PostGIS uses as the SRID
+    srid: int
+    # coordinates are written northing first, such as latitude before longitude in
+    # EPSG:4326, rather than in the x, y order used by PostGIS
+    northing_first: bool
+
+    @property
+    def code(self) -> str:
+        return f"EPSG:{self.srid}"
+
+
+def crs_uri(auth_name: str, auth_code: int) -> str:
+    # PostGIS stores EPSG:4326 coordinates longitude first, as in CRS84
+    if auth_name.upper() == "EPSG" and auth_code == 4326:
+        return CRS84
+    return f"http://www.opengis.net/def/crs/{auth_name.upper()}/0/{auth_code}"
+
+
+@lru_cache(maxsize=256)
+def parse_crs(identifier: Optional[str]) -> Optional[Crs]:
+    """
+    Parses an OGC CRS URI, or an EPSG:code identifier, returning None if the
+    identifier is not recognised. Omitted identifiers are CRS84.
+    """
+    if identifier is None or identifier == CRS84:
+        return Crs(CRS84, 4326, False)
+    match = _EPSG_PATTERN.match(identifier.strip())
+    if match is None:
+        return None
+    srid = int(match.group("code"))
+    try:
+        axis = CRS.from_epsg(srid).axis_info
+    except CRSError:
+        return None
+    return Crs(
+        f"{EPSG_URI_PREFIX}{srid}",
+        srid,
+        len(axis) > 0 and axis[0].direction in ["north", "south"],
+    )
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Type
+from typing import Any, Dict, List, Optional, Type
 from uuid import uuid4
 
 from pygeofilter.ast import Node
@@ -7,13 +7,19 @@ from pygeofilter.ast import Node
 from oaff.app.data.retrieval.feature_provider import FeatureProvider
 from oaff.app.data.retrieval.feature_set_provider import FeatureSetProvider
 from oaff.app.data.retrieval.item_constraints import ItemConstraints
+from oaff.app.data.retrieval.tile_provider import TileProvider
+from oaff.app.data.sources.common.crs import Crs
 from oaff.app.data.sources.common.layer import Layer
+from oaff.app.data.sources.common.request_limiter import RequestLimiter
+from oaff.app.requests.common.request_type import RequestType
 
 
 class DataSource(ABC):
     def __init__(self, name: str):
         self._id = str(uuid4())
         self.name = name
+        # data sources that limit concurrent requests provide a limiter
+        self.request_limiter: Optional[RequestLimiter] = None
 
     @property
     def id(self) -> str:
@@ -33,18 +39,51 @@ class DataSource(ABC):
         layer: Layer,
         constraints: ItemConstraints = None,
         ast: Type[Node] = None,
+        crs: Optional[Crs] = None,
     ) -> Type[FeatureSetProvider]:
+        # features are encoded in the given CRS, or CRS84 if none is given. Bounding
+        # boxes in the filter keep the CRS they were requested in, by EPSG code
         pass
 
     @abstractmethod
     async def get_feature_provider(
         self,
         layer: Layer,
+        crs: Optional[Crs] = None,
     ) -> Type[FeatureProvider]:
         pass
 
+    @abstractmethod
+    async def get_tile_provider(
+        self,
+        layer: Layer,
+        ast: Type[Node] = None,
+    ) -> Type[TileProvider]:
+        pass
+
+    def layers_published(self) -> None:
+        # called once the layers last returned by get_layers are served
+        pass
+
+    async def get_data_version(self, layer: Layer) -> Optional[str]:
+        # identifies the current state of a layer's data, changing whenever it does;
+        # layers without a version do not support conditional requests
+        return None
+
+    def get_request_connections(self, request: Type[RequestType]) -> int:
+        # the number of connections a request may hold at once, acquired from the
+        # request limiter
+        return 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return (
+            {"requests": self.request_limiter.get_metrics()}
+            if self.request_limiter is not None
+            else {}
+        )
+
     async def get_crs_identifier(self, layer: Layer) -> Any:
-        return f"{layer.geometry_crs_auth_name}:{layer.geometry_crs_auth_code}"
+        return layer.crs
 
     @abstractmethod
     async def disconnect(self) -> None:
@@ -1,7 +1,9 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
+from oaff.app import settings
+from oaff.app.data.sources.common.crs import CRS84, crs_uri, parse_crs
 from oaff.app.data.sources.common.provider import Provider
 from oaff.app.data.sources.common.temporal import TemporalDeclaration
 
@@ -19,3 +21,58 @@ class Layer(BaseModel):
     license: Optional[str] = None
     keywords: Optional[List[str]] = None
     providers: Optional[List[Provider]] = None
+    # names of the data formats the layer's items can be encoded in, None if all
+    data_formats: Optional[List[str]] = None
+    _crs: Optional[str] = PrivateAttr(default=None)
+    _supported_crs: Optional[Tuple[str, ...]] = PrivateAttr(default=None)
+
+    @property
+    def crs(self) -> str:
+        return self._crs if self._crs is not None else self._get_crs()
+
+    @property
+    def storage_crs(self) -> str:
+        return crs_uri(self.geometry_crs_auth_name, self.geometry_crs_auth_code)
+
+    @property
+    def supported_crs(self) -> Tuple[str, ...]:
+        # URIs of the CRSs the layer's features can be requested in
+        return (
+            self._supported_crs
+            if self._supported_crs is not None
+            else self._get_supported_crs()
+        )
+
+    def fingerprint(self) -> str:
+        # changes when the layer's items would be encoded differently, extents do not
+        # appear in items so are excluded
+        return self.json(include=set(Layer.__fields__) - {"bboxes", "intervals"})
+
+    def supports_format(self, format_name: str) -> bool:
+        return self.data_formats is None or format_name in self.data_formats
+
+    def prepare(self) -> None:
+        # derives what requests would otherwise compute from the layer each time;
+        # called once the layer is configured and again if its model changes
+        self._crs = self._get_crs()
+        self._supported_crs = self._get_supported_crs()
+
+    def _get_crs(self) -> str:
+        return f"{self.geometry_crs_auth_name}:{self.geometry_crs_auth_code}"
+
+    def _get_supported_crs(self) -> Tuple[str, ...]:
+        # only CRSs identified by EPSG code can be transformed to
+        return tuple(
+            dict.fromkeys(
+                crs.uri
+                for crs in [
+                    parse_crs(identifier)
+                    for identifier in [
+                        CRS84,
+                        self.storage_crs,
+                        *settings.ADDITIONAL_CRS(),
+                    ]
+                ]
+                if crs is not None
+            )
+        )
@@ -0,0 +1,138 @@
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+
+class BackpressureMode(str, Enum):
+    NONE = "none"
+    QUEUE = "queue"
+    REJECT = "reject"
+
+
+class RequestLimiter:
+    """
+    Limits the number of connections a data source's requests hold at once, so that
+    requests beyond its connection capacity wait for a bounded time (QUEUE) or are
+    turned away at once (REJECT) rather than piling up on the connection pool.
+    Each request acquires the number of connections it may use concurrently.
+    With NONE requests and their connections are counted but never limited.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        mode: BackpressureMode = BackpressureMode.NONE,
+        queue_timeout: Optional[float] = None,
+    ):
+        self.limit = limit
+        self.mode = mode
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        # connections held by the requests in flight
+        self.connections = 0
+        self.waiting = 0
+        self.rejected = 0
+        # queued requests are admitted in arrival order, so a request that needs
+        # several connections is not overtaken indefinitely by those needing one
+        self._waiters: Deque[Tuple["asyncio.Future[None]", int]] = deque()
+        # resolved once no requests are in flight or waiting, while awaited
+        self._drained: Optional["asyncio.Future[None]"] = None
+
+    async def acquire(self, connections: int = 1) -> bool:
+        # a request needing more connections than the limit waits for all of them
+        connections = min(connections, self.limit)
+        if self.mode == BackpressureMode.NONE or self._available(connections):
+            self.connections += connections
+            self.in_flight += 1
+        elif self.mode == BackpressureMode.REJECT or not await self._queue(connections):
+            self.rejected += 1
+            return False
+        return True
+
+    def release(self, connections: int = 1) -> None:
+        self.in_flight -= 1
+        self.connections -= min(connections, self.limit)
+        self._admit()
+        self._check_drained()
+
+    async def release_after(
+        self, chunks: AsyncIterator[Any], connections: int = 1
+    ) -> AsyncIterator[Any]:
+        # streamed responses keep using their connections until the last chunk is read
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            self.release(connections)
+
+    def idle(self) -> bool:
+        return self.in_flight == 0 and self.waiting == 0
+
+    async def drained(self, timeout: Optional[float] = None) -> bool:
+        # waits for the requests in flight or waiting to complete, False on timeout
+        if self.idle():
+            return True
+        if self._drained is None:
+            self._drained = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._drained), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "backpressure": self.mode.value,
+            "limit": self.limit,
+            "inFlight": self.in_flight,
+            "connections": self.connections,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+    def _available(self, connections: int) -> bool:
+        return len(self._waiters) == 0 and self.connections + connections <= self.limit
+
+    async def _queue(self, connections: int) -> bool:
+        waiter = (asyncio.get_running_loop().create_future(), connections)
+        admitted = waiter[0]
+        self._waiters.append(waiter)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(admitted, self.queue_timeout)
+            # counted in flight before it stops waiting, so it never appears idle between
+            self.in_flight += 1
+        except BaseException as e:
+            if admitted.done() and not admitted.cancelled():
+                # admitted as the request was abandoned
+                self.connections -= connections
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            # requests queued behind this one may now fit
+            self._admit()
+            if isinstance(e, asyncio.TimeoutError):
+                return False
+            raise
+        finally:
+            self.waiting -= 1
+            self._check_drained()
+        return True
+
+    def _admit(self) -> None:
+        while len(self._waiters) > 0:
+            admitted, connections = self._waiters[0]
+            if admitted.done():
+                self._waiters.popleft()
+            elif self.connections + connections <= self.limit:
+                self._waiters.popleft()
+                self.connections += connections
+                admitted.set_result(None)
+            else:
+                break
+
+    def _check_drained(self) -> None:
+        if self._drained is not None and self.idle():
+            if not self._drained.done():
+                self._drained.set_result(None)
+            self._drained = None
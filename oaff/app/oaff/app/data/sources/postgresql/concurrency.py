@@ -0,0 +1,38 @@
+import asyncio
+from contextvars import Context, copy_context
+from typing import Any, Awaitable, List, Optional
+
+from databases.core import Connection
+
+
+async def gather_on_separate_connections(
+    *aws: Awaitable[Any], limit: Optional[int] = None
+) -> List[Any]:
+    # limit bounds how many connections are taken from the pool at once
+    if limit is not None:
+        semaphore = asyncio.Semaphore(limit)
+        aws = tuple(_bounded(semaphore, aw) for aw in aws)
+    return await asyncio.gather(*[run_on_separate_connection(aw) for aw in aws])
+
+
+async def _bounded(semaphore: asyncio.Semaphore, aw: Awaitable[Any]) -> Any:
+    async with semaphore:
+        return await aw
+
+
+def run_on_separate_connection(aw: Awaitable[Any]) -> "asyncio.Future[Any]":
+    """
+    databases binds a connection to the current context and child tasks inherit
+    a copy of that context, so awaitables scheduled after a query has run would
+    share (and serialize on) one connection. The awaitable here is scheduled in
+    a context without connection bindings so it acquires its own pooled connection.
+    """
+    return _without_connections().run(asyncio.ensure_future, aw)
+
+
+def _without_connections() -> Context:
+    context = Context()
+    for var, value in copy_context().items():
+        if not isinstance(value, Connection):
+            context.run(var.set, value)
+    return context
@@ -1,5 +1,5 @@
+from asyncio import sleep
 from logging import getLogger
-from time import sleep
 from typing import Final, List, Type
 
 from databases import Database
@@ -11,6 +11,7 @@ from oaff.app.data.sources.postgresql.profile import PostgresqlProfile
 from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_data_source import (
     PostgresqlDataSource as HybridDataSource,
 )
+from oaff.app.util import backoff_delay
 
 LOGGER: Final = getLogger(__file__)
 PROFILES: Final = {
@@ -25,8 +26,8 @@ class PostgresqlManager(DataSourceManager):
 
         async def connection_tester(database: Database, source_name: str) -> None:
             if not database.is_connected:
-                iteration = 0
-                while iteration < settings.connect_retries(source_name):
+                retries = settings.connect_retries(source_name)
+                for iteration in range(retries):
                     try:
                         await database.connect()
                         LOGGER.info(f"connection tester succeeded iteration {iteration}")
@@ -35,8 +36,17 @@ class PostgresqlManager(DataSourceManager):
                         LOGGER.info(
                             f"connection tester iteration {iteration} failed: {e}"
                         )
-                        iteration += 1
-                        sleep(1)
+                        if iteration + 1 < retries:
+                            await sleep(
+                                backoff_delay(
+                                    iteration,
+                                    settings.connect_backoff_base(source_name),
+                                    settings.connect_backoff_max(source_name),
+                                )
+                            )
+                raise ConnectionError(
+                    f"unable to connect to {source_name} after {retries} attempts"
+                )
 
         for source_name in source_names if len("".join(source_names)) > 1 else [None]:
             data_sources.append(
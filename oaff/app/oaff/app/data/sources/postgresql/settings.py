@@ -1,8 +1,14 @@
 import os
-from typing import Set
+from logging import getLogger
+from typing import Any, Dict, Final, Optional, Set
 
+from oaff.app.data.sources.common.request_limiter import BackpressureMode
 from oaff.app.settings import ENV_VAR_PREFIX
 
+LOGGER: Final = getLogger(__file__)
+# asyncpg's default pool size
+POOL_SIZE_DEFAULT: Final = 10
+
 
 def source_names() -> Set[str]:
     return set(os.environ.get(f"{ENV_VAR_PREFIX}POSTGRESQL_SOURCE_NAMES", "").split(","))
@@ -50,6 +56,22 @@ def connect_retries(name: str) -> int:
     )
 
 
+def connect_backoff_base(name: str) -> float:
+    return float(
+        os.environ.get(
+            f"{ENV_VAR_PREFIX}POSTGRESQL_CONNECT_BACKOFF_BASE{name_to_suffix(name)}", 0.5
+        )
+    )
+
+
+def connect_backoff_max(name: str) -> float:
+    return float(
+        os.environ.get(
+            f"{ENV_VAR_PREFIX}POSTGRESQL_CONNECT_BACKOFF_MAX{name_to_suffix(name)}", 10
+        )
+    )
+
+
 def url(name: str) -> str:
     return "".join(
         [
@@ -63,6 +85,107 @@ def url(name: str) -> str:
     )
 
 
+def pool_max_size(name: str) -> int:
+    return int(
+        os.environ.get(
+            f"{ENV_VAR_PREFIX}POSTGRESQL_POOL_MAX_SIZE{name_to_suffix(name)}",
+            POOL_SIZE_DEFAULT,
+        )
+    )
+
+
+def pool_min_size(name: str) -> int:
+    return int(
+        os.environ.get(
+            f"{ENV_VAR_PREFIX}POSTGRESQL_POOL_MIN_SIZE{name_to_suffix(name)}",
+            min(POOL_SIZE_DEFAULT, pool_max_size(name)),
+        )
+    )
+
+
+def statement_cache_size(name: str) -> Optional[int]:
+    value = os.environ.get(
+        f"{ENV_VAR_PREFIX}POSTGRESQL_STATEMENT_CACHE_SIZE{name_to_suffix(name)}"
+    )
+    return int(value) if value is not None else None
+
+
+def command_timeout(name: str) -> Optional[float]:
+    value = os.environ.get(
+        f"{ENV_VAR_PREFIX}POSTGRESQL_COMMAND_TIMEOUT{name_to_suffix(name)}"
+    )
+    return float(value) if value is not None else None
+
+
+def pool_max_idle_lifetime(name: str) -> Optional[float]:
+    value = os.environ.get(
+        f"{ENV_VAR_PREFIX}POSTGRESQL_POOL_MAX_IDLE_LIFETIME{name_to_suffix(name)}"
+    )
+    return float(value) if value is not None else None
+
+
+def pool_options(name: str) -> Dict[str, Any]:
+    # options left unset keep asyncpg's defaults
+    return {
+        option: value
+        for option, value in {
+            "min_size": pool_min_size(name),
+            "max_size": pool_max_size(name),
+            "statement_cache_size": statement_cache_size(name),
+            "command_timeout": command_timeout(name),
+            "max_inactive_connection_lifetime": pool_max_idle_lifetime(name),
+        }.items()
+        if value is not None
+    }
+
+
+def pool_backpressure(name: str) -> BackpressureMode:
+    value = os.environ.get(
+        f"{ENV_VAR_PREFIX}POSTGRESQL_POOL_BACKPRESSURE{name_to_suffix(name)}",
+        BackpressureMode.NONE.value,
+    )
+    try:
+        return BackpressureMode(value.lower())
+    except ValueError:
+        LOGGER.warning(
+            f"pool backpressure {value} invalid for {name}, "
+            f"using {BackpressureMode.NONE.value}"
+        )
+        return BackpressureMode.NONE
+
+
+def pool_queue_timeout(name: str) -> float:
+    return float(
+        os.environ.get(
+            f"{ENV_VAR_PREFIX}POSTGRESQL_POOL_QUEUE_TIMEOUT{name_to_suffix(name)}", 5
+        )
+    )
+
+
+def discovery_concurrency(name: str) -> int:
+    return int(
+        os.environ.get(
+            f"{ENV_VAR_PREFIX}POSTGRESQL_DISCOVERY_CONCURRENCY{name_to_suffix(name)}",
+            pool_max_size(name),
+        )
+    )
+
+
+def reflection_batch_size(name: str) -> int:
+    return int(
+        os.environ.get(
+            f"{ENV_VAR_PREFIX}POSTGRESQL_REFLECTION_BATCH_SIZE{name_to_suffix(name)}",
+            500,
+        )
+    )
+
+
+def snapshot_directory(name: str) -> Optional[str]:
+    return os.environ.get(
+        f"{ENV_VAR_PREFIX}POSTGRESQL_SNAPSHOT_DIRECTORY{name_to_suffix(name)}"
+    )
+
+
 def default_tz_code(name: str) -> str:
     return os.environ.get(
         f"{ENV_VAR_PREFIX}POSTGRESQL_DEFAULT_TZ{name_to_suffix(name)}", "UTC"
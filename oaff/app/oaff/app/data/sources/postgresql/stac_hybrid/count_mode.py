@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class CountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
@@ -0,0 +1,79 @@
+import fcntl
+import os
+import pickle
+from asyncio import get_running_loop, sleep
+from contextlib import asynccontextmanager
+from hashlib import sha256
+from logging import getLogger
+from tempfile import NamedTemporaryFile
+from typing import Any, AsyncIterator, Callable, Final
+
+LOGGER: Final = getLogger(__file__)
+
+
+class DiscoverySnapshot:
+    """
+    Holds the result of layer discovery in a file shared by every worker on a host.
+    The first worker to start discovers layers while holding a lock on the snapshot,
+    and the others wait for it and load its result instead of repeating the work.
+    Snapshots are pickled, so the directory must only be writable by oaff.
+    """
+
+    # changes whenever the pickled content changes shape
+    VERSION: Final = 3
+    # seconds between attempts to take the lock held by another worker
+    LOCK_INTERVAL: Final = 0.1
+
+    def __init__(self, directory: str, key: str):
+        os.makedirs(directory, exist_ok=True)
+        name = sha256(f"{self.VERSION}/{key}".encode("utf-8")).hexdigest()
+        self.path = os.path.join(directory, f"{name}.pickle")
+        self.lock_path_prefix = os.path.join(directory, name)
+
+    @asynccontextmanager
+    async def locked(self, purpose: str = "discovery") -> AsyncIterator[None]:
+        # locks for different purposes are independent of each other. The lock is
+        # released when the file is closed, including if the process exits
+        with open(f"{self.lock_path_prefix}.{purpose}.lock", "a") as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await sleep(self.LOCK_INTERVAL)
+            yield
+
+    async def load(self, fingerprint: str) -> Any:
+        # None unless a snapshot was saved with the same fingerprint
+        return await self._run(self._read, fingerprint)
+
+    async def save(self, fingerprint: str, content: Any) -> None:
+        await self._run(
+            self._write,
+            pickle.dumps({"fingerprint": fingerprint, "content": content}),
+        )
+
+    def _read(self, fingerprint: str) -> Any:
+        try:
+            with open(self.path, "rb") as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            LOGGER.warning(f"discovery snapshot {self.path} unreadable: {e}")
+            return None
+        return snapshot["content"] if snapshot["fingerprint"] == fingerprint else None
+
+    def _write(self, snapshot: bytes) -> None:
+        try:
+            with NamedTemporaryFile(
+                dir=os.path.dirname(self.path), prefix=".", delete=False
+            ) as temp:
+                temp.write(snapshot)
+            os.replace(temp.name, self.path)
+        except OSError as e:
+            LOGGER.warning(f"discovery snapshot {self.path} not saved: {e}")
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        # file system calls block, so run outside the event loop
+        return await get_running_loop().run_in_executor(None, function, *args)
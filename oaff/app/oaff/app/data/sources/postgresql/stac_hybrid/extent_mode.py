@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ExtentMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
@@ -0,0 +1,45 @@
+from typing import Any
+
+import sqlalchemy as sa
+from pygeofilter import ast
+from pygeofilter.backends.evaluator import handle
+from pygeofilter.backends.sqlalchemy import filters
+from pygeofilter.backends.sqlalchemy.evaluate import SQLAlchemyFilterEvaluator
+
+from oaff.app.data.sources.common.crs import DENSIFY_POINTS
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_layer import PostgresqlLayer
+
+
+class PostgresqlFilterEvaluator(SQLAlchemyFilterEvaluator):
+    """
+    Translates a filter to an SQLAlchemy expression against a layer's columns.
+    Bounding boxes in another CRS are transformed to the layer's CRS by PostGIS,
+    once per query, so the layer's spatial index still applies.
+    """
+
+    def __init__(self, layer: PostgresqlLayer):
+        super().__init__(layer.columns)
+        self.srid = layer.geometry_srid
+
+    @handle(ast.BBox)
+    def bbox(self, node: ast.BBox, lhs: Any) -> Any:
+        envelope = filters.parse_bbox(
+            [node.minx, node.miny, node.maxx, node.maxy], node.crs
+        )
+        if node.crs != self.srid:
+            # edges are densified so that those that curve in the layer's CRS
+            # are not cut off
+            segment_length = max(node.maxx - node.minx, node.maxy - node.miny) / (
+                DENSIFY_POINTS + 1
+            )
+            if segment_length > 0:
+                envelope = sa.func.ST_Segmentize(envelope, segment_length)
+            envelope = sa.func.ST_Transform(envelope, self.srid)
+        return lhs.ST_Intersects(envelope)
+
+
+# the evaluator's metaclass only maps the handlers a class defines itself
+PostgresqlFilterEvaluator.handler_map = {
+    **SQLAlchemyFilterEvaluator.handler_map,
+    **PostgresqlFilterEvaluator.handler_map,
+}
@@ -1,8 +1,27 @@
+from asyncio import Future, gather
+from contextlib import contextmanager
 from datetime import date, datetime
+from functools import partial
 from hashlib import sha256
+from json import loads
 from logging import getLogger
 from os import path
-from typing import Any, Awaitable, Callable, Dict, Final, List, Type
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
 # geoalchemy import required for sa.MetaData reflection, even though unused in module
 import geoalchemy2 as ga  # noqa: F401
@@ -10,20 +29,38 @@ import sqlalchemy as sa  # type: ignore
 from alembic import command
 from alembic.config import Config
 from databases import Database
-from pygeofilter.ast import Node
-from pygeofilter.backends.sqlalchemy import to_filter as node_to_sqlalchemy
+from pygeofilter.ast import Node, get_repr
 from pytz import timezone
+from sqlalchemy.dialects import postgresql
 
+from oaff.app.configuration.data import update_layers
+from oaff.app.configuration.page_cache import get_page_cache
 from oaff.app.data.retrieval.feature_provider import FeatureProvider
 from oaff.app.data.retrieval.feature_set_provider import FeatureSetProvider
 from oaff.app.data.retrieval.item_constraints import ItemConstraints
+from oaff.app.data.retrieval.tile_provider import TileProvider
+from oaff.app.data.sources.common.crs import CRS84, Crs
 from oaff.app.data.sources.common.data_source import DataSource
+from oaff.app.data.sources.common.request_limiter import RequestLimiter
 from oaff.app.data.sources.common.temporal import (
     TemporalDeclaration,
     TemporalInstant,
     TemporalRange,
 )
 from oaff.app.data.sources.postgresql import settings
+from oaff.app.data.sources.postgresql.concurrency import (
+    gather_on_separate_connections,
+    run_on_separate_connection,
+)
+from oaff.app.data.sources.postgresql.stac_hybrid.count_mode import CountMode
+from oaff.app.data.sources.postgresql.stac_hybrid.discovery_snapshot import (
+    DiscoverySnapshot,
+)
+from oaff.app.data.sources.postgresql.stac_hybrid.explain import Explain
+from oaff.app.data.sources.postgresql.stac_hybrid.extent_mode import ExtentMode
+from oaff.app.data.sources.postgresql.stac_hybrid.filter_evaluator import (
+    PostgresqlFilterEvaluator,
+)
 from oaff.app.data.sources.postgresql.stac_hybrid.models.collections import collections
 from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_feature_provider import (
     PostgresqlFeatureProvider,
@@ -32,16 +69,28 @@ from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_feature_set_provide
     PostgresqlFeatureSetProvider,
 )
 from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_layer import PostgresqlLayer
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_tile_provider import (
+    PostgresqlTileProvider,
+)
 from oaff.app.data.sources.postgresql.stac_hybrid.settings import (
     blacklist,
+    count_mode,
+    extent_mode,
     manage_as_collections,
     whitelist,
 )
-from oaff.app.settings import SPATIAL_FILTER_GEOMETRY_FIELD_ALIAS
+from oaff.app.requests.collection_items import CollectionItems
+from oaff.app.requests.common.request_type import RequestType
+from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.responses.response_type import ResponseType
 from oaff.app.util import datetime_as_rfc3339
 
 LOGGER: Final = getLogger(__file__)
 METADATA: Final = sa.MetaData()
+# reads column types as SQLAlchemy's PostgreSQL reflection does
+POSTGRESQL_DIALECT: Final = postgresql.dialect()
+# enums or domains keyed by (name,) if on the search path, else (schema, name)
+UserTypes = Dict[Tuple[str, ...], Dict[str, Any]]
 
 
 class PostgresqlDataSource(DataSource):
@@ -54,9 +103,40 @@ class PostgresqlDataSource(DataSource):
         connection_tester: Callable[[Database, str], Awaitable[None]],
     ):
         super().__init__(f"{self.DATA_SOURCE_NAME}:{connection_name}")
-        self.db = Database(settings.url(connection_name))
+        self.db = Database(
+            settings.url(connection_name), **settings.pool_options(connection_name)
+        )
+        self.request_limiter = RequestLimiter(
+            settings.pool_max_size(connection_name),
+            settings.pool_backpressure(connection_name),
+            settings.pool_queue_timeout(connection_name),
+        )
         self.connection_name = connection_name
         self.connection_tester = connection_tester
+        # read once so that an invalid setting is reported at startup only
+        self.count_mode = count_mode(connection_name)
+        # seconds spent in each phase of the most recent startup
+        self.discovery_timings: Dict[str, float] = dict()
+        # names of the data formats this database can encode, None if all
+        self.data_formats: Optional[List[str]] = None
+        # estimated extents are replaced by exact extents in the background, once the
+        # layers holding them are published
+        self._extent_refresh: Optional["Future[None]"] = None
+        self._pending_extent_refresh: Optional[Coroutine[Any, Any, None]] = None
+        # the layers most recently returned by get_layers
+        self._layers: List[PostgresqlLayer] = list()
+        # derived layers by table, with the fingerprint of the table they derive from:
+        # its catalog definition and its row modification counts
+        self._discovered: Dict[
+            str, Tuple[Optional[Tuple[str, str]], PostgresqlLayer]
+        ] = dict()
+        # tables whose discovered layers hold estimated extents
+        self._estimated: Set[str] = set()
+        # table fingerprints read by the most recent discovery
+        self._table_fingerprints: Dict[str, Tuple[str, str]] = dict()
+        # the snapshot discovery was shared through, and its catalog fingerprint
+        self._snapshot: Optional[DiscoverySnapshot] = None
+        self._snapshot_fingerprint: Optional[str] = None
 
     async def initialize(self) -> None:
         try:
@@ -71,7 +151,9 @@ class PostgresqlDataSource(DataSource):
                 )
             )
             raise e
-        await self.connection_tester(self.db, self.connection_name)
+        with self._discovery_phase("connection"):
+            await self.connection_tester(self.db, self.connection_name)
+        self.data_formats = await self._get_data_formats()
         if manage_as_collections(self.connection_name):
             LOGGER.info("Running Alembic migrations")
             alembic_cfg = Config()
@@ -79,13 +161,22 @@ class PostgresqlDataSource(DataSource):
                 "script_location", path.join(path.dirname(__file__), "migrations")
             )
             alembic_cfg.set_main_option("sqlalchemy.url", str(self.db.url))
-            command.upgrade(alembic_cfg, "head")
+            with self._discovery_phase("migrations"):
+                command.upgrade(alembic_cfg, "head")
             LOGGER.info("Alembic migrations complete")
         else:
             LOGGER.info(f"Not managing {self.connection_name} via Alembic")
 
     async def get_layers(self) -> List[PostgresqlLayer]:
-        derived_layers = await self._get_derived_layers()
+        await self._cancel_extent_refresh()
+        mode = extent_mode(self.connection_name)
+        derived_layers = await self._get_snapshot_or_derived_layers(mode)
+        # estimated extents, and those of tables written to since they were derived
+        derived_extents = {
+            key: (layer.bboxes, layer.intervals)
+            for key, layer in derived_layers.items()
+            if key in self._estimated
+        }
         if manage_as_collections(self.connection_name):
 
             def get_if_available(
@@ -150,73 +241,309 @@ class PostgresqlDataSource(DataSource):
         else:
             layers = list(derived_layers.values())
 
+        for layer in layers:
+            layer.data_formats = self.data_formats
+            # compile statement templates and derive field lookups now rather than
+            # on each of a layer's requests
+            layer.prepare()
+        if len(derived_extents) > 0:
+            self._pending_extent_refresh = self._refresh_extents(
+                {key: derived_layers[key] for key in derived_extents.keys()},
+                derived_extents,
+            )
+        self._layers = layers
         return layers
 
+    def layers_published(self) -> None:
+        if self._pending_extent_refresh is not None:
+            self._extent_refresh = run_on_separate_connection(
+                self._pending_extent_refresh
+            )
+            self._pending_extent_refresh = None
+
     async def get_feature_set_provider(
         self,
         layer: PostgresqlLayer,
         constraints: ItemConstraints,
         ast: Type[Node] = None,
+        crs: Optional[Crs] = None,
     ) -> Type[FeatureSetProvider]:
-        filters = (
-            node_to_sqlalchemy(
-                ast,
-                {
-                    SPATIAL_FILTER_GEOMETRY_FIELD_ALIAS: layer.model.c[
-                        layer.geometry_field_name
-                    ],
-                    **{
-                        field_name: layer.model.c[field_name]
-                        for field_name in layer.fields
-                    },
-                },
-            )
-            if ast is not None
-            else 1 == 1
+        # unfiltered requests use the layer's precompiled statement templates
+        filters = self._get_filters(layer, ast) if ast is not None else None
+        after_cursor = constraints.cursor is not None
+        paging = (
+            {"cursor": layer.statements.cursor_value(constraints.cursor)}
+            if after_cursor
+            else {"offset": constraints.offset}
         )
-        id_set = (
-            sa.select(
-                [layer.model.primary_key.columns[layer.unique_field_name].label("id")]
-            )
-            .select_from(layer.model)
-            .where(filters)
-            .limit(constraints.limit)
-            .offset(constraints.offset)
-            .order_by(layer.unique_field_name)
-            .alias("id_set")
-        )
-        total_count = (
-            await self.db.fetch_one(
-                sa.select([sa.func.count()]).select_from(layer.model).where(filters)
-            )
-        )[0]
+        mode = self.count_mode
 
-        return PostgresqlFeatureSetProvider(self.db, id_set, layer, total_count)
+        return PostgresqlFeatureSetProvider(
+            self.db,
+            partial(
+                layer.statements_for(crs).items,
+                filters=filters,
+                after_cursor=after_cursor,
+                # one more row than requested reveals whether a further page exists
+                limit=constraints.limit + 1,
+                **paging,
+            ),
+            layer,
+            constraints.limit,
+            lambda: self._get_total_count(layer, filters, ast is not None, mode),
+            mode == CountMode.ESTIMATED,
+            get_page_cache(),
+            "|".join(
+                [
+                    get_repr(ast) if ast is not None else "",
+                    str(constraints.limit),
+                    f"cursor={constraints.cursor}"
+                    if after_cursor
+                    else f"offset={constraints.offset}",
+                    mode.value,
+                    crs.uri if crs is not None else CRS84,
+                ]
+            ),
+        )
 
     async def get_feature_provider(
         self,
         layer: PostgresqlLayer,
+        crs: Optional[Crs] = None,
     ) -> Type[FeatureProvider]:
-        return PostgresqlFeatureProvider(self.db, layer)
+        return PostgresqlFeatureProvider(self.db, layer, crs)
+
+    async def get_tile_provider(
+        self,
+        layer: PostgresqlLayer,
+        ast: Type[Node] = None,
+    ) -> Type[TileProvider]:
+        return PostgresqlTileProvider(self.db, layer, self._get_filters(layer, ast))
+
+    async def get_data_version(self, layer: PostgresqlLayer) -> Optional[str]:
+        # write counters change with every modification, including truncation through
+        # n_live_tup. Statistics are reported shortly after commit rather than at
+        # commit, and are not collected for views.
+        statistics = await self.db.fetch_one(
+            sa.text(
+                """
+                SELECT tables.relid,
+                       tables.n_tup_ins,
+                       tables.n_tup_upd,
+                       tables.n_tup_del,
+                       tables.n_live_tup,
+                       databases.stats_reset
+                  FROM pg_stat_user_tables tables
+                  JOIN pg_stat_database databases
+                    ON databases.datname = CURRENT_DATABASE()
+                 WHERE tables.relid = CAST(
+                         QUOTE_IDENT(:schema_name)
+                         || '.'
+                         || QUOTE_IDENT(:table_name)
+                         AS REGCLASS
+                       )
+                """
+            ).bindparams(
+                schema_name=layer.schema_name,
+                table_name=layer.table_name,
+            )
+        )
+        return (
+            None
+            if statistics is None
+            else "-".join([str(value) for value in statistics.values()])
+        )
+
+    def get_request_connections(self, request: Type[RequestType]) -> int:
+        # GeoJSON item pages are counted on a second connection while they stream.
+        # The data version is read beforehand on the request's own connection
+        return (
+            2
+            if isinstance(request, CollectionItems)
+            and request.format == ResponseFormat.json
+            and self.count_mode != CountMode.NONE
+            else 1
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        # databases does not expose its asyncpg pool, which exists while connected
+        pool = getattr(self.db._backend, "_pool", None)
+        return {
+            **super().get_metrics(),
+            "pool": {
+                "size": pool.get_size(),
+                "idle": pool.get_idle_size(),
+                "minSize": pool.get_min_size(),
+                "maxSize": pool.get_max_size(),
+            }
+            if pool is not None
+            else None,
+            "discovery": self.discovery_timings,
+        }
 
     async def get_crs_identifier(self, layer: PostgresqlLayer) -> Any:
         return layer.geometry_srid
 
     async def disconnect(self) -> None:
+        await self._cancel_extent_refresh()
         if self.db.is_connected:
             await self.db.disconnect()
 
-    async def _get_derived_layers(self) -> Dict[str, PostgresqlLayer]:
-        tables = await self._get_compatible_tables()
-        table_spatial_extents = await self._get_table_spatial_extents(tables)
-        table_models = await self._get_table_sqlalchemy_models(tables)
-        table_temporal_fields = await self._get_table_temporal_fields(table_models)
-        table_temporal_extents = await self._get_table_temporal_extents(
-            table_models,
-            table_temporal_fields,
+    def _get_filters(self, layer: PostgresqlLayer, ast: Optional[Type[Node]]) -> Any:
+        return (
+            PostgresqlFilterEvaluator(layer).evaluate(ast) if ast is not None else 1 == 1
         )
+
+    async def _get_total_count(
+        self,
+        layer: PostgresqlLayer,
+        filters: Any,
+        filtered: bool,
+        mode: CountMode,
+    ) -> Optional[int]:
+        if mode == CountMode.NONE:
+            return None
+        elif mode == CountMode.ESTIMATED:
+            if filtered:
+                plan = await self.db.fetch_one(
+                    Explain(
+                        sa.select([sa.literal_column("1")])
+                        .select_from(layer.model)
+                        .where(filters)
+                    )
+                )
+                return int(loads(plan[0])[0]["Plan"]["Plan Rows"])
+            else:
+                # reltuples is negative (or zero before PostgreSQL 14)
+                # until the table has been vacuumed or analyzed
+                estimate = await self.db.fetch_val(
+                    sa.text(
+                        """
+                        SELECT reltuples::BIGINT
+                          FROM pg_class
+                         WHERE oid = CAST(
+                                 QUOTE_IDENT(:schema_name)
+                                 || '.'
+                                 || QUOTE_IDENT(:table_name)
+                                 AS REGCLASS
+                               )
+                        """
+                    ).bindparams(
+                        schema_name=layer.schema_name,
+                        table_name=layer.table_name,
+                    )
+                )
+                return estimate if estimate is not None and estimate > 0 else None
+        else:
+            return (await self.db.fetch_one(layer.statements.total_count(filters)))[0]
+
+    async def _get_snapshot_or_derived_layers(
+        self, mode: ExtentMode
+    ) -> Dict[str, PostgresqlLayer]:
+        with self._discovery_phase("fingerprints"):
+            table_fingerprints = await self._get_table_fingerprints()
+        self._table_fingerprints = table_fingerprints
+        directory = settings.snapshot_directory(self.connection_name)
+        if directory is None or len(self._discovered) > 0:
+            self._snapshot = None
+            return await self._get_derived_layers(mode, table_fingerprints)
+        self._snapshot = DiscoverySnapshot(
+            directory, "/".join([self.connection_name or "", str(self.db.url)])
+        )
+        # only the catalog is fingerprinted, so that writes between workers starting
+        # do not prevent them from sharing the snapshot
+        self._snapshot_fingerprint = self._get_catalog_fingerprint(
+            mode, table_fingerprints
+        )
+        async with self._snapshot.locked():
+            with self._discovery_phase("snapshot"):
+                content = await self._snapshot.load(self._snapshot_fingerprint)
+            if content is None:
+                layers = await self._get_derived_layers(mode, table_fingerprints)
+                await self._save_snapshot()
+                return layers
+        LOGGER.info(f"{self.name} layers loaded from discovery snapshot")
+        for _, layer in content["discovered"].values():
+            # the snapshot may have been saved by another worker's data source
+            layer.data_source_id = self.id
+        self._discovered = content["discovered"]
+        # extents of tables written to since the snapshot was saved are refreshed
+        self._estimated = content["estimated"] | {
+            key
+            for key, (table_fingerprint, _) in self._discovered.items()
+            if table_fingerprint != table_fingerprints.get(key)
+        }
+        return {key: layer.copy() for key, (_, layer) in self._discovered.items()}
+
+    async def _save_snapshot(self) -> None:
+        await self._snapshot.save(
+            self._snapshot_fingerprint,
+            {"discovered": self._discovered, "estimated": self._estimated},
+        )
+
+    async def _get_table_fingerprints(self) -> Dict[str, Tuple[str, str]]:
+        sql = None
+        with open(
+            path.join(path.dirname(__file__), "sql", "table_fingerprints.sql")
+        ) as sql_file:
+            sql = sql_file.read()
+        return {
+            row["qualified_table_name"]: (row["fingerprint"], row["modifications"])
+            for row in await self.db.fetch_all(sql)
+        }
+
+    def _get_catalog_fingerprint(
+        self, mode: ExtentMode, table_fingerprints: Dict[str, Tuple[str, str]]
+    ) -> str:
+        return sha256(
+            "/".join(
+                [
+                    ",".join(
+                        f"{key}={table_fingerprints[key][0]}"
+                        for key in sorted(table_fingerprints.keys())
+                    ),
+                    ",".join(sorted(whitelist(self.connection_name))),
+                    ",".join(sorted(blacklist(self.connection_name))),
+                    settings.default_tz_code(self.connection_name),
+                    mode.value,
+                ]
+            ).encode("UTF-8")
+        ).hexdigest()
+
+    async def _get_derived_layers(
+        self, mode: ExtentMode, table_fingerprints: Dict[str, Tuple[str, str]]
+    ) -> Dict[str, PostgresqlLayer]:
+        with self._discovery_phase("tables"):
+            tables = await self._get_compatible_tables()
+        # layers of tables unchanged since the previous discovery are reused
+        reused_layers = {
+            key: self._discovered[key][1].copy()
+            for key in tables.keys()
+            if key in self._discovered
+            and self._discovered[key][0] == table_fingerprints.get(key)
+        }
+        changed_tables = {
+            key: table_info
+            for key, table_info in tables.items()
+            if key not in reused_layers
+        }
+        with self._discovery_phase("spatialExtents"):
+            table_spatial_extents = await self._get_table_spatial_extents(
+                changed_tables, mode
+            )
+        with self._discovery_phase("reflection"):
+            table_models = await self._get_table_sqlalchemy_models(changed_tables)
+            table_temporal_fields = await self._get_table_temporal_fields(table_models)
+        with self._discovery_phase("temporalExtents"):
+            table_temporal_extents = await self._get_table_temporal_extents(
+                table_models,
+                table_temporal_fields,
+                mode,
+            )
         layers = {
-            qualified_layer_name: PostgresqlLayer(
+            qualified_layer_name: reused_layers[qualified_layer_name]
+            if qualified_layer_name in reused_layers
+            else PostgresqlLayer(
                 id=self._id_generator(qualified_layer_name),
                 title=tables[qualified_layer_name]["table_name"],
                 description=None,
@@ -239,6 +566,21 @@ class PostgresqlDataSource(DataSource):
             )
             for qualified_layer_name in tables.keys()
         }
+        if len(reused_layers) > 0:
+            LOGGER.info(
+                f"{self.name} rediscovered {len(changed_tables)} changed tables, "
+                f"reused {len(reused_layers)}"
+            )
+        # layers are customised from oaff.collections after discovery, so copies are
+        # kept as they were derived
+        self._discovered = {
+            key: (table_fingerprints.get(key), layer.copy())
+            for key, layer in layers.items()
+        }
+        # reused layers may still hold estimated extents if their refresh was cancelled
+        self._estimated = (self._estimated & set(reused_layers.keys())) | (
+            set(changed_tables.keys()) if mode == ExtentMode.ESTIMATED else set()
+        )
 
         return layers
 
@@ -277,6 +619,20 @@ class PostgresqlDataSource(DataSource):
         else:
             raise ValueError(f"Unknown temporal type {field['type']}")
 
+    async def _get_data_formats(self) -> Optional[List[str]]:
+        # ST_AsFlatGeobuf was added in PostGIS 3.2
+        version = await self.db.fetch_val("SELECT PostGIS_Lib_Version()")
+        if tuple(int(part) for part in version.split(".")[:2]) >= (3, 2):
+            return None
+        LOGGER.info(
+            f"{self.name} FlatGeobuf unavailable, requires PostGIS 3.2 (found {version})"
+        )
+        return [
+            format.name
+            for format in ResponseFormat.supporting(ResponseType.DATA)
+            if format != ResponseFormat.flatgeobuf
+        ]
+
     async def _get_compatible_tables(self) -> Dict[str, Dict[str, Any]]:
         sql = None
         with open(path.join(path.dirname(__file__), "sql", "layers.sql")) as sql_file:
@@ -317,76 +673,184 @@ class PostgresqlDataSource(DataSource):
             LOGGER.info(f"{row['qualified_table_name']} not supported: {exclude_reason}")
 
     async def _get_table_spatial_extents(
-        self, tables: Dict[str, Dict[str, Any]]
+        self,
+        tables: Dict[str, Dict[str, Any]],
+        mode: ExtentMode = ExtentMode.EXACT,
     ) -> Dict[str, List[float]]:
-        table_spatial_extents = dict()
-        for table_info in tables.values():
+        get_extent = (
+            self._get_table_estimated_spatial_extent
+            if mode == ExtentMode.ESTIMATED
+            else self._get_table_spatial_extent
+        )
+        return dict(
+            zip(
+                tables.keys(),
+                await gather_on_separate_connections(
+                    *[get_extent(table_info) for table_info in tables.values()],
+                    limit=settings.discovery_concurrency(self.connection_name),
+                ),
+            )
+        )
+
+    async def _get_table_spatial_extent(self, table_info: Dict[str, Any]) -> List[float]:
+        extents = await self.db.fetch_one(
+            f"""
+            WITH extents AS (
+              SELECT ST_TRANSFORM(
+                       ST_SetSRID(
+                         ST_MakePoint(
+                           MIN(ST_XMIN({table_info["geometry_field"]}::geometry)),
+                           MIN(ST_YMIN({table_info["geometry_field"]}::geometry))
+                         ), {table_info["srid"]}
+                       ), 4326
+                     ) ll
+                   , ST_TRANSFORM(
+                       ST_SetSRID(
+                         ST_MakePoint(
+                           MAX(ST_XMAX({table_info["geometry_field"]}::geometry)),
+                           MAX(ST_YMAX({table_info["geometry_field"]}::geometry))
+                         ), {table_info["srid"]}
+                       ), 4326
+                     ) ur
+                FROM {table_info["schema_name"]}.{table_info["table_name"]}
+            )
+            SELECT ST_X(ll) x_min
+                 , ST_Y(ll) y_min
+                 , ST_X(ur) x_max
+                 , ST_Y(ur) y_max
+              FROM extents
+            ;
+            """
+        )
+        return self._as_bbox(extents)
+
+    async def _get_table_estimated_spatial_extent(
+        self, table_info: Dict[str, Any]
+    ) -> List[float]:
+        try:
             extents = await self.db.fetch_one(
-                f"""
-                WITH extents AS (
-                  SELECT ST_TRANSFORM(
-                           ST_SetSRID(
-                             ST_MakePoint(
-                               MIN(ST_XMIN({table_info["geometry_field"]}::geometry)),
-                               MIN(ST_YMIN({table_info["geometry_field"]}::geometry))
-                             ), {table_info["srid"]}
-                           ), 4326
-                         ) ll
-                       , ST_TRANSFORM(
-                           ST_SetSRID(
-                             ST_MakePoint(
-                               MAX(ST_XMAX({table_info["geometry_field"]}::geometry)),
-                               MAX(ST_YMAX({table_info["geometry_field"]}::geometry))
-                             ), {table_info["srid"]}
-                           ), 4326
-                         ) ur
-                    FROM {table_info["schema_name"]}.{table_info["table_name"]}
+                sa.text(
+                    """
+                    WITH extents AS (
+                      SELECT ST_TRANSFORM(
+                               ST_SetSRID(
+                                 ST_EstimatedExtent(
+                                   :schema_name, :table_name, :geometry_field
+                                 )::geometry, :srid
+                               ), 4326
+                             ) extent
+                    )
+                    SELECT ST_XMIN(extent) x_min
+                         , ST_YMIN(extent) y_min
+                         , ST_XMAX(extent) x_max
+                         , ST_YMAX(extent) y_max
+                      FROM extents
+                    ;
+                    """
+                ).bindparams(
+                    schema_name=table_info["schema_name"],
+                    table_name=table_info["table_name"],
+                    geometry_field=table_info["geometry_field"],
+                    srid=table_info["srid"],
                 )
-                SELECT ST_X(ll) x_min
-                     , ST_Y(ll) y_min
-                     , ST_X(ur) x_max
-                     , ST_Y(ur) y_max
-                  FROM extents
-                ;
-                """
             )
-            if (
-                extents is not None
-                and len(list(filter(lambda value: value is not None, extents.values())))
-                == 4
-            ):
-                table_spatial_extents[table_info["qualified_table_name"]] = list(
-                    extents.values()
-                )
-            else:
-                table_spatial_extents[table_info["qualified_table_name"]] = [
-                    -180,
-                    -90,
-                    180,
-                    90,
-                ]
+        except Exception as e:
+            # e.g. geography columns, which PostGIS does not estimate
+            LOGGER.info(f"no estimated extent for {table_info['table_name']}: {e}")
+            extents = None
+        return self._as_bbox(extents)
 
-        return table_spatial_extents
+    def _as_bbox(self, extents: Optional[Mapping[str, Any]]) -> List[float]:
+        if (
+            extents is not None
+            and len(list(filter(lambda value: value is not None, extents.values()))) == 4
+        ):
+            return list(extents.values())
+        else:
+            return [-180, -90, 180, 90]
 
     async def _get_table_sqlalchemy_models(
         self, tables: Dict[str, Dict[str, Any]]
     ) -> Dict[str, sa.Table]:
-        table_models = {}
-        metadata_by_schema = {}
-        temp_engine = sa.create_engine(str(self.db.url))
-        for qualified_table_name, table_info in tables.items():
-            schema_name = table_info["schema_name"]
-            if schema_name not in metadata_by_schema:
-                metadata_by_schema[schema_name] = sa.MetaData(
-                    bind=temp_engine, schema=schema_name
-                )
-                metadata_by_schema[schema_name].reflect()
-            table_models[qualified_table_name] = metadata_by_schema[schema_name].tables[
-                qualified_table_name
-            ]
-        temp_engine.dispose()
+        # models are built from the catalog as reflection would build them, but only
+        # for permitted tables and over the data source's own connections
+        enums, domains = await self._get_user_types()
+        sql = None
+        with open(path.join(path.dirname(__file__), "sql", "columns.sql")) as sql_file:
+            sql = sql_file.read()
+        qualified_table_names = list(tables.keys())
+        batch_size = settings.reflection_batch_size(self.connection_name)
+        batches = [
+            qualified_table_names[index : index + batch_size]  # noqa: E203
+            for index in range(0, len(qualified_table_names), batch_size)
+        ]
+        table_columns: Dict[str, List[Mapping[str, Any]]] = {
+            qualified_table_name: [] for qualified_table_name in qualified_table_names
+        }
+        for rows in await gather_on_separate_connections(
+            *[
+                self.db.fetch_all(sa.text(sql).bindparams(qualified_table_names=batch))
+                for batch in batches
+            ],
+            limit=settings.discovery_concurrency(self.connection_name),
+        ):
+            for row in rows:
+                table_columns[row["qualified_table_name"]].append(row)
 
-        return table_models
+        metadata = sa.MetaData()
+        return {
+            qualified_table_name: sa.Table(
+                table_info["table_name"],
+                metadata,
+                *[
+                    self._as_sqlalchemy_column(
+                        row, enums, domains, table_info["schema_name"]
+                    )
+                    for row in table_columns[qualified_table_name]
+                ],
+                schema=table_info["schema_name"],
+            )
+            for qualified_table_name, table_info in tables.items()
+        }
+
+    async def _get_user_types(self) -> Tuple[UserTypes, UserTypes]:
+        sql = None
+        with open(path.join(path.dirname(__file__), "sql", "user_types.sql")) as sql_file:
+            sql = sql_file.read()
+        enums = dict()
+        domains = dict()
+        for row in [dict(db_value) for db_value in await self.db.fetch_all(sql)]:
+            key = (row["name"],) if row["visible"] else (row["schema"], row["name"])
+            if row["kind"] == "e":
+                enums[key] = row
+            else:
+                domains[key] = row
+        return enums, domains
+
+    def _as_sqlalchemy_column(
+        self,
+        row: Mapping[str, Any],
+        enums: UserTypes,
+        domains: UserTypes,
+        schema_name: str,
+    ) -> sa.Column:
+        column_info = POSTGRESQL_DIALECT._get_column_info(
+            row["column_name"],
+            row["format_type"],
+            None,
+            row["not_null"],
+            domains,
+            enums,
+            schema_name,
+            None,
+            None,
+        )
+        return sa.Column(
+            column_info["name"],
+            column_info["type"],
+            nullable=column_info["nullable"],
+            primary_key=row["primary_key"],
+        )
 
     async def _get_table_temporal_fields(
         self, table_models: Dict[str, sa.Table]
@@ -410,68 +874,232 @@ class PostgresqlDataSource(DataSource):
             for qualified_table_name, model in table_models.items()
         }
 
-    async def _get_table_temporal_extents(  # noqa: C901
+    async def _get_table_temporal_extents(
         self,
         table_models: Dict[str, sa.Table],
         table_temporal_fields: Dict[str, List[TemporalInstant]],
+        mode: ExtentMode = ExtentMode.EXACT,
     ) -> Dict[str, List[List[datetime]]]:
-        table_temporal_extents: Dict[str, List[List[datetime]]] = {}
-        for qualified_table_name, temporal_fields in table_temporal_fields.items():
-            start = None
-            end = None
-            if qualified_table_name not in table_temporal_extents:
-                table_temporal_extents[qualified_table_name] = []
-            for temporal_field in temporal_fields:
-                range_row = await self.db.fetch_one(
-                    sa.select(
-                        [
-                            sa.func.min(
-                                table_models[qualified_table_name].columns[
-                                    temporal_field.field_name
-                                ]
-                            ),
-                            sa.func.max(
-                                table_models[qualified_table_name].columns[
-                                    temporal_field.field_name
-                                ]
-                            ),
-                        ]
-                    ).select_from(table_models[qualified_table_name])
-                )
-                row_start, row_end = range_row[0], range_row[1]
-                if row_start is not None:
-                    if isinstance(row_start, datetime):
-                        if row_start.tzinfo is None:
-                            # explicitly set TIMESTAMP WITHOUT TIME ZONE to the database
-                            # time zone so that they can be compared to time-zone aware
-                            # TIMESTAMPTZ and be converted to other time zones
-                            row_start = self.default_tz.localize(row_start)
-                    elif isinstance(row_start, date):
-                        row_start = self.default_tz.localize(
-                            datetime(row_start.year, row_start.month, row_start.day)
-                        )
-                    if start is None or start > row_start:
-                        start = row_start
-                if row_end is not None:
-                    if isinstance(row_end, datetime):
-                        if row_end.tzinfo is None:
-                            row_end = self.default_tz.localize(row_end)
-                    elif isinstance(row_end, date):
-                        row_end = self.default_tz.localize(
-                            datetime(
-                                row_end.year,
-                                row_end.month,
-                                row_end.day,
-                            )
+        get_extent = (
+            self._get_table_estimated_temporal_extent
+            if mode == ExtentMode.ESTIMATED
+            else self._get_table_temporal_extent
+        )
+        return dict(
+            zip(
+                table_temporal_fields.keys(),
+                await gather_on_separate_connections(
+                    *[
+                        get_extent(table_models[qualified_table_name], temporal_fields)
+                        for qualified_table_name, temporal_fields in (
+                            table_temporal_fields.items()
                         )
-                    if end is None or end < row_end:
-                        end = row_end
+                    ],
+                    limit=settings.discovery_concurrency(self.connection_name),
+                ),
+            )
+        )
 
-            table_temporal_extents[qualified_table_name].append(
+    async def _get_table_temporal_extent(
+        self,
+        table_model: sa.Table,
+        temporal_fields: List[TemporalInstant],
+    ) -> List[List[datetime]]:
+        if len(temporal_fields) == 0:
+            return self._as_intervals(None, 0)
+        # one scan of the table reads the range of every temporal field
+        range_row = await self.db.fetch_one(
+            sa.select(
                 [
-                    datetime_as_rfc3339(start),
-                    datetime_as_rfc3339(end),
+                    aggregate(table_model.columns[temporal_field.field_name])
+                    for temporal_field in temporal_fields
+                    for aggregate in [sa.func.min, sa.func.max]
                 ]
+            ).select_from(table_model)
+        )
+        return self._as_intervals(range_row, len(temporal_fields))
+
+    async def _get_table_estimated_temporal_extent(
+        self,
+        table_model: sa.Table,
+        temporal_fields: List[TemporalInstant],
+    ) -> List[List[datetime]]:
+        if len(temporal_fields) == 0:
+            return self._as_intervals(None, 0)
+        # ANALYZE records sampled values of each column in pg_stats, most common
+        # values separately from the histogram, so both are searched for bounds
+        bounds = []
+        for index, temporal_field in enumerate(temporal_fields):
+            type_name = table_model.columns[temporal_field.field_name].type.compile(
+                dialect=POSTGRESQL_DIALECT
+            )
+            for aggregate in ["MIN", "MAX"]:
+                bounds.append(
+                    f"""
+                    (SELECT {aggregate}(bound)
+                       FROM pg_stats
+                          , UNNEST(
+                              histogram_bounds::text::{type_name}[]
+                              || most_common_vals::text::{type_name}[]
+                            ) bound
+                      WHERE schemaname = :schema_name
+                        AND tablename = :table_name
+                        AND attname = :field_{index})
+                    """
+                )
+        range_row = await self.db.fetch_one(
+            sa.text(f"SELECT {', '.join(bounds)}").bindparams(
+                schema_name=table_model.schema,
+                table_name=table_model.name,
+                **{
+                    f"field_{index}": temporal_field.field_name
+                    for index, temporal_field in enumerate(temporal_fields)
+                },
+            )
+        )
+        return self._as_intervals(range_row, len(temporal_fields))
+
+    def _as_intervals(self, range_row: Any, field_count: int) -> List[List[datetime]]:
+        # range_row holds the minimum then maximum of each temporal field in turn
+        start = None
+        end = None
+        for index in range(field_count):
+            row_start = self._as_tz_aware(range_row[index * 2])
+            row_end = self._as_tz_aware(range_row[index * 2 + 1])
+            if row_start is not None and (start is None or start > row_start):
+                start = row_start
+            if row_end is not None and (end is None or end < row_end):
+                end = row_end
+
+        return [
+            [
+                datetime_as_rfc3339(start),
+                datetime_as_rfc3339(end),
+            ]
+        ]
+
+    def _as_tz_aware(self, value: Optional[date]) -> Optional[datetime]:
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                # explicitly set TIMESTAMP WITHOUT TIME ZONE to the database
+                # time zone so that they can be compared to time-zone aware
+                # TIMESTAMPTZ and be converted to other time zones
+                return self.default_tz.localize(value)
+        elif isinstance(value, date):
+            return self.default_tz.localize(datetime(value.year, value.month, value.day))
+        return value
+
+    async def _refresh_extents(
+        self,
+        layers: Dict[str, PostgresqlLayer],
+        derived_extents: Dict[str, Tuple[List[List[float]], List[List[datetime]]]],
+    ) -> None:
+        if self._snapshot is None:
+            exact_extents = await self._get_exact_extents(layers)
+            self._record_exact_extents(exact_extents)
+        else:
+            # workers sharing a snapshot refresh its extents once, the others wait for
+            # the first and load the extents it saved
+            async with self._snapshot.locked("refresh"):
+                exact_extents = await self._load_exact_extents(set(layers.keys()))
+                if exact_extents is None:
+                    exact_extents = await self._get_exact_extents(layers)
+                    self._record_exact_extents(exact_extents)
+                    async with self._snapshot.locked():
+                        await self._save_snapshot()
+                else:
+                    self._record_exact_extents(exact_extents)
+        refreshed_layers: Dict[str, PostgresqlLayer] = dict()
+        for key, layer in layers.items():
+            derived_bboxes, derived_intervals = derived_extents[key]
+            exact_bboxes, exact_intervals = exact_extents[key]
+            # published layers are not modified, the refreshed layers replace them.
+            # Extents configured in oaff.collections take precedence over derived ones
+            refreshed_layers[layer.id] = layer.copy(
+                update={
+                    "bboxes": exact_bboxes
+                    if layer.bboxes == derived_bboxes
+                    else layer.bboxes,
+                    "intervals": exact_intervals
+                    if layer.intervals == derived_intervals
+                    else layer.intervals,
+                }
             )
+        self._layers = [refreshed_layers.get(layer.id, layer) for layer in self._layers]
+        update_layers(self, self._layers)
 
-        return table_temporal_extents
+    async def _get_exact_extents(
+        self, layers: Dict[str, PostgresqlLayer]
+    ) -> Dict[str, Tuple[List[List[float]], List[List[datetime]]]]:
+        with self._discovery_phase("extentRefresh"):
+            tables = {
+                key: {
+                    "schema_name": layer.schema_name,
+                    "table_name": layer.table_name,
+                    "geometry_field": layer.geometry_field_name,
+                    "srid": layer.geometry_srid,
+                }
+                for key, layer in layers.items()
+            }
+            table_models = {key: layer.model for key, layer in layers.items()}
+            table_spatial_extents = await self._get_table_spatial_extents(tables)
+            table_temporal_extents = await self._get_table_temporal_extents(
+                table_models, await self._get_table_temporal_fields(table_models)
+            )
+        return {
+            key: ([table_spatial_extents[key]], table_temporal_extents[key])
+            for key in layers.keys()
+        }
+
+    async def _load_exact_extents(
+        self, keys: Set[str]
+    ) -> Optional[Dict[str, Tuple[List[List[float]], List[List[datetime]]]]]:
+        # None unless the snapshot holds exact extents of the tables as they are now
+        async with self._snapshot.locked():
+            content = await self._snapshot.load(self._snapshot_fingerprint)
+        if content is None or any(
+            key in content["estimated"]
+            or key not in content["discovered"]
+            or content["discovered"][key][0] != self._table_fingerprints.get(key)
+            for key in keys
+        ):
+            return None
+        LOGGER.info(f"{self.name} exact extents loaded from discovery snapshot")
+        return {
+            key: (
+                content["discovered"][key][1].bboxes,
+                content["discovered"][key][1].intervals,
+            )
+            for key in keys
+        }
+
+    def _record_exact_extents(
+        self, exact_extents: Dict[str, Tuple[List[List[float]], List[List[datetime]]]]
+    ) -> None:
+        # the extents describe the tables as they were when this discovery began
+        for key, (bboxes, intervals) in exact_extents.items():
+            _, discovered_layer = self._discovered[key]
+            discovered_layer.bboxes = bboxes
+            discovered_layer.intervals = intervals
+            self._discovered[key] = (self._table_fingerprints.get(key), discovered_layer)
+        self._estimated -= set(exact_extents.keys())
+
+    async def _cancel_extent_refresh(self) -> None:
+        if self._pending_extent_refresh is not None:
+            # closes the coroutine that was never scheduled
+            self._pending_extent_refresh.close()
+            self._pending_extent_refresh = None
+        if self._extent_refresh is not None:
+            self._extent_refresh.cancel()
+            await gather(self._extent_refresh, return_exceptions=True)
+            self._extent_refresh = None
+
+    @contextmanager
+    def _discovery_phase(self, phase: str) -> Iterator[None]:
+        started = perf_counter()
+        yield
+        self.discovery_timings[phase] = round(perf_counter() - started, 3)
+        LOGGER.info(
+            f"{self.name} discovery phase {phase} took "
+            f"{self.discovery_timings[phase]:.3f}s"
+        )
@@ -1,12 +1,17 @@
 from json import dumps
-from typing import Final, List
+from typing import Final, List, Optional
 from uuid import uuid4
 
 import sqlalchemy as sa
 from databases.core import Database
 
 from oaff.app.data.retrieval.feature_provider import FeatureProvider
+from oaff.app.data.sources.common.crs import CRS84, Crs, parse_crs
 from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_layer import PostgresqlLayer
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_statements import (
+    output_geometry,
+    output_geometry_column,
+)
 from oaff.app.responses.models.collection_item_html import CollectionItemHtml
 from oaff.app.responses.models.link import Link
 
@@ -19,15 +24,20 @@ class PostgresqlFeatureProvider(FeatureProvider):
         self,
         db: Database,
         layer: PostgresqlLayer,
+        crs: Optional[Crs] = None,
     ):
         self.db = db
         self.layer = layer
+        self.crs = crs if crs is not None else parse_crs(CRS84)
 
     async def as_geojson(
         self,
         feature_id: str,
         links: List[Link],
     ) -> str:
+        geometry = output_geometry(
+            f'"{self.layer.geometry_field_name}"', self.layer, self.crs
+        )
         result = await self.db.fetch_one(
             # fmt: off
             sa.select([
@@ -35,9 +45,7 @@ class PostgresqlFeatureProvider(FeatureProvider):
                 JSON_BUILD_OBJECT(
                     'type', 'Feature',
                     'id', "{self.layer.unique_field_name}",
-                    'geometry', ST_AsGeoJSON(
-                        "{self.layer.geometry_field_name}"
-                    )::JSONB,
+                    'geometry', ST_AsGeoJSON({geometry})::JSONB,
                     'properties', TO_JSONB({self.layer.table_name}) - '{
                         self.layer.unique_field_name
                     }' - '{
@@ -59,6 +67,37 @@ class PostgresqlFeatureProvider(FeatureProvider):
             else None
         )
 
+    async def as_flatgeobuf(
+        self,
+        feature_id: str,
+    ) -> Optional[bytes]:
+        feature = (
+            sa.select(
+                [
+                    column
+                    if column.name != self.layer.geometry_field_name
+                    else output_geometry_column(column, self.layer, self.crs)
+                    for column in self.layer.model.c
+                ]
+            )
+            .where(self.get_clause(self.layer, feature_id))
+            .alias("feature")
+        )
+        result = await self.db.fetch_one(
+            sa.select(
+                [
+                    sa.func.ST_AsFlatGeobuf(
+                        sa.literal_column("feature"),
+                        False,
+                        self.layer.geometry_field_name,
+                    ),
+                    sa.func.count(),
+                ]
+            ).select_from(feature)
+        )
+        # the aggregate is NULL, or a header-only file, without a matching feature
+        return result[0] if result[0] is not None and result[1] > 0 else None
+
     async def as_html_compatible(
         self,
         feature_id: str,
@@ -87,19 +126,4 @@ class PostgresqlFeatureProvider(FeatureProvider):
         )
 
     def get_clause(self, layer: PostgresqlLayer, feature_id: str):
-        id_field = layer.model.columns[layer.unique_field_name]
-        id_type = id_field.type.python_type
-        if id_type is int:
-            try:
-                return id_field == int(feature_id)
-            except ValueError:
-                return False
-        elif id_type is float:
-            try:
-                return id_field == float(feature_id)
-            except ValueError:
-                return False
-        elif id_type is str:
-            return id_field == feature_id
-        else:
-            return sa.cast(id_field, sa.types.String) == feature_id
+        return layer.id_clause(feature_id)
@@ -1,105 +1,172 @@
-from json import dumps
-from typing import Callable, Dict, Final, List
-from uuid import uuid4
+from json import dumps, loads
+from logging import getLogger
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Tuple,
+)
 
-import sqlalchemy as sa
 from databases.core import Database
 
+from oaff.app import settings
+from oaff.app.cache.page_cache import PageCache
 from oaff.app.data.retrieval.feature_set_provider import FeatureSetProvider
+from oaff.app.data.sources.postgresql.concurrency import run_on_separate_connection
 from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_layer import PostgresqlLayer
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_statements import (
+    ItemsStatement,
+)
 from oaff.app.responses.models.collection_items_html import CollectionItemsHtml
 from oaff.app.responses.models.link import Link, PageLinkRel
-from oaff.app.util import now_as_rfc3339
+from oaff.app.util import as_geojson_seq_record, now_as_rfc3339
+
+LOGGER: Final = getLogger(__file__)
 
 
 class PostgresqlFeatureSetProvider(FeatureSetProvider):
 
-    FEATURES_PLACEHOLDER: Final = str(uuid4())
+    STREAM_CHUNK_FEATURES: Final = 100
 
     def __init__(
         self,
         db: Database,
-        id_set: sa.sql.expression.Select,
+        items_statement: Callable[..., Any],
         layer: PostgresqlLayer,
-        total_count: int,
+        limit: int,
+        total_count_provider: Callable[[], Awaitable[Optional[int]]],
+        total_count_estimated: bool = False,
+        page_cache: Optional[PageCache] = None,
+        page_key: str = "",
     ):
         self.db = db
-        self.id_set = id_set
+        # returns a page statement of the requested kind, with paging values bound
+        self.items_statement = items_statement
         self.layer = layer
-        self.total_count = total_count
+        self.limit = limit
+        self.total_count_provider = total_count_provider
+        self.total_count_estimated = total_count_estimated
+        self.more_available = False
+        self.page_cache = page_cache
+        self.page_key = page_key
 
     async def as_geojson(
         self,
         links: List[Link],
-        page_links_provider: Callable[[int, int], Dict[PageLinkRel, Link]],
-    ) -> str:
-        rows = [
-            row[0]
-            for row in await self.db.fetch_all(
-                # fmt: off
-                sa.select([
-                    sa.text(f"""
-                    JSON_BUILD_OBJECT(
-                        'type', 'Feature',
-                        'id', source."{self.layer.unique_field_name}",
-                        'geometry', ST_AsGeoJSON(
-                            source."{self.layer.geometry_field_name}"
-                        )::JSONB,
-                        'properties', TO_JSONB(source) - '{
-                            self.layer.unique_field_name
-                        }' - '{
-                            self.layer.geometry_field_name
-                        }'
-                    )
-                    """)
-                ])
-                .select_from(
-                    self.layer.model.alias("source").join(
-                        self.id_set,
-                        self.layer.model.alias("source").c[self.layer.unique_field_name]
-                        == self.id_set.c["id"],
-                    )
+        page_links_provider: Callable[[bool, Any], Dict[PageLinkRel, Link]],
+    ) -> AsyncIterator[str]:
+        cached_page = await self._get_cached_page()
+        if cached_page is not None:
+            summary, features = cached_page
+            yield '{"type": "FeatureCollection", "features": [' + features
+            yield self._geojson_members(
+                links,
+                page_links_provider,
+                summary["moreAvailable"],
+                summary["lastId"],
+                summary["numberMatched"],
+                summary["numberReturned"],
+            )
+            return
+        # count and page are independent, run the count on its own connection while
+        # the page streams so latency is bounded by the slower query
+        total_count = run_on_separate_connection(self.total_count_provider())
+        chunks = self._iterate_features()
+        try:
+            envelope = '{"type": "FeatureCollection", "features": ['
+            # the first rows are read before the envelope is yielded, so that a failing
+            # query raises before any of the response has been sent
+            chunk = await self._next_chunk(chunks)
+            if chunk is None:
+                yield envelope
+            returned = 0
+            last_id = None
+            # pages are only cached up to a size, beyond which they stream without
+            # being held in memory
+            encoded_chunks: Optional[List[str]] = (
+                [] if self.page_cache is not None else None
+            )
+            cache_capacity = settings.PAGE_CACHE_MAX_PAGE_SIZE()
+            while chunk is not None:
+                encoded_chunk = ",".join([row["feature"] for row in chunk])
+                yield (envelope if returned == 0 else ",") + encoded_chunk
+                if encoded_chunks is not None:
+                    cache_capacity -= len(encoded_chunk)
+                    if cache_capacity >= 0:
+                        encoded_chunks.append(encoded_chunk)
+                    else:
+                        encoded_chunks = None
+                returned += len(chunk)
+                last_id = chunk[-1]["id"]
+                chunk = await self._next_chunk(chunks)
+            number_matched = await total_count
+            # the closing members are only known once all features have been read
+            yield self._geojson_members(
+                links,
+                page_links_provider,
+                self.more_available,
+                last_id,
+                number_matched,
+                returned,
+            )
+            if encoded_chunks is not None:
+                await self._put_cached_page(
+                    {
+                        "moreAvailable": self.more_available,
+                        # page links only use the string form of the last ID
+                        "lastId": str(last_id) if last_id is not None else None,
+                        "numberMatched": number_matched,
+                        "numberReturned": returned,
+                    },
+                    ",".join(encoded_chunks),
                 )
-                # fmt: on
+        finally:
+            total_count.cancel()
+            # releases the cursor's connection if the response is abandoned
+            await chunks.aclose()
+
+    async def as_geojsonseq(self) -> AsyncIterator[str]:
+        async for chunk in self._iterate_features():
+            yield "".join([as_geojson_seq_record(row["feature"]) for row in chunk])
+
+    async def as_flatgeobuf(
+        self,
+        page_links_provider: Callable[[bool, Any], Dict[PageLinkRel, Link]],
+        spatial_index: bool,
+    ) -> Tuple[bytes, Dict[PageLinkRel, Link]]:
+        result = await self.db.fetch_one(
+            self.items_statement(
+                ItemsStatement.FLATGEOBUF,
+                page_limit=self.limit,
+                spatial_index=spatial_index,
             )
-        ]
-        return dumps(
-            {
-                "type": "FeatureCollection",
-                "features": self.FEATURES_PLACEHOLDER,
-                "links": [
-                    dict(link)
-                    for link in links
-                    + list(page_links_provider(self.total_count, len(rows)).values())
-                ],
-                "numberMatched": self.total_count,
-                "numberReturned": len(rows),
-                "timeStamp": now_as_rfc3339(),
-            }
-        ).replace(f'"{self.FEATURES_PLACEHOLDER}"', f'[{",".join(rows)}]')
+        )
+        # the aggregate is NULL rather than a header-only file when there are no rows
+        return (
+            bytes(result["fgb"]) if result["fgb"] is not None else b"",
+            page_links_provider(result["more_available"], result["last_id"]),
+        )
 
     async def as_html_compatible(
-        self, links: List[Link], page_links_provider: Callable[[int, int], List[Link]]
+        self,
+        links: List[Link],
+        page_links_provider: Callable[[bool, Any], Dict[PageLinkRel, Link]],
     ) -> CollectionItemsHtml:
         rows = [
             dict(row)
-            for row in await self.db.fetch_all(
-                sa.select(
-                    [
-                        col
-                        for col in self.layer.model.c
-                        if col.name != self.layer.geometry_field_name
-                    ]
-                ).select_from(
-                    self.layer.model.join(
-                        self.id_set,
-                        self.layer.model.primary_key.columns[self.layer.unique_field_name]
-                        == self.id_set.c["id"],
-                    )
-                )
-            )
+            for row in await self.db.fetch_all(self.items_statement(ItemsStatement.HTML))
         ]
-        page_links = page_links_provider(self.total_count, len(rows))
+        more_available = len(rows) > self.limit
+        rows = rows[: self.limit]
+        page_links = page_links_provider(
+            more_available,
+            rows[-1][self.layer.unique_field_name] if len(rows) > 0 else None,
+        )
         return CollectionItemsHtml(
             format_links=links,
             next_link=page_links[PageLinkRel.NEXT]
@@ -112,3 +179,92 @@ class PostgresqlFeatureSetProvider(FeatureSetProvider):
             collection_id=self.layer.id,
             unique_field_name=self.layer.unique_field_name,
         )
+
+    async def _iterate_features(self) -> AsyncIterator[List[Any]]:
+        """
+        Reads the page through a server-side cursor and yields rows in chunks,
+        stopping at the limit and recording whether the probe row was present.
+        """
+        self.more_available = False
+        read = 0
+        chunk: List[Any] = []
+        async for row in self.db.iterate(self.items_statement(ItemsStatement.GEOJSON)):
+            if read == self.limit:
+                self.more_available = True
+                break
+            chunk.append(row)
+            read += 1
+            if len(chunk) == self.STREAM_CHUNK_FEATURES:
+                yield chunk
+                chunk = []
+        if len(chunk) > 0:
+            yield chunk
+
+    async def _next_chunk(self, chunks: AsyncIterator[List[Any]]) -> Optional[List[Any]]:
+        try:
+            return await chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def _geojson_members(
+        self,
+        links: List[Link],
+        page_links_provider: Callable[[bool, Any], Dict[PageLinkRel, Link]],
+        more_available: bool,
+        last_id: Any,
+        number_matched: Optional[int],
+        number_returned: int,
+    ) -> str:
+        return (
+            "], "
+            + dumps(
+                {
+                    "links": [
+                        dict(link)
+                        for link in links
+                        + list(page_links_provider(more_available, last_id).values())
+                    ],
+                    **self._number_matched(number_matched),
+                    "numberReturned": number_returned,
+                    "timeStamp": now_as_rfc3339(),
+                }
+            )[1:]
+        )
+
+    async def _get_cached_page(self) -> Optional[Tuple[Dict[str, Any], str]]:
+        if self.page_cache is None:
+            return None
+        try:
+            page = await self.page_cache.get(self.layer.id, self.page_key)
+        except Exception as e:
+            LOGGER.warning(f"error reading cached page: {e}")
+            return None
+        if page is None:
+            return None
+        # a cached page is its JSON summary line followed by the encoded features
+        summary, features = page.decode("utf-8").split("\n", 1)
+        return loads(summary), features
+
+    async def _put_cached_page(self, summary: Dict[str, Any], features: str) -> None:
+        if self.page_cache is None:
+            return
+        try:
+            await self.page_cache.put(
+                self.layer.id,
+                self.page_key,
+                f"{dumps(summary)}\n{features}".encode("utf-8"),
+            )
+        except Exception as e:
+            LOGGER.warning(f"error caching page: {e}")
+
+    def _number_matched(self, total_count: Optional[int]) -> Dict[str, Any]:
+        if total_count is None:
+            return {}
+        elif self.total_count_estimated:
+            # numberMatched is exact by definition, flag estimates with a foreign member
+            return {
+                "numberMatched": total_count,
+                "numberMatchedEstimated": True,
+            }
+        else:
+            return {"numberMatched": total_count}
@@ -1,6 +1,16 @@
-from sqlalchemy.sql.schema import Table
+from typing import Dict, List, Optional
 
+import sqlalchemy as sa
+from pydantic import PrivateAttr
+from sqlalchemy.sql.schema import Column, Table
+
+from oaff.app.data.sources.common.crs import CRS84, Crs
 from oaff.app.data.sources.common.layer import Layer
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_statements import (
+    PostgresqlStatements,
+    python_type,
+)
+from oaff.app.settings import SPATIAL_FILTER_GEOMETRY_FIELD_ALIAS
 
 
 class PostgresqlLayer(Layer):
@@ -9,15 +19,109 @@ class PostgresqlLayer(Layer):
     geometry_field_name: str
     geometry_srid: int
     model: Table
+    _statements: Optional[PostgresqlStatements] = PrivateAttr(default=None)
+    _unique_field_name: Optional[str] = PrivateAttr(default=None)
+    _fields: Optional[List[str]] = PrivateAttr(default=None)
+    _columns: Optional[Dict[str, Column]] = PrivateAttr(default=None)
+    # statements for CRSs other than CRS84, created when first requested
+    _crs_statements: Dict[str, PostgresqlStatements] = PrivateAttr(default_factory=dict)
 
     class Config:
         arbitrary_types_allowed = True
 
     @property
-    def unique_field_name(self):
+    def statements(self) -> PostgresqlStatements:
+        return (
+            self._statements
+            if self._statements is not None
+            else self.prepare_statements()
+        )
+
+    def statements_for(self, crs: Optional[Crs]) -> PostgresqlStatements:
+        if crs is None or crs.uri == CRS84:
+            return self.statements
+        statements = self._crs_statements.get(crs.uri)
+        if statements is None:
+            # requested CRSs are among the layer's supported CRSs, which bounds
+            # the statements held
+            statements = PostgresqlStatements(self, crs)
+            self._crs_statements[crs.uri] = statements
+        return statements
+
+    def prepare(self) -> None:
+        super().prepare()
+        self._unique_field_name = self._get_unique_field_name()
+        self._fields = self._get_fields()
+        self._columns = self._get_columns()
+        self.prepare_statements()
+
+    def prepare_statements(self) -> PostgresqlStatements:
+        self._statements = PostgresqlStatements(self)
+        self._crs_statements = dict()
+        return self._statements
+
+    def fingerprint(self) -> str:
+        # items are read from every column of the table
+        return "\n".join(
+            [
+                super().fingerprint(),
+                self.json(
+                    include={
+                        "schema_name",
+                        "table_name",
+                        "geometry_field_name",
+                        "geometry_srid",
+                    }
+                ),
+                *[f"{column.name} {column.type}" for column in self.model.columns],
+            ]
+        )
+
+    @property
+    def unique_field_name(self) -> str:
+        return (
+            self._unique_field_name
+            if self._unique_field_name is not None
+            else self._get_unique_field_name()
+        )
+
+    @property
+    def fields(self) -> List[str]:
+        return self._fields if self._fields is not None else self._get_fields()
+
+    @property
+    def columns(self) -> Dict[str, Column]:
+        # filterable columns by name, including the spatial filter's geometry alias
+        return self._columns if self._columns is not None else self._get_columns()
+
+    def id_clause(self, value: str) -> sa.sql.expression.ClauseElement:
+        # compare a caller-supplied feature ID with the unique field
+        id_field = self.columns[self.unique_field_name]
+        id_type = python_type(id_field)
+        if id_type is int:
+            try:
+                return id_field == int(value)
+            except ValueError:
+                return sa.false()
+        elif id_type is float:
+            try:
+                return id_field == float(value)
+            except ValueError:
+                return sa.false()
+        elif id_type is str:
+            return id_field == value
+        else:
+            return sa.cast(id_field, sa.types.String) == value
+
+    def _get_unique_field_name(self) -> str:
         # layers are only available if they have exactly one PK
         return self.model.primary_key.columns.keys()[0]
 
-    @property
-    def fields(self):
+    def _get_fields(self) -> List[str]:
         return self.model.columns.keys()
+
+    def _get_columns(self) -> Dict[str, Column]:
+        return {
+            SPATIAL_FILTER_GEOMETRY_FIELD_ALIAS: self.model.c[self.geometry_field_name],
+            **{field_name: self.model.c[field_name] for field_name in self.fields},
+        }
@@ -0,0 +1,235 @@
+from enum import Enum
+from ipaddress import ip_interface, ip_network
+from typing import TYPE_CHECKING, Any, Callable, Dict, Final, Optional, Tuple
+from uuid import UUID
+
+import geoalchemy2 as ga
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from oaff.app.data.sources.common.crs import CRS84, Crs, parse_crs
+from oaff.app.data.sources.postgresql.stac_hybrid.statement_template import (
+    StatementTemplate,
+)
+
+if TYPE_CHECKING:
+    from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_layer import (
+        PostgresqlLayer,
+    )
+
+
+# parse cursors of ID types without a Python type, which the database casts to
+NATIVE_CURSOR_PARSERS: Final[Dict[type, Callable[[str], Any]]] = {
+    postgresql.UUID: UUID,
+    postgresql.INET: ip_interface,
+    postgresql.CIDR: ip_network,
+}
+
+
+def output_geometry(geometry: str, layer: "PostgresqlLayer", crs: Crs) -> str:
+    # PostGIS writes coordinates in x, y order, so those of a CRS with northing
+    # first are swapped
+    if crs.srid != layer.geometry_srid:
+        geometry = f"ST_Transform({geometry}::geometry, {crs.srid})"
+    if crs.northing_first:
+        geometry = f"ST_FlipCoordinates({geometry}::geometry)"
+    return geometry
+
+
+def output_geometry_column(column: Any, layer: "PostgresqlLayer", crs: Crs) -> Any:
+    # binary encodings record the CRS and keep x, y order, so are only transformed
+    if crs.srid == layer.geometry_srid:
+        return column
+    return sa.func.ST_Transform(sa.cast(column, ga.Geometry()), crs.srid).label(
+        column.name
+    )
+
+
+def python_type(column: Any) -> Optional[type]:
+    # types such as UUID and INET have no Python equivalent in SQLAlchemy
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+class ItemsStatement(str, Enum):
+    GEOJSON = "geojson"
+    HTML = "html"
+    FLATGEOBUF = "flatgeobuf"
+
+
+class PostgresqlStatements:
+    """
+    Statements used to read a layer's items, built once per layer.
+    Item statements take their paging values as named bind parameters: "limit" (the
+    page size plus one probe row), "offset" or "cursor", and for FlatGeobuf
+    "page_limit" and "spatial_index", which requests the spatial index if the page
+    turns out to hold every item.
+    Unfiltered statements are compiled once as templates, filtered statements are
+    assembled from the same parts for each request.
+    Geometries are transformed to the statements' CRS, CRS84 unless another is given.
+    """
+
+    def __init__(self, layer: "PostgresqlLayer", crs: Optional[Crs] = None):
+        self.layer = layer
+        self.crs = crs if crs is not None else parse_crs(CRS84)
+        self.id_field = layer.model.primary_key.columns[layer.unique_field_name]
+        self.source = layer.model.alias("source")
+        geometry = output_geometry(
+            f'source."{layer.geometry_field_name}"', layer, self.crs
+        )
+        self.geojson_feature = sa.literal_column(
+            # fmt: off
+            f"""
+            JSON_BUILD_OBJECT(
+                'type', 'Feature',
+                'id', source."{layer.unique_field_name}",
+                'geometry', ST_AsGeoJSON({geometry})::JSONB,
+                'properties', TO_JSONB(source) - '{
+                    layer.unique_field_name
+                }' - '{
+                    layer.geometry_field_name
+                }'
+            )
+            """
+            # fmt: on
+        ).label("feature")
+        self.builders: Dict[ItemsStatement, Callable[[Any], Any]] = {
+            ItemsStatement.GEOJSON: self._geojson_page,
+            ItemsStatement.HTML: self._html_page,
+            ItemsStatement.FLATGEOBUF: self._flatgeobuf_page,
+        }
+        self.templates: Dict[Tuple[ItemsStatement, bool], StatementTemplate] = {
+            (kind, after_cursor): StatementTemplate(
+                builder(self.id_set(None, after_cursor))
+            )
+            for kind, builder in self.builders.items()
+            for after_cursor in [False, True]
+        }
+        self.count_template = StatementTemplate(self.count(None))
+
+    def items(
+        self,
+        kind: ItemsStatement,
+        filters: Optional[Any] = None,
+        after_cursor: bool = False,
+        **values: Any,
+    ) -> Any:
+        if filters is None:
+            return self.templates[(kind, after_cursor)].bind(**values)
+        else:
+            return self.builders[kind](self.id_set(filters, after_cursor)).params(
+                **values
+            )
+
+    def total_count(self, filters: Optional[Any] = None) -> Any:
+        if filters is None:
+            return self.count_template.bind()
+        else:
+            return self.count(filters)
+
+    def id_set(self, filters: Optional[Any], after_cursor: bool) -> Any:
+        id_set = (
+            sa.select([self.id_field.label("id")])
+            .select_from(self.layer.model)
+            .order_by(self.id_field)
+            .limit(sa.bindparam("limit", type_=sa.Integer))
+        )
+        if filters is not None:
+            id_set = id_set.where(filters)
+        if after_cursor:
+            # keyset pagination seeks past the last ID of the previous page,
+            # so the cost of a page does not depend on its depth
+            id_set = id_set.where(self.id_field > self._cursor_parameter())
+        else:
+            id_set = id_set.offset(sa.bindparam("offset", type_=sa.Integer))
+        return id_set.alias("id_set")
+
+    def count(self, filters: Optional[Any]) -> Any:
+        count = sa.select([sa.func.count()]).select_from(self.layer.model)
+        return count.where(filters) if filters is not None else count
+
+    def cursor_value(self, cursor: str) -> Any:
+        # an unparseable cursor binds NULL, which no ID follows, rather than failing
+        # the database's cast
+        id_type = python_type(self.id_field)
+        try:
+            if id_type in [int, float]:
+                return id_type(cursor)
+            for native_type, parse in NATIVE_CURSOR_PARSERS.items():
+                if isinstance(self.id_field.type, native_type):
+                    return str(parse(cursor))
+            return cursor
+        except ValueError:
+            return None
+
+    def _cursor_parameter(self) -> Any:
+        if python_type(self.id_field) in [int, float, str]:
+            return sa.bindparam("cursor", type_=self.id_field.type)
+        else:
+            # ordering comparisons must use the native type to agree with ORDER BY
+            return sa.cast(sa.bindparam("cursor", type_=sa.String), self.id_field.type)
+
+    def _geojson_page(self, id_set: Any) -> Any:
+        return (
+            sa.select([self.geojson_feature, id_set.c["id"]])
+            .select_from(
+                self.source.join(
+                    id_set,
+                    self.source.c[self.layer.unique_field_name] == id_set.c["id"],
+                )
+            )
+            .order_by(id_set.c["id"])
+        )
+
+    def _html_page(self, id_set: Any) -> Any:
+        return (
+            sa.select(
+                [
+                    col
+                    for col in self.layer.model.c
+                    if col.name != self.layer.geometry_field_name
+                ]
+            )
+            .select_from(self.layer.model.join(id_set, self.id_field == id_set.c["id"]))
+            .order_by(id_set.c["id"])
+        )
+
+    def _flatgeobuf_page(self, id_set: Any) -> Any:
+        # the CTE evaluates the ID query once for both the page and the probe
+        ids = sa.select([id_set.c["id"]]).cte("ids")
+        page_limit = sa.bindparam("page_limit", type_=sa.Integer)
+        page = (
+            sa.select(
+                [
+                    column
+                    if column.name != self.layer.geometry_field_name
+                    else output_geometry_column(column, self.layer, self.crs)
+                    for column in self.layer.model.c
+                ]
+            )
+            .select_from(self.layer.model.join(ids, self.id_field == ids.c["id"]))
+            .order_by(ids.c["id"])
+            .limit(page_limit)
+            .alias("page")
+        )
+        more_available = (
+            sa.select([sa.func.count()]).select_from(ids).as_scalar() > page_limit
+        )
+        return sa.select(
+            [
+                sa.func.ST_AsFlatGeobuf(
+                    sa.literal_column("page"),
+                    # the spatial index is only built when the page holds every
+                    # requested item, not for the first page of a larger collection
+                    sa.and_(
+                        sa.bindparam("spatial_index", type_=sa.Boolean),
+                        sa.not_(more_available),
+                    ),
+                    self.layer.geometry_field_name,
+                ).label("fgb"),
+                sa.func.max(page.c[self.layer.unique_field_name]).label("last_id"),
+                more_available.label("more_available"),
+            ]
+        ).select_from(page)
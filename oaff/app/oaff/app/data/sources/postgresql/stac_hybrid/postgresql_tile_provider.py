@@ -0,0 +1,73 @@
+from typing import Any, Final, Tuple
+
+import geoalchemy2 as ga
+import sqlalchemy as sa
+from databases.core import Database
+
+from oaff.app.data.retrieval.tile_provider import TileProvider
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_layer import PostgresqlLayer
+
+
+class PostgresqlTileProvider(TileProvider):
+
+    EXTENT: Final = 4096
+    BUFFER: Final = 64
+    WEB_MERCATOR_SRID: Final = 3857
+
+    def __init__(
+        self,
+        db: Database,
+        layer: PostgresqlLayer,
+        filters: Any,
+    ):
+        self.db = db
+        self.layer = layer
+        self.filters = filters
+
+    async def as_mvt(self, bounds: Tuple[float, float, float, float]) -> bytes:
+        geometry = self.layer.model.c[self.layer.geometry_field_name]
+        if isinstance(geometry.type, ga.Geography):
+            geometry = sa.cast(geometry, ga.Geometry(srid=self.layer.geometry_srid))
+        # detail finer than one tile grid cell cannot be encoded, so simplify to that
+        # resolution before clipping and quantization
+        tolerance = (bounds[2] - bounds[0]) / self.EXTENT
+        features = (
+            sa.select(
+                [
+                    sa.func.ST_AsMVTGeom(
+                        sa.func.ST_Simplify(
+                            sa.func.ST_Transform(geometry, self.WEB_MERCATOR_SRID),
+                            tolerance,
+                            True,
+                        ),
+                        sa.func.ST_MakeEnvelope(*bounds, self.WEB_MERCATOR_SRID),
+                        self.EXTENT,
+                        self.BUFFER,
+                        True,
+                    ).label(self.layer.geometry_field_name)
+                ]
+                + [
+                    column
+                    for column in self.layer.model.c
+                    if column.name != self.layer.geometry_field_name
+                ]
+            )
+            .select_from(self.layer.model)
+            .where(self.filters)
+            .alias("features")
+        )
+        tile = await self.db.fetch_val(
+            sa.select(
+                [
+                    sa.func.ST_AsMVT(
+                        sa.literal_column("features"),
+                        self.layer.id,
+                        self.EXTENT,
+                        self.layer.geometry_field_name,
+                    )
+                ]
+            ).select_from(features)
+            # geometries clipped away entirely are not encoded
+            .where(features.c[self.layer.geometry_field_name].isnot(None))
+        )
+        return bytes(tile) if tile is not None else b""
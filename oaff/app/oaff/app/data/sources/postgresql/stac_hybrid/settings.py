@@ -1,10 +1,14 @@
 import os
+from logging import getLogger
 from typing import Final, Set
 
 from sqlalchemy import MetaData
 
 from oaff.app.data.sources.postgresql.settings import ENV_VAR_PREFIX, name_to_suffix
+from oaff.app.data.sources.postgresql.stac_hybrid.count_mode import CountMode
+from oaff.app.data.sources.postgresql.stac_hybrid.extent_mode import ExtentMode
 
+LOGGER: Final = getLogger(__file__)
 OAFF_SCHEMA_NAME: Final = "oaff"
 OAFF_METADATA: Final = MetaData(schema=OAFF_SCHEMA_NAME)
 
@@ -36,3 +40,31 @@ def whitelist(name: str) -> Set[str]:
         ).split(",")
         if len(entry) > 0
     }
+
+
+def count_mode(name: str) -> CountMode:
+    value = os.environ.get(
+        f"{ENV_VAR_PREFIX}POSTGRESQL_COUNT_MODE{name_to_suffix(name)}",
+        CountMode.EXACT.value,
+    )
+    try:
+        return CountMode(value.lower())
+    except ValueError:
+        LOGGER.warning(
+            f"count mode {value} invalid for {name}, " f"using {CountMode.EXACT.value}"
+        )
+        return CountMode.EXACT
+
+
+def extent_mode(name: str) -> ExtentMode:
+    value = os.environ.get(
+        f"{ENV_VAR_PREFIX}POSTGRESQL_EXTENT_MODE{name_to_suffix(name)}",
+        ExtentMode.EXACT.value,
+    )
+    try:
+        return ExtentMode(value.lower())
+    except ValueError:
+        LOGGER.warning(
+            f"extent mode {value} invalid for {name}, using {ExtentMode.EXACT.value}"
+        )
+        return ExtentMode.EXACT
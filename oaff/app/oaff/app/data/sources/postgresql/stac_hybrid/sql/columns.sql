@@ -0,0 +1,22 @@
+/*
+  This query returns the columns of the named tables in the form SQLAlchemy's PostgreSQL
+  reflection reads them, so that models are built for served tables alone.
+*/
+   SELECT QUOTE_IDENT(n.nspname) || '.' || QUOTE_IDENT(c.relname) qualified_table_name
+        , a.attname column_name
+        , pg_catalog.format_type(a.atttypid, a.atttypmod) format_type
+        , a.attnotnull not_null
+        , COALESCE(a.attnum = ANY(pk.conkey), FALSE) primary_key
+     FROM pg_catalog.pg_attribute a
+     JOIN pg_catalog.pg_class c ON a.attrelid = c.oid
+     JOIN pg_catalog.pg_namespace n ON c.relnamespace = n.oid
+LEFT JOIN pg_catalog.pg_constraint pk ON pk.conrelid = c.oid AND pk.contype = 'p'
+    WHERE c.oid IN (
+            SELECT TO_REGCLASS(qualified_table_name)
+              FROM UNNEST(CAST(:qualified_table_names AS TEXT[])) qualified_table_name
+          )
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+ ORDER BY c.oid
+        , a.attnum
+;
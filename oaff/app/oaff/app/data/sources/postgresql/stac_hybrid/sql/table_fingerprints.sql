@@ -0,0 +1,49 @@
+/*
+  This query summarises, per table, the catalog definition that layer discovery depends on
+  and, separately, the row modification counts that its extents depend on. Definitions
+  only change with DDL or table rewrites, while modification counts change with any write.
+*/
+   SELECT QUOTE_IDENT(n.nspname) || '.' || QUOTE_IDENT(c.relname) qualified_table_name
+        , MD5(
+            CONCAT_WS(
+              ':'
+            , c.oid
+            , c.relfilenode
+            , c.relnatts
+            , (
+                SELECT STRING_AGG(
+                         CONCAT_WS(
+                           ':', a.attnum, a.attname
+                         , pg_catalog.format_type(a.atttypid, a.atttypmod), a.attnotnull
+                         )
+                       , ',' ORDER BY a.attnum
+                       )
+                  FROM pg_catalog.pg_attribute a
+                 WHERE a.attrelid = c.oid
+                   AND a.attnum > 0
+                   AND NOT a.attisdropped
+              )
+            , (
+                SELECT STRING_AGG(pk.conkey::text, ',')
+                  FROM pg_catalog.pg_constraint pk
+                 WHERE pk.conrelid = c.oid
+                   AND pk.contype = 'p'
+              )
+            , (
+                SELECT STRING_AGG(
+                         pg_catalog.pg_get_indexdef(i.indexrelid), ','
+                         ORDER BY i.indexrelid
+                       )
+                  FROM pg_catalog.pg_index i
+                 WHERE i.indrelid = c.oid
+              )
+            )
+          ) fingerprint
+        , CONCAT_WS(':', s.n_tup_ins, s.n_tup_upd, s.n_tup_del) modifications
+     FROM pg_catalog.pg_class c
+     JOIN pg_catalog.pg_namespace n ON c.relnamespace = n.oid
+LEFT JOIN pg_catalog.pg_stat_user_tables s ON s.relid = c.oid
+    WHERE c.relkind IN ('r', 'p')
+      AND n.nspname NOT IN ('pg_catalog', 'information_schema', 'oaff')
+      AND n.nspname NOT LIKE 'pg_toast%'
+;
@@ -0,0 +1,21 @@
+/*
+  This query returns the enums ('e') and domains ('d') that columns may be declared with,
+  in the form SQLAlchemy's PostgreSQL reflection reads them.
+*/
+  SELECT t.typtype kind
+       , t.typname "name"
+       , n.nspname "schema"
+       , pg_catalog.pg_type_is_visible(t.oid) visible
+       , ARRAY(
+           SELECT e.enumlabel
+             FROM pg_catalog.pg_enum e
+            WHERE e.enumtypid = t.oid
+         ORDER BY e.enumsortorder
+         ) labels
+       , pg_catalog.format_type(t.typbasetype, t.typtypmod) attype
+       , NOT t.typnotnull nullable
+       , t.typdefault "default"
+    FROM pg_catalog.pg_type t
+    JOIN pg_catalog.pg_namespace n ON t.typnamespace = n.oid
+   WHERE t.typtype IN ('e', 'd')
+;
@@ -0,0 +1,44 @@
+from typing import Any, Dict, Final
+
+from sqlalchemy.dialects.postgresql import pypostgresql
+from sqlalchemy.sql.compiler import Compiled
+from sqlalchemy.sql.expression import ClauseElement
+
+# paramstyle must match the dialect databases compiles statements with
+DIALECT: Final = pypostgresql.dialect(paramstyle="pyformat")
+
+
+class StatementTemplate:
+    """
+    A statement compiled once and bound with new values for each execution.
+    databases compiles every statement it executes, templates instead present their
+    existing compilation through the same interface. Because the SQL text of a
+    template never changes asyncpg also reuses its server-side prepared statement.
+    """
+
+    def __init__(self, statement: ClauseElement):
+        self.compiled = statement.compile(dialect=DIALECT)
+
+    def bind(self, **values: Any) -> "BoundStatement":
+        return BoundStatement(self.compiled, values)
+
+
+class BoundStatement:
+    def __init__(self, compiled: Compiled, values: Dict[str, Any]):
+        self._compiled = compiled
+        self.params = compiled.construct_params(values)
+
+    def compile(self, *args, **kwargs) -> "BoundStatement":
+        return self
+
+    @property
+    def string(self) -> str:
+        return self._compiled.string
+
+    @property
+    def _bind_processors(self) -> Dict[str, Any]:
+        return self._compiled._bind_processors
+
+    @property
+    def _result_columns(self) -> Any:
+        return self._compiled._result_columns
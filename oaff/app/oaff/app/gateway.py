@@ -1,32 +1,210 @@
-from typing import Dict, Type
+from http import HTTPStatus
+from time import monotonic
+from typing import Any, Dict, Final, Hashable, Optional, Tuple, Type
 
-from oaff.app.configuration.data import cleanup as cleanup_config, discover
+from oaff.app import settings
+from oaff.app.cache.lru_cache import LruCache
+from oaff.app.configuration.data import (
+    cleanup as cleanup_config,
+    discover,
+    get_data_source,
+    get_data_sources,
+    get_layer,
+)
 from oaff.app.configuration.frontend_configuration import FrontendConfiguration
 from oaff.app.configuration.frontend_interface import set_frontend_configuration
+from oaff.app.configuration.page_cache import invalidate_pages
+from oaff.app.data.sources.common.data_source import DataSource
+from oaff.app.data.sources.common.layer import Layer
 from oaff.app.request_handlers.collection import Collection as CollectionRequestHandler
 from oaff.app.request_handlers.collection_items import (
     CollectionsItems as CollectionsItemsRequestHandler,
 )
+from oaff.app.request_handlers.collection_tile import (
+    CollectionTile as CollectionTileRequestHandler,
+)
 from oaff.app.request_handlers.collections_list import CollectionsListRequestHandler
 from oaff.app.request_handlers.common.request_handler import RequestHandler
 from oaff.app.request_handlers.conformance import ConformanceRequestHandler
 from oaff.app.request_handlers.feature import Feature as FeatureRequestHandler
 from oaff.app.request_handlers.landing_page import LandingPageRequestHandler
 from oaff.app.requests.common.request_type import RequestType
+from oaff.app.responses.data_response import DataResponse
+from oaff.app.responses.error_response import ErrorResponse
 from oaff.app.responses.response import Response
+from oaff.app.responses.response_type import ResponseType
+from oaff.app.util import etag_matches, strong_etag
 
 handlers: Dict[str, RequestHandler] = {
     LandingPageRequestHandler.type_name(): LandingPageRequestHandler(),
     CollectionsListRequestHandler.type_name(): CollectionsListRequestHandler(),
     CollectionRequestHandler.type_name(): CollectionRequestHandler(),
     CollectionsItemsRequestHandler.type_name(): CollectionsItemsRequestHandler(),
+    CollectionTileRequestHandler.type_name(): CollectionTileRequestHandler(),
     FeatureRequestHandler.type_name(): FeatureRequestHandler(),
     ConformanceRequestHandler.type_name(): ConformanceRequestHandler(),
 }
+# metadata responses depend only on configured layers, and are cleared on discovery
+_metadata_responses: Final = LruCache(settings.METADATA_CACHE_SIZE())
+# data versions by layer ID, held with their expiry time so that unconditional
+# requests do not each read table statistics. Like metadata they scale with layers
+_data_versions: Final = LruCache(settings.METADATA_CACHE_SIZE())
 
 
 async def handle(request: Type[RequestType]) -> Response:
-    return await handlers[request.__class__.__name__].handle(request)
+    if not request.format.supports(request.type):
+        return ErrorResponse(
+            status_code=HTTPStatus.NOT_ACCEPTABLE,
+            detail=f"Format {request.format.name} is not available for this resource",
+        )
+    if request.type == ResponseType.METADATA:
+        response = await _get_metadata_response(request)
+    else:
+        response = await _get_data_response(request)
+    return _not_modified_or(response, request)
+
+
+async def _get_metadata_response(request: Type[RequestType]) -> Response:
+    key = _metadata_response_key(request)
+    response = _metadata_responses.get(key)
+    if response is None:
+        generation = _metadata_responses.generation
+        response = await handlers[request.__class__.__name__].handle(request)
+        if isinstance(response, DataResponse) and response.status_code == HTTPStatus.OK:
+            response.additional_headers = {
+                **response.additional_headers,
+                "ETag": strong_etag(response.encoded_response),
+            }
+            # a response that was generated while layers were rediscovered is stale
+            if _metadata_responses.generation == generation:
+                _metadata_responses.put(key, response)
+    return response
+
+
+def _metadata_response_key(request: Type[RequestType]) -> Tuple[Hashable, ...]:
+    # response links are derived from the request URL, which includes the root
+    return (
+        request.__class__.__name__,
+        getattr(request, "collection_id", None),
+        request.format.name,
+        request.locale.value,
+        request.url,
+    )
+
+
+async def _get_data_response(request: Type[RequestType]) -> Response:
+    layer = get_layer(getattr(request, "collection_id", ""))
+    if layer is not None and not layer.supports_format(request.format.name):
+        return ErrorResponse(
+            status_code=HTTPStatus.NOT_ACCEPTABLE,
+            detail=f"Format {request.format.name} is not available for this collection",
+        )
+    data_source = get_data_source(layer.data_source_id) if layer is not None else None
+    limiter = data_source.request_limiter if data_source is not None else None
+    connections = (
+        data_source.get_request_connections(request) if limiter is not None else 0
+    )
+    if limiter is not None and not await limiter.acquire(connections):
+        return ErrorResponse(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail=f"Too many concurrent requests for {request.collection_id}",
+        )
+    try:
+        response = await _get_versioned_data_response(request, layer, data_source)
+    except BaseException:
+        if limiter is not None:
+            limiter.release(connections)
+        raise
+    if limiter is not None:
+        if isinstance(response, DataResponse) and hasattr(
+            response.encoded_response, "__anext__"
+        ):
+            response.encoded_response = limiter.release_after(
+                response.encoded_response, connections
+            )
+        else:
+            limiter.release(connections)
+    return response
+
+
+async def _get_versioned_data_response(
+    request: Type[RequestType],
+    layer: Optional[Layer],
+    data_source: Optional[DataSource],
+) -> Response:
+    etag = (
+        await _get_data_etag(
+            request, layer, data_source, current=request.if_none_match is not None
+        )
+        if layer is not None
+        else None
+    )
+    if etag is not None and etag_matches(request.if_none_match, etag):
+        # the client's copy is current, so the data is not retrieved at all
+        return _not_modified(request, etag)
+    response = await handlers[request.__class__.__name__].handle(request)
+    if (
+        etag is not None
+        and isinstance(response, DataResponse)
+        and response.status_code == HTTPStatus.OK
+    ):
+        response.additional_headers = {**response.additional_headers, "ETag": etag}
+    return response
+
+
+async def _get_data_etag(
+    request: Type[RequestType], layer: Layer, data_source: DataSource, current: bool
+) -> Optional[str]:
+    version = await _get_data_version(layer, data_source, current)
+    if version is None:
+        return None
+    # weak because responses differing only in generation time are equivalent
+    return "W/" + strong_etag(
+        "\n".join(
+            [
+                version,
+                request.format.name,
+                request.json(exclude={"format", "if_none_match"}),
+                layer.json(include=set(Layer.__fields__)),
+            ]
+        )
+    )
+
+
+async def _get_data_version(
+    layer: Layer, data_source: DataSource, current: bool
+) -> Optional[str]:
+    # conditional requests always read the current version. Others may be given an
+    # ETag up to APP_DATA_VERSION_TTL seconds old, which only costs a later full
+    # response as the version is read before the data
+    cached = _data_versions.get(layer.id)
+    if not current and cached is not None and cached[0] > monotonic():
+        return cached[1]
+    generation = _data_versions.generation
+    version = await data_source.get_data_version(layer)
+    if _data_versions.generation == generation:
+        _data_versions.put(layer.id, (monotonic() + settings.DATA_VERSION_TTL(), version))
+    return version
+
+
+def _not_modified_or(response: Response, request: Type[RequestType]) -> Response:
+    if (
+        isinstance(response, DataResponse)
+        and "ETag" in response.additional_headers
+        and etag_matches(request.if_none_match, response.additional_headers["ETag"])
+    ):
+        return _not_modified(request, response.additional_headers["ETag"])
+    else:
+        return response
+
+
+def _not_modified(request: Type[RequestType], etag: str) -> DataResponse:
+    return DataResponse(
+        status_code=HTTPStatus.NOT_MODIFIED,
+        mime_type=request.format[request.type],
+        encoded_response=b"",
+        additional_headers={"ETag": etag},
+    )
 
 
 async def configure(frontend_configuration: FrontendConfiguration) -> None:
@@ -34,5 +212,17 @@ async def configure(frontend_configuration: FrontendConfiguration) -> None:
     await discover()
 
 
+async def invalidate_collection(collection_id: str) -> None:
+    CollectionTileRequestHandler.invalidate(collection_id)
+    _data_versions.discard(lambda key: key == collection_id)
+    await invalidate_pages(collection_id)
+
+
+def get_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        data_source.id: data_source.get_metrics() for data_source in get_data_sources()
+    }
+
+
 async def cleanup() -> None:
     await cleanup_config()
@@ -4,7 +4,8 @@ from typing import Final, Type
 from oaff.app.configuration.data import get_layer
 from oaff.app.request_handlers.common.request_handler import RequestHandler
 from oaff.app.requests.collection import Collection as CollectionRequestType
-from oaff.app.responses.models.collection import CollectionHtml, CollectionJson
+from oaff.app.responses.collection_fragment import get_collection_fragment
+from oaff.app.responses.models.collection import CollectionHtml
 from oaff.app.responses.response import Response
 from oaff.app.responses.response_format import ResponseFormat
 
@@ -22,16 +23,14 @@ class Collection(RequestHandler):
             return self.collection_404(request.collection_id)
         format_links = self.get_links_for_self(request)
         if request.format == ResponseFormat.html:
-            collection = CollectionHtml.from_layer(layer, request)
+            collection = CollectionHtml.from_layer(layer, request.root)
             collection.format_links = format_links
             return self.object_to_html_response(
                 collection,
                 request,
             )
         elif request.format == ResponseFormat.json:
-            collection = CollectionJson.from_layer(layer, request)
-            collection.add_format_links(format_links)
-            return self.object_to_json_response(
-                collection,
+            return self.raw_to_response(
+                get_collection_fragment(layer).render(request.root, format_links),
                 request,
             )
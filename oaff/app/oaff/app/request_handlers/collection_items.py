@@ -12,16 +12,16 @@ from pygeofilter.ast import (
     TimeBefore,
     TimeEquals,
 )
-from pyproj import Transformer
 
 from oaff.app import settings
 from oaff.app.configuration.data import get_data_source, get_layer
 from oaff.app.configuration.frontend_interface import get_frontend_configuration
-from oaff.app.data.sources.common.data_source import DataSource
+from oaff.app.data.sources.common.crs import Crs
 from oaff.app.data.sources.common.layer import Layer
 from oaff.app.data.sources.common.temporal import TemporalInstant, TemporalRange
 from oaff.app.i18n.translations import gettext_for_locale
 from oaff.app.request_handlers.common.request_handler import RequestHandler
+from oaff.app.request_handlers.common.spatial_bounds import bounds_to_node
 from oaff.app.requests.collection_items import CollectionItems
 from oaff.app.responses.models.link import Link, PageLinkRel
 from oaff.app.responses.response import Response
@@ -37,38 +37,68 @@ class CollectionsItems(RequestHandler):
         layer = get_layer(request.collection_id)
         if layer is None:
             return self.collection_404(request.collection_id)
+        unsupported_crs = self._get_unsupported_crs(request, layer)
+        if unsupported_crs is not None:
+            return self.crs_400(unsupported_crs)
+        crs = self.get_crs(layer, request.crs)
         data_source = get_data_source(layer.data_source_id)
+        ast = self._collect_ast(
+            self._spatial_bounds_to_node(
+                request.spatial_bounds,
+                self.get_crs(layer, request.spatial_bounds_crs),
+            )
+            if request.spatial_bounds is not None
+            else None,
+            await self._datetime_to_node(
+                request.temporal_bounds,
+                layer,
+            )
+            if request.temporal_bounds is not None
+            else None,
+        )
         feature_set_provider = await data_source.get_feature_set_provider(
             layer,
             request.get_item_constraints(),
-            self._collect_ast(
-                await self._spatial_bounds_to_node(
-                    request.spatial_bounds,
-                    request.spatial_bounds_crs,
-                    data_source,
-                    layer,
-                )
-                if request.spatial_bounds is not None
-                else None,
-                await self._datetime_to_node(
-                    request.temporal_bounds,
-                    layer,
-                )
-                if request.temporal_bounds is not None
-                else None,
-            ),
+            ast,
+            crs,
         )
         if request.format == ResponseFormat.json:
-            return self.raw_to_response(
-                await feature_set_provider.as_geojson(
-                    self.get_links_for_self(request),
-                    self._get_page_link_retriever(request),
+            return self.with_content_crs(
+                self.raw_to_response(
+                    feature_set_provider.as_geojson(
+                        self.get_links_for_self(request, layer),
+                        self._get_page_link_retriever(request),
+                    ),
+                    request,
                 ),
-                request,
+                crs,
+            )
+        elif request.format == ResponseFormat.geojsonseq:
+            return self.with_content_crs(
+                self.raw_to_response(
+                    feature_set_provider.as_geojsonseq(),
+                    request,
+                ),
+                crs,
             )
+        elif request.format == ResponseFormat.flatgeobuf:
+            # the spatial index is only worth building when the response holds
+            # the whole unfiltered collection, which the statement confirms
+            response_data, page_links = await feature_set_provider.as_flatgeobuf(
+                self._get_page_link_retriever(request),
+                ast is None and request.offset == 0 and request.cursor is None,
+            )
+            response = self.raw_to_response(response_data, request)
+            if len(page_links) > 0:
+                response.additional_headers = {
+                    "Link": ", ".join(
+                        [link.as_header_value() for link in page_links.values()]
+                    )
+                }
+            return self.with_content_crs(response, crs)
         elif request.format == ResponseFormat.html:
             response_data = await feature_set_provider.as_html_compatible(
-                self.get_links_for_self(request),
+                self.get_links_for_self(request, layer),
                 self._get_page_link_retriever(request),
             )
             return self.object_to_response(
@@ -76,24 +106,40 @@ class CollectionsItems(RequestHandler):
                 request,
             )
 
+    def _get_unsupported_crs(
+        self, request: CollectionItems, layer: Layer
+    ) -> Optional[str]:
+        # filter expressions are not evaluated yet, but their CRS is still checked
+        for identifier in [request.crs, request.spatial_bounds_crs] + (
+            [request.filter_crs] if request.filter_crs is not None else []
+        ):
+            if self.get_crs(layer, identifier) is None:
+                return identifier
+        return None
+
     def _get_page_link_retriever(
         self, request: CollectionItems
-    ) -> Callable[[int, int], Dict[PageLinkRel, Link]]:
+    ) -> Callable[[bool, Any], Dict[PageLinkRel, Link]]:
 
         frontend_config = get_frontend_configuration()
+        keyset = request.cursor is not None or settings.KEYSET_PAGINATION()
 
-        def retriever(total_count: int, result_count: int) -> Dict[PageLinkRel, Link]:
+        def retriever(more_available: bool, last_id: Any) -> Dict[PageLinkRel, Link]:
             links = {}
-            if request.offset > 0:
+            # a cursor page cannot know where the previous page started
+            if request.offset > 0 and request.cursor is None:
                 links[PageLinkRel.PREV] = Link(
                     href=frontend_config.prev_page_link_generator(request.url),
                     rel=PageLinkRel.PREV.value,
                     type=request.format[request.type],
                     title=gettext_for_locale(request.locale)("Previous Page"),
                 )
-            if (total_count - result_count) > request.offset:
+            if more_available:
                 links[PageLinkRel.NEXT] = Link(
-                    href=frontend_config.next_page_link_generator(request.url),
+                    href=frontend_config.next_page_link_generator(
+                        request.url,
+                        str(last_id) if keyset and last_id is not None else None,
+                    ),
                     rel=PageLinkRel.NEXT.value,
                     type=request.format[request.type],
                     title=gettext_for_locale(request.locale)("Next Page"),
@@ -118,15 +164,13 @@ class CollectionsItems(RequestHandler):
             else:
                 return bbox
 
-    async def _spatial_bounds_to_node(
+    def _spatial_bounds_to_node(
         self,
         spatial_bounds: Union[
             Tuple[float, float, float, float],
             Tuple[float, float, float, float, float, float],
         ],
-        spatial_bounds_crs: str,
-        data_source: DataSource,
-        layer: Layer,
+        spatial_bounds_crs: Crs,
     ) -> BBox:
         # recommended usage for Union of types
         # https://github.com/python/mypy/issues/1178#issuecomment-176185607
@@ -136,22 +180,7 @@ class CollectionsItems(RequestHandler):
             a, b, _, c, d, _ = cast(
                 Tuple[float, float, float, float, float, float], spatial_bounds
             )
-        x_min, y_min, x_max, y_max = (a, b, c, d)
-        transformer = Transformer.from_crs(
-            "EPSG:4326",  # True until Features API spec part 2 is implemented
-            f"{layer.geometry_crs_auth_name}:{layer.geometry_crs_auth_code}",
-            always_xy=True,
-        )
-        ll = transformer.transform(x_min, y_min)
-        ur = transformer.transform(x_max, y_max)
-        return BBox(
-            lhs=Attribute(settings.SPATIAL_FILTER_GEOMETRY_FIELD_ALIAS),
-            minx=ll[0],
-            miny=ll[1],
-            maxx=ur[0],
-            maxy=ur[1],
-            crs=await data_source.get_crs_identifier(layer),
-        )
+        return bounds_to_node((a, b, c, d), spatial_bounds_crs)
 
     async def _datetime_to_node(  # noqa: C901
         self,
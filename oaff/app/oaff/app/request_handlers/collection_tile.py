@@ -0,0 +1,74 @@
+from logging import getLogger
+from time import monotonic
+from typing import Final, Tuple, Type
+
+from oaff.app import settings
+from oaff.app.cache.lru_cache import LruCache
+from oaff.app.configuration.data import get_data_source, get_layer
+from oaff.app.data.sources.common.crs import EPSG_URI_PREFIX, parse_crs
+from oaff.app.request_handlers.common.request_handler import RequestHandler
+from oaff.app.request_handlers.common.spatial_bounds import bounds_to_node
+from oaff.app.requests.collection_tile import CollectionTile as CollectionTileRequestType
+from oaff.app.responses.data_response import DataResponse
+from oaff.app.responses.response import Response
+
+LOGGER: Final = getLogger(__file__)
+MVT_MIME_TYPE: Final = "application/vnd.mapbox-vector-tile"
+WEB_MERCATOR_QUAD: Final = "WebMercatorQuad"
+WEB_MERCATOR_QUAD_CRS: Final = parse_crs(f"{EPSG_URI_PREFIX}3857")
+WEB_MERCATOR_QUAD_ORIGIN: Final = 20037508.3427892
+WEB_MERCATOR_QUAD_MAX_ZOOM: Final = 24
+
+
+class CollectionTile(RequestHandler):
+
+    # tiles are keyed by (layer ID, z, x, y) and held with their expiry time. They are
+    # dropped when layers are rediscovered or a collection is invalidated
+    _tile_cache: Final = LruCache(settings.TILE_CACHE_SIZE())
+
+    @classmethod
+    def type_name(cls) -> str:
+        return CollectionTileRequestType.__name__
+
+    async def handle(self, request: CollectionTileRequestType) -> Type[Response]:
+        if request.tile_matrix_set_id != WEB_MERCATOR_QUAD:
+            return self._get_404(
+                f"Tile matrix set {request.tile_matrix_set_id} not supported"
+            )
+        if not (
+            0 <= request.z <= WEB_MERCATOR_QUAD_MAX_ZOOM
+            and 0 <= request.x < 2**request.z
+            and 0 <= request.y < 2**request.z
+        ):
+            return self._get_404(f"Tile {request.z}/{request.x}/{request.y} not found")
+        layer = get_layer(request.collection_id)
+        if layer is None:
+            return self.collection_404(request.collection_id)
+        key = (layer.id, request.z, request.x, request.y)
+        cached = self._tile_cache.get(key)
+        if cached is not None and cached[0] > monotonic():
+            tile = cached[1]
+        else:
+            generation = self._tile_cache.generation
+            data_source = get_data_source(layer.data_source_id)
+            bounds = self._tile_bounds(request.z, request.x, request.y)
+            tile_provider = await data_source.get_tile_provider(
+                layer,
+                bounds_to_node(bounds, WEB_MERCATOR_QUAD_CRS),
+            )
+            tile = await tile_provider.as_mvt(bounds)
+            # a tile rendered while its layer was rediscovered or invalidated is stale
+            if self._tile_cache.generation == generation:
+                self._tile_cache.put(key, (monotonic() + settings.TILE_CACHE_TTL(), tile))
+        return DataResponse(mime_type=MVT_MIME_TYPE, encoded_response=tile)
+
+    @classmethod
+    def invalidate(cls, layer_id: str) -> None:
+        cls._tile_cache.discard(lambda key: key[0] == layer_id)
+
+    def _tile_bounds(self, z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+        # WebMercatorQuad tile rows count down from the top left corner
+        tile_size = 2 * WEB_MERCATOR_QUAD_ORIGIN / 2**z
+        x_min = -WEB_MERCATOR_QUAD_ORIGIN + x * tile_size
+        y_max = WEB_MERCATOR_QUAD_ORIGIN - y * tile_size
+        return (x_min, y_max - tile_size, x_min + tile_size, y_max)
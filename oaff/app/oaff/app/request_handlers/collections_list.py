@@ -4,8 +4,9 @@ from typing import Final, Type
 from oaff.app.configuration.data import get_layers
 from oaff.app.request_handlers.common.request_handler import RequestHandler
 from oaff.app.requests.collections_list import CollectionsList as CollectionsListRequest
-from oaff.app.responses.models.collection import CollectionHtml, CollectionJson
-from oaff.app.responses.models.collections import CollectionsHtml, CollectionsJson
+from oaff.app.responses.collection_fragment import render_collections
+from oaff.app.responses.models.collection import CollectionHtml
+from oaff.app.responses.models.collections import CollectionsHtml
 from oaff.app.responses.response import Response
 from oaff.app.responses.response_format import ResponseFormat
 
@@ -21,17 +22,15 @@ class CollectionsListRequestHandler(RequestHandler):
         format_links = self.get_links_for_self(request)
         if request.format == ResponseFormat.html:
             collections = [
-                CollectionHtml.from_layer(layer, request) for layer in get_layers()
+                CollectionHtml.from_layer(layer, request.root) for layer in get_layers()
             ]
             return self.object_to_html_response(
                 CollectionsHtml(collections=collections, format_links=format_links),
                 request,
             )
         elif request.format == ResponseFormat.json:
-            collections = [
-                CollectionJson.from_layer(layer, request) for layer in get_layers()
-            ]
-            return self.object_to_json_response(
-                CollectionsJson(collections=collections, links=format_links),
+            # collections are encoded once per discovery, leaving a concatenation
+            return self.raw_to_response(
+                render_collections(get_layers(), request.root, format_links),
                 request,
             )
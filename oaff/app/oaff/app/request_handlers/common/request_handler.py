@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from http import HTTPStatus
 from json import dumps
-from typing import Any, Final, List, Type
+from typing import Any, Final, List, Optional, Tuple, Type
 
 from oaff.app.configuration.frontend_interface import get_frontend_configuration
+from oaff.app.data.sources.common.crs import Crs, parse_crs
+from oaff.app.data.sources.common.layer import Layer
+from oaff.app.i18n.locales import Locales
 from oaff.app.i18n.translations import gettext_for_locale
 from oaff.app.requests.common.request_type import RequestType
 from oaff.app.responses.data_response import DataResponse
@@ -11,6 +15,7 @@ from oaff.app.responses.error_response import ErrorResponse
 from oaff.app.responses.models.link import Link, LinkRel
 from oaff.app.responses.response import Response
 from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.responses.response_type import ResponseType
 from oaff.app.responses.templates.templates import get_rendered_html
 
 
@@ -22,26 +27,30 @@ class RequestHandler(ABC):
     def get_links_for_self(
         self,
         request: Type[RequestType],
+        layer: Optional[Layer] = None,
     ) -> List[Link]:
+        # data links are only given for formats the layer can be encoded in
         url_modifier = get_frontend_configuration().endpoint_format_switcher
         return [
-            Link(
-                href=url_modifier(request.url, response_format),
-                rel=LinkRel.SELF
-                if request.format == response_format
-                else LinkRel.ALTERNATE,
-                type=response_format[request.type],
-                # variable substitution explained
-                # https://inventwithpython.com/blog/2014/12/20/translate-your-python-3-program-with-the-gettext-module/     # noqa: E501
-                title=gettext_for_locale(request.locale)("This document")
-                if request.format == response_format
-                else gettext_for_locale(request.locale)(
-                    "This document (%s)" % response_format[request.type]
-                ),
+            link.copy(update={"href": url_modifier(request.url, response_format)})
+            for response_format, link in _get_self_link_templates(
+                request.type, request.format.name, request.locale
             )
-            for response_format in ResponseFormat
+            if layer is None or layer.supports_format(response_format.name)
         ]
 
+    def get_crs(self, layer: Layer, identifier: Optional[str]) -> Optional[Crs]:
+        # returns None if the layer cannot be served in the requested CRS
+        crs = parse_crs(identifier)
+        return crs if crs is not None and crs.uri in layer.supported_crs else None
+
+    def with_content_crs(self, response: DataResponse, crs: Crs) -> DataResponse:
+        response.additional_headers = {
+            **response.additional_headers,
+            "Content-Crs": f"<{crs.uri}>",
+        }
+        return response
+
     def raw_to_response(
         self,
         response: Any,
@@ -94,5 +103,39 @@ class RequestHandler(ABC):
     def feature_404(self, collection_id: str, feature_id: str) -> ErrorResponse:
         return self._get_404(f"Feature {collection_id}/{feature_id} not found")
 
+    def crs_400(self, identifier: str) -> ErrorResponse:
+        return ErrorResponse(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"CRS {identifier} not supported",
+        )
+
     def _get_404(self, detail: str = "") -> ErrorResponse:
         return ErrorResponse(status_code=HTTPStatus.NOT_FOUND, detail=detail)
+
+
+@lru_cache(maxsize=None)
+def _get_self_link_templates(
+    type: ResponseType, format_name: str, locale: Locales
+) -> Tuple[Tuple[ResponseFormat, Link], ...]:
+    # links only vary by request type, format and locale apart from their href,
+    # so are validated and translated once
+    return tuple(
+        (
+            response_format,
+            Link(
+                href="",
+                rel=LinkRel.SELF
+                if format_name == response_format.name
+                else LinkRel.ALTERNATE,
+                type=response_format[type],
+                # variable substitution explained
+                # https://inventwithpython.com/blog/2014/12/20/translate-your-python-3-program-with-the-gettext-module/     # noqa: E501
+                title=gettext_for_locale(locale)("This document")
+                if format_name == response_format.name
+                else gettext_for_locale(locale)(
+                    "This document (%s)" % response_format[type]
+                ),
+            ),
+        )
+        for response_format in ResponseFormat.supporting(type)
+    )
@@ -0,0 +1,29 @@
+from typing import Tuple
+
+from pygeofilter.ast import Attribute, BBox
+
+from oaff.app import settings
+from oaff.app.data.sources.common.crs import Crs
+
+
+def bounds_to_node(
+    bounds: Tuple[float, float, float, float],
+    bounds_crs: Crs,
+) -> BBox:
+    """
+    Expresses a bounding box as a filter node against the layer's geometry.
+    The box keeps the CRS it was given in, identified by EPSG code, and is
+    transformed to the layer's CRS by the data source.
+    """
+    if bounds_crs.northing_first:
+        y_min, x_min, y_max, x_max = bounds
+    else:
+        x_min, y_min, x_max, y_max = bounds
+    return BBox(
+        lhs=Attribute(settings.SPATIAL_FILTER_GEOMETRY_FIELD_ALIAS),
+        minx=x_min,
+        miny=y_min,
+        maxx=x_max,
+        maxy=y_max,
+        crs=bounds_crs.srid,
+    )
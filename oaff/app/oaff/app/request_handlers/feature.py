@@ -1,15 +1,13 @@
 from logging import getLogger
 from typing import Final, Type
-from urllib.parse import quote
 
 from oaff.app.configuration.data import get_data_source, get_layer
-from oaff.app.configuration.frontend_interface import get_frontend_configuration
 from oaff.app.request_handlers.common.request_handler import RequestHandler
 from oaff.app.requests.feature import Feature as FeatureRequestType
-from oaff.app.responses.models.link import Link, LinkRel
+from oaff.app.responses.collection_fragment import get_collection_fragment
 from oaff.app.responses.response import Response
 from oaff.app.responses.response_format import ResponseFormat
-from oaff.app.responses.response_type import ResponseType
+from oaff.app.util import as_geojson_seq_record
 
 LOGGER: Final = getLogger(__file__)
 
@@ -23,36 +21,43 @@ class Feature(RequestHandler):
         layer = get_layer(request.collection_id)
         if layer is None:
             return self.feature_404(request.collection_id, request.feature_id)
+        crs = self.get_crs(layer, request.crs)
+        if crs is None:
+            return self.crs_400(request.crs)
         data_source = get_data_source(layer.data_source_id)
         feature_provider = await data_source.get_feature_provider(
             layer,
+            crs,
         )
-        format_links = self.get_links_for_self(request)
-        if request.format == ResponseFormat.json:
+        format_links = self.get_links_for_self(request, layer)
+        if request.format in [ResponseFormat.json, ResponseFormat.geojsonseq]:
             response = await feature_provider.as_geojson(
                 request.feature_id,
                 format_links
-                + [
-                    Link(
-                        href="".join(
-                            [
-                                request.root,
-                                f"{get_frontend_configuration().api_url_base}/",
-                                f"collections/{quote(request.collection_id)}",
-                                f"?format={format.name}",
-                            ]
-                        ),
-                        rel=LinkRel.COLLECTION,
-                        type=format[ResponseType.METADATA],
-                        title=layer.title,
-                    )
-                    for format in ResponseFormat
-                ],
+                + get_collection_fragment(layer).get_collection_links(request.root),
             )
+            if response is not None and request.format == ResponseFormat.geojsonseq:
+                response = as_geojson_seq_record(response)
             return (
-                self.raw_to_response(
-                    response,
-                    request,
+                self.with_content_crs(
+                    self.raw_to_response(
+                        response,
+                        request,
+                    ),
+                    crs,
+                )
+                if response is not None
+                else self.feature_404(request.collection_id, request.feature_id)
+            )
+        elif request.format == ResponseFormat.flatgeobuf:
+            response = await feature_provider.as_flatgeobuf(request.feature_id)
+            return (
+                self.with_content_crs(
+                    self.raw_to_response(
+                        response,
+                        request,
+                    ),
+                    crs,
                 )
                 if response is not None
                 else self.feature_404(request.collection_id, request.feature_id)
@@ -49,7 +49,7 @@ class LandingPageRequestHandler(RequestHandler):
                 type=format[ResponseType.METADATA],
                 title=gettext("Conformance (%s)" % format[ResponseType.METADATA]),
             )
-            for format in ResponseFormat
+            for format in ResponseFormat.supporting(ResponseType.METADATA)
         ]
         collection_links = [
             Link(
@@ -63,7 +63,7 @@ class LandingPageRequestHandler(RequestHandler):
                 type=format[ResponseType.METADATA],
                 title=gettext("Collections (%s)" % format[ResponseType.METADATA]),
             )
-            for format in ResponseFormat
+            for format in ResponseFormat.supporting(ResponseType.METADATA)
         ]
         if request.format == ResponseFormat.html:
             return self.object_to_html_response(
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from oaff.app.data.retrieval.filter_parameters import FilterParameters
 from oaff.app.data.retrieval.item_constraints import ItemConstraints
 from oaff.app.requests.common.request_type import RequestType
@@ -5,9 +7,11 @@ from oaff.app.requests.common.request_type import RequestType
 
 class CollectionItems(RequestType, ItemConstraints, FilterParameters):
     collection_id: str
+    crs: Optional[str] = None
 
     def get_item_constraints(self) -> ItemConstraints:
         return ItemConstraints(
             limit=self.limit,
             offset=self.offset,
+            cursor=self.cursor,
         )
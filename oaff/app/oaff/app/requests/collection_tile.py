@@ -0,0 +1,9 @@
+from oaff.app.requests.common.request_type import RequestType
+
+
+class CollectionTile(RequestType):
+    collection_id: str
+    tile_matrix_set_id: str
+    z: int
+    x: int
+    y: int
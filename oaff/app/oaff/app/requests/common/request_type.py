@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 from oaff.app.i18n.locales import Locales
@@ -11,3 +13,4 @@ class RequestType(BaseModel):
     format: ResponseFormat
     type: ResponseType
     locale: Locales
+    if_none_match: Optional[str] = None
@@ -1,6 +1,9 @@
+from typing import Optional
+
 from oaff.app.requests.common.request_type import RequestType
 
 
 class Feature(RequestType):
     collection_id: str
     feature_id: str
+    crs: Optional[str] = None
@@ -0,0 +1,104 @@
+from json import dumps
+from sys import maxsize
+from typing import Final, Iterable, List, Sequence, Tuple
+from urllib.parse import quote
+
+from oaff.app.cache.lru_cache import LruCache
+from oaff.app.configuration.frontend_interface import get_frontend_configuration
+from oaff.app.data.sources.common.layer import Layer
+from oaff.app.responses.models.collection import CollectionJson
+from oaff.app.responses.models.link import Link, LinkRel
+from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.responses.response_type import ResponseType
+
+# stand in for values only known when a request is served
+_ROOT: Final = "\x00root\x00"
+_LINKS: Final = "\x00links\x00"
+# holds one fragment per configured layer, and is cleared on discovery
+_fragments: Final = LruCache(maxsize)
+
+
+class CollectionFragment:
+    """
+    A collection's JSON encoding and links, rendered once for its layer.
+    The root URL, and the links that depend on the request URL, are inserted
+    when a request is served.
+    """
+
+    def __init__(self, layer: Layer):
+        self.layer = layer
+        jsonable = CollectionJson.from_layer(layer, _ROOT).jsonable()
+        jsonable["links"].append(_LINKS)
+        escaped_root = _escape(_ROOT)
+        self._parts: Tuple[List[str], ...] = tuple(
+            part.split(escaped_root)
+            for part in dumps(jsonable).split(f", {dumps(_LINKS)}")
+        )
+        self._collection_links: Tuple[Tuple[str, str], ...] = tuple(
+            (
+                "".join(
+                    [
+                        f"{get_frontend_configuration().api_url_base}/",
+                        f"collections/{quote(layer.id)}",
+                        f"?format={format.name}",
+                    ]
+                ),
+                format[ResponseType.METADATA],
+            )
+            for format in ResponseFormat.supporting(ResponseType.METADATA)
+        )
+
+    def render(self, root: str, links: Sequence[Link] = ()) -> str:
+        escaped_root = _escape(root)
+        head, tail = self._parts
+        return "".join(
+            [
+                escaped_root.join(head),
+                *[f", {dumps(link.jsonable())}" for link in links],
+                escaped_root.join(tail),
+            ]
+        )
+
+    def get_collection_links(self, root: str) -> List[Link]:
+        # links from the layer's features to the collection
+        return [
+            Link.construct(
+                href=f"{root}{path}",
+                rel=LinkRel.COLLECTION,
+                type=type,
+                title=self.layer.title,
+            )
+            for path, type in self._collection_links
+        ]
+
+
+def get_collection_fragment(layer: Layer) -> CollectionFragment:
+    fragment = _fragments.get(layer.id)
+    if fragment is None or fragment.layer is not layer:
+        fragment = CollectionFragment(layer)
+        _fragments.put(layer.id, fragment)
+    return fragment
+
+
+def prepare_collection_fragments(layers: Iterable[Layer]) -> None:
+    # fragments are rendered during discovery rather than on a layer's first request
+    if get_frontend_configuration() is None:
+        return
+    for layer in layers:
+        get_collection_fragment(layer)
+
+
+def render_collections(layers: Iterable[Layer], root: str, links: List[Link]) -> str:
+    return "".join(
+        [
+            '{"collections": [',
+            ", ".join(get_collection_fragment(layer).render(root) for layer in layers),
+            '], "links": ',
+            dumps([link.jsonable() for link in links]),
+            "}",
+        ]
+    )
+
+
+def _escape(value: str) -> str:
+    return dumps(value)[1:-1]
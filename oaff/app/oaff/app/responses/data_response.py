@@ -5,5 +5,5 @@ from oaff.app.responses.response import Response
 
 class DataResponse(Response):
     mime_type: str
-    encoded_response: Any  # could be HTML str, GPKG bytes etc
+    encoded_response: Any  # could be HTML str, GPKG bytes, async iterator of chunks etc
     additional_headers: Dict[str, str] = dict()
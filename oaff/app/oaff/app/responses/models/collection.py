@@ -1,11 +1,10 @@
-from typing import List, Optional, Type
+from typing import List, Optional
 
 from pydantic import BaseModel
 
 from oaff.app.configuration.frontend_interface import get_frontend_configuration
 from oaff.app.data.sources.common.layer import Layer
 from oaff.app.data.sources.common.provider import Provider
-from oaff.app.requests.common.request_type import RequestType
 from oaff.app.responses.models.extent import Extent
 from oaff.app.responses.models.item_type import ItemType
 from oaff.app.responses.models.link import Link, LinkRel
@@ -23,9 +22,11 @@ class Collection(BaseModel):
     license: Optional[str] = None
     keywords: Optional[List[str]] = None
     providers: Optional[List[Provider]] = None
+    crs: List[str] = []
+    storageCrs: Optional[str] = None
 
     @classmethod
-    def from_layer(cls, layer: Layer, request: Type[RequestType]):
+    def from_layer(cls, layer: Layer, root: str):
         return cls(
             id=layer.id,
             title=layer.title,
@@ -36,7 +37,7 @@ class Collection(BaseModel):
                 Link(
                     href="".join(
                         [
-                            request.root,
+                            root,
                             f"{get_frontend_configuration().get_items_path(layer.id)}",
                             f"?format={format.name}",
                         ]
@@ -45,11 +46,16 @@ class Collection(BaseModel):
                     type=format[ResponseType.DATA],
                     title=layer.title,
                 )
-                for format in ResponseFormat
+                for format in ResponseFormat.supporting(ResponseType.DATA)
+                if layer.supports_format(format.name)
             ],
             license=layer.license,
             keywords=layer.keywords,
             providers=layer.providers,
+            crs=list(layer.supported_crs),
+            storageCrs=layer.storage_crs
+            if layer.storage_crs in layer.supported_crs
+            else None,
         )
 
 
@@ -38,3 +38,7 @@ class Link(BaseModel):
 
     def jsonable(self):
         return dict(self)
+
+    def as_header_value(self) -> str:
+        # RFC 8288 web link, for formats that cannot carry links in the body
+        return f'<{self.href}>; rel="{self.rel.value}"; type="{self.type}"'
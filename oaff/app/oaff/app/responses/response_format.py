@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import List
 
 from oaff.app.responses.response_type import ResponseType
 
@@ -12,3 +13,17 @@ class ResponseFormat(dict, Enum):  # type: ignore[misc]
         ResponseType.DATA: "application/geo+json",
         ResponseType.METADATA: "application/json",
     }
+    # RFC 8142, data only as there is no sequence representation of metadata
+    geojsonseq = {
+        ResponseType.DATA: "application/geo+json-seq",
+    }
+    flatgeobuf = {
+        ResponseType.DATA: "application/flatgeobuf",
+    }
+
+    def supports(self, type: ResponseType) -> bool:
+        return type in self
+
+    @classmethod
+    def supporting(cls, type: ResponseType) -> List["ResponseFormat"]:
+        return [format for format in cls if format.supports(type)]
@@ -1,19 +1,37 @@
 from os import path
+from typing import Final
 
 from jinja2 import Environment, PackageLoader, select_autoescape
 
 from oaff.app.configuration.frontend_interface import get_frontend_configuration
 from oaff.app.i18n.locales import Locales
-from oaff.app.i18n.translations import get_translations_for_locale
+from oaff.app.i18n.translations import DEFAULT_LOCALE, get_translations_for_locale
 
 
-def get_rendered_html(template_name: str, data: object, locale: Locales) -> str:
+def _create_environment(locale: Locales) -> Environment:
     env = Environment(
         extensions=["jinja2.ext.i18n"],
         loader=PackageLoader("oaff.app", path.join("responses", "templates", "html")),
         autoescape=select_autoescape(["html"]),
+        # templates are packaged with the app and do not change while it runs
+        auto_reload=False,
     )
     env.install_gettext_translations(get_translations_for_locale(locale))  # type: ignore
+    # compile every template up front so no request pays for it
+    for template_name in env.list_templates(extensions=["jinja2"]):
+        env.get_template(template_name)
+    return env
+
+
+_ENVIRONMENTS: Final = {locale.value: _create_environment(locale) for locale in Locales}
+
+
+def get_rendered_html(template_name: str, data: object, locale: Locales) -> str:
+    env = (
+        _ENVIRONMENTS[locale.value]
+        if locale.value in _ENVIRONMENTS
+        else _ENVIRONMENTS[DEFAULT_LOCALE]
+    )
     frontend_config = get_frontend_configuration()
     return env.get_template(f"{template_name}.jinja2").render(
         response=data,
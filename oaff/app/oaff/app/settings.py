@@ -1,4 +1,5 @@
 import os
+from tempfile import gettempdir
 from typing import Final, List
 
 ENV_VAR_PREFIX: Final = os.environ.get("APP_ENV_VAR_PREFIX", "APP_")
@@ -11,3 +12,77 @@ def DATA_SOURCE_TYPES() -> List[str]:
         type.lower()
         for type in os.environ.get(f"{ENV_VAR_PREFIX}DATA_SOURCE_TYPES", "").split(",")
     ]
+
+
+def ADDITIONAL_CRS() -> List[str]:
+    # CRSs that every collection can be requested in, besides CRS84 and its own
+    return [
+        crs.strip()
+        for crs in os.environ.get(
+            f"{ENV_VAR_PREFIX}ADDITIONAL_CRS",
+            ",".join(
+                [
+                    "http://www.opengis.net/def/crs/EPSG/0/4326",
+                    "http://www.opengis.net/def/crs/EPSG/0/3857",
+                ]
+            ),
+        ).split(",")
+        if len(crs.strip()) > 0
+    ]
+
+
+def DATA_SOURCE_STARTUP_WAIT() -> float:
+    return float(os.environ.get(f"{ENV_VAR_PREFIX}DATA_SOURCE_STARTUP_WAIT", "10"))
+
+
+def DATA_SOURCE_DRAIN_TIMEOUT() -> float:
+    return float(os.environ.get(f"{ENV_VAR_PREFIX}DATA_SOURCE_DRAIN_TIMEOUT", "60"))
+
+
+def KEYSET_PAGINATION() -> bool:
+    return int(os.environ.get(f"{ENV_VAR_PREFIX}KEYSET_PAGINATION", "0")) == 1
+
+
+def TILE_CACHE_SIZE() -> int:
+    return int(os.environ.get(f"{ENV_VAR_PREFIX}TILE_CACHE_SIZE", "500"))
+
+
+def TILE_CACHE_TTL() -> int:
+    return int(os.environ.get(f"{ENV_VAR_PREFIX}TILE_CACHE_TTL", "60"))
+
+
+def DATA_VERSION_TTL() -> float:
+    return float(os.environ.get(f"{ENV_VAR_PREFIX}DATA_VERSION_TTL", "1"))
+
+
+def METADATA_CACHE_SIZE() -> int:
+    return int(os.environ.get(f"{ENV_VAR_PREFIX}METADATA_CACHE_SIZE", "1000"))
+
+
+def PAGE_CACHE() -> str:
+    return os.environ.get(f"{ENV_VAR_PREFIX}PAGE_CACHE", "none").lower()
+
+
+def PAGE_CACHE_TTL() -> int:
+    return int(os.environ.get(f"{ENV_VAR_PREFIX}PAGE_CACHE_TTL", "60"))
+
+
+def PAGE_CACHE_MAX_PAGE_SIZE() -> int:
+    return int(os.environ.get(f"{ENV_VAR_PREFIX}PAGE_CACHE_MAX_PAGE_SIZE", "1048576"))
+
+
+def PAGE_CACHE_SIZE() -> int:
+    return int(os.environ.get(f"{ENV_VAR_PREFIX}PAGE_CACHE_SIZE", "1000"))
+
+
+def PAGE_CACHE_DIRECTORY() -> str:
+    return os.environ.get(
+        f"{ENV_VAR_PREFIX}PAGE_CACHE_DIRECTORY",
+        os.path.join(gettempdir(), "oaff-page-cache"),
+    )
+
+
+def PAGE_CACHE_REDIS_URL() -> str:
+    return os.environ.get(
+        f"{ENV_VAR_PREFIX}PAGE_CACHE_REDIS_URL", "redis://localhost:6379/0"
+    )
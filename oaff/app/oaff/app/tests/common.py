@@ -0,0 +1,26 @@
+from asyncio import get_event_loop
+from typing import Any, Awaitable, List
+
+from oaff.app.responses.data_response import DataResponse
+
+
+def run_until_complete(aw: Awaitable[Any]) -> Any:
+    return get_event_loop().run_until_complete(aw)
+
+
+class CountingHandler:
+    """
+    Records the requests it handles, responding with the given response or else
+    one that numbers each call.
+    """
+
+    def __init__(self, response: Any = None):
+        self.calls: List[Any] = []
+        self.response = response
+
+    async def handle(self, request):
+        self.calls.append(request)
+        return self.response or DataResponse(
+            mime_type=request.format[request.type],
+            encoded_response=f"response {len(self.calls)}",
+        )
@@ -0,0 +1,114 @@
+from json import dumps
+from typing import Final
+
+from oaff.app.cache.lru_cache import clear_lru_caches
+from oaff.app.configuration.frontend_configuration import FrontendConfiguration
+from oaff.app.configuration.frontend_interface import (
+    get_frontend_configuration,
+    set_frontend_configuration,
+)
+from oaff.app.data.sources.common.layer import Layer
+from oaff.app.data.sources.common.provider import Provider
+from oaff.app.responses.collection_fragment import (
+    get_collection_fragment,
+    render_collections,
+)
+from oaff.app.responses.models.collection import CollectionJson
+from oaff.app.responses.models.collections import CollectionsJson
+from oaff.app.responses.models.link import Link, LinkRel
+from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.responses.response_type import ResponseType
+
+ROOT: Final = 'http://test/"päth"'
+layer: Final = Layer(
+    id="layer 1",
+    title='title "1" ✓',
+    description="description",
+    bboxes=[[-1, -1, 1, 1]],
+    intervals=[["2021-01-01T00:00:00Z", None]],
+    data_source_id="source",
+    geometry_crs_auth_name="EPSG",
+    geometry_crs_auth_code=4326,
+    temporal_attributes=[],
+    keywords=["keyword"],
+    providers=[Provider(url="http://provider", name="provider", roles=["host"])],
+)
+format_links: Final = [
+    Link(
+        href=f"{ROOT}/collections?format=json",
+        rel=LinkRel.SELF,
+        type="application/json",
+        title="This document",
+    )
+]
+_previous_configuration = None
+
+
+def setup_module():
+    global _previous_configuration
+    _previous_configuration = get_frontend_configuration()
+    set_frontend_configuration(
+        FrontendConfiguration(
+            asset_url_base="",
+            api_url_base="/api",
+            endpoint_format_switcher=lambda url, format, type: url,
+            next_page_link_generator=lambda url, cursor=None: url,
+            prev_page_link_generator=lambda url: url,
+            openapi_path_html="/html",
+            openapi_path_json="/json",
+        )
+    )
+
+
+def teardown_module():
+    set_frontend_configuration(_previous_configuration)
+
+
+def test_collection_matches_model():
+    collection = CollectionJson.from_layer(layer, ROOT)
+    assert get_collection_fragment(layer).render(ROOT) == dumps(collection.jsonable())
+    collection.add_format_links(format_links)
+    assert get_collection_fragment(layer).render(ROOT, format_links) == dumps(
+        collection.jsonable()
+    )
+
+
+def test_collections_match_model():
+    collections = CollectionsJson(
+        collections=[CollectionJson.from_layer(layer, ROOT)] * 2, links=format_links
+    )
+    assert render_collections([layer, layer], ROOT, format_links) == dumps(
+        collections.jsonable()
+    )
+    assert render_collections([], ROOT, []) == dumps(
+        CollectionsJson(collections=[], links=[]).jsonable()
+    )
+
+
+def test_collection_links():
+    assert get_collection_fragment(layer).get_collection_links(ROOT) == [
+        Link(
+            href=f"{ROOT}/api/collections/layer%201?format={format.name}",
+            rel=LinkRel.COLLECTION,
+            type=format[ResponseType.METADATA],
+            title=layer.title,
+        )
+        for format in ResponseFormat.supporting(ResponseType.METADATA)
+    ]
+
+
+def test_rendered_again_when_layer_changes():
+    fragment = get_collection_fragment(layer)
+    assert get_collection_fragment(layer) is fragment
+    changed = layer.copy(update={"title": "changed"})
+    assert '"title": "changed"' in get_collection_fragment(changed).render(ROOT)
+    clear_lru_caches()
+    assert get_collection_fragment(layer) is not fragment
+
+
+def test_links_only_to_supported_formats():
+    limited = layer.copy(update={"data_formats": [ResponseFormat.json.name]})
+    collection = CollectionJson.from_layer(limited, ROOT)
+    assert [link.type for link in collection.links] == [
+        ResponseFormat.json[ResponseType.DATA]
+    ]
@@ -0,0 +1,107 @@
+from typing import Final
+from unittest.mock import patch
+
+from oaff.app.cache.lru_cache import clear_lru_caches
+from oaff.app.data.sources.common.layer import Layer
+from oaff.app.i18n.locales import Locales
+from oaff.app.request_handlers.collection_tile import CollectionTile
+from oaff.app.requests.collection_tile import CollectionTile as CollectionTileRequestType
+from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.responses.response_type import ResponseType
+from oaff.app.tests.common import run_until_complete
+
+layer: Final = Layer(
+    id="layer",
+    title="title",
+    bboxes=[[-1, -1, 1, 1]],
+    intervals=[[None, None]],
+    data_source_id="source",
+    geometry_crs_auth_name="EPSG",
+    geometry_crs_auth_code=3857,
+    temporal_attributes=[],
+)
+
+
+class _TileProvider:
+    def __init__(self, data_source: "_DataSource"):
+        self.data_source = data_source
+
+    async def as_mvt(self, bounds):
+        self.data_source.rendered += 1
+        if self.data_source.during_render is not None:
+            self.data_source.during_render()
+        return f"tile {self.data_source.rendered}".encode("utf-8")
+
+
+class _DataSource:
+    def __init__(self):
+        self.rendered = 0
+        self.during_render = None
+
+    async def get_tile_provider(self, layer, ast):
+        return _TileProvider(self)
+
+
+def setup_function():
+    clear_lru_caches()
+
+
+def test_cached():
+    data_source = _DataSource()
+    assert _tile(data_source) == _tile(data_source) == b"tile 1"
+
+
+def test_expired():
+    data_source = _DataSource()
+    with patch.dict("os.environ", {"APP_TILE_CACHE_TTL": "0"}):
+        assert _tile(data_source) == b"tile 1"
+        assert _tile(data_source) == b"tile 2"
+
+
+def test_invalidated():
+    data_source = _DataSource()
+    _tile(data_source)
+    CollectionTile.invalidate(layer.id)
+    assert _tile(data_source) == b"tile 2"
+
+
+def test_not_cached_if_invalidated_while_rendering():
+    data_source = _DataSource()
+    data_source.during_render = clear_lru_caches
+    _tile(data_source)
+    data_source.during_render = None
+    assert _tile(data_source) == b"tile 2"
+
+
+def test_zoom_beyond_tile_matrix_set():
+    response = _handle(_DataSource(), z=1024)
+    assert response.status_code == 404
+
+
+def _tile(data_source: _DataSource) -> bytes:
+    return _handle(data_source).encoded_response
+
+
+def _handle(data_source: _DataSource, z: int = 0):
+    with patch(
+        "oaff.app.request_handlers.collection_tile.get_layer", return_value=layer
+    ), patch(
+        "oaff.app.request_handlers.collection_tile.get_data_source",
+        return_value=data_source,
+    ):
+        return run_until_complete(
+            CollectionTile().handle(
+                CollectionTileRequestType(
+                    url="http://test/collections/layer/tiles/WebMercatorQuad/0/0/0",
+                    root="http://test",
+                    format=ResponseFormat.json,
+                    type=ResponseType.DATA,
+                    locale=Locales.en_US,
+                    collection_id=layer.id,
+                    tile_matrix_set_id="WebMercatorQuad",
+                    z=z,
+                    x=0,
+                    y=0,
+                )
+            )
+        )
@@ -0,0 +1,22 @@
+from asyncio import sleep
+
+from oaff.app.data.sources.postgresql.concurrency import gather_on_separate_connections
+from oaff.app.tests.common import run_until_complete
+
+
+def test_limit():
+    active = 0
+    peak = 0
+
+    async def query(value: int) -> int:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await sleep(0.01)
+        active -= 1
+        return value
+
+    assert run_until_complete(
+        gather_on_separate_connections(*map(query, range(10)), limit=3)
+    ) == list(range(10))
+    assert peak == 3
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+from oaff.app.data.sources.common.crs import CRS84, EPSG_URI_PREFIX, crs_uri, parse_crs
+from oaff.app.data.sources.common.layer import Layer
+
+
+def test_parse_crs():
+    assert parse_crs(None) == (CRS84, 4326, False)
+    assert parse_crs(CRS84) == (CRS84, 4326, False)
+    assert parse_crs(f"{EPSG_URI_PREFIX}4326") == (
+        f"{EPSG_URI_PREFIX}4326",
+        4326,
+        True,
+    )
+    assert parse_crs("EPSG:3857") == (f"{EPSG_URI_PREFIX}3857", 3857, False)
+    assert parse_crs("EPSG:3857").code == "EPSG:3857"
+
+
+def test_parse_crs_unknown():
+    assert parse_crs("EPSG:999999") is None
+    assert parse_crs("http://www.opengis.net/def/crs/OGC/1.3/CRS83") is None
+    assert parse_crs("") is None
+
+
+def test_crs_uri():
+    assert crs_uri("EPSG", 4326) == CRS84
+    assert crs_uri("epsg", 27700) == f"{EPSG_URI_PREFIX}27700"
+
+
+def test_supported_crs():
+    with patch.dict(
+        "os.environ", {"APP_ADDITIONAL_CRS": f"EPSG:3857, {EPSG_URI_PREFIX}4326,bad"}
+    ):
+        layer = _layer(27700)
+        layer.prepare()
+    assert layer.storage_crs == f"{EPSG_URI_PREFIX}27700"
+    assert layer.supported_crs == (
+        CRS84,
+        f"{EPSG_URI_PREFIX}27700",
+        f"{EPSG_URI_PREFIX}3857",
+        f"{EPSG_URI_PREFIX}4326",
+    )
+
+
+def test_supported_crs_deduplicated():
+    with patch.dict("os.environ", {"APP_ADDITIONAL_CRS": CRS84}):
+        assert _layer(4326).supported_crs == (CRS84,)
+
+
+def _layer(auth_code: int) -> Layer:
+    return Layer(
+        id="layer",
+        title="layer",
+        bboxes=[[-1, -1, 1, 1]],
+        intervals=[[None, None]],
+        data_source_id="source",
+        geometry_crs_auth_name="EPSG",
+        geometry_crs_auth_code=auth_code,
+        temporal_attributes=[],
+    )
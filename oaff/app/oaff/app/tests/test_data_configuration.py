@@ -1,15 +1,17 @@
 import os
-from asyncio import get_event_loop
-from typing import Type
+from asyncio import create_task, get_event_loop, sleep
+from typing import Optional, Type
 from unittest.mock import patch
 from uuid import uuid4
 
-from oaff.app.configuration.data import get_layer, get_layers
+from oaff.app.configuration.data import discover, get_layer, get_layers, update_layers
 from oaff.app.configuration.frontend_configuration import FrontendConfiguration
 from oaff.app.data.retrieval.feature_provider import FeatureProvider
 from oaff.app.data.retrieval.feature_set_provider import FeatureSetProvider
+from oaff.app.data.retrieval.tile_provider import TileProvider
 from oaff.app.data.sources.common.data_source import DataSource
 from oaff.app.data.sources.common.layer import Layer
+from oaff.app.data.sources.common.request_limiter import RequestLimiter
 from oaff.app.gateway import cleanup, configure
 from oaff.app.responses.response_format import ResponseFormat
 from oaff.app.responses.response_type import ResponseType
@@ -67,7 +69,7 @@ def test_with_layers(PostgresqlManagerMock):
             )
         )
     )
-    assert len(get_layers()) == 3
+    assert [layer.id for layer in get_layers()] == ["layer1", "layer2", "layer3"]
     for lyrnum in [1, 2, 3]:
         assert get_layer(f"layer{lyrnum}").title == f"title{lyrnum}"
         assert get_layer(f"layer{lyrnum}").description == f"description{lyrnum}"
@@ -80,13 +82,157 @@ def test_with_layers(PostgresqlManagerMock):
         ]
 
 
+@patch("oaff.app.data.sources.postgresql.postgresql_manager.PostgresqlManager")
+def test_layers_listed_by_title(PostgresqlManagerMock):
+    data_source = _TestDataSource1(str(uuid4()))
+    PostgresqlManagerMock.return_value.get_data_sources.return_value = [data_source]
+    get_event_loop().run_until_complete(discover())
+    layer1, layer2 = get_layers()
+    update_layers(data_source, [layer1.copy(update={"title": "z"}), layer2])
+    assert [layer.id for layer in get_layers()] == ["layer2", "layer1"]
+
+
+@patch("oaff.app.data.sources.postgresql.postgresql_manager.PostgresqlManager")
+def test_slow_source_starts_in_background(PostgresqlManagerMock):
+    PostgresqlManagerMock.return_value.get_data_sources.return_value = [
+        _TestDataSource1(str(uuid4())),
+        _SlowTestDataSource(str(uuid4())),
+    ]
+    with patch.dict(os.environ, {f"{ENV_VAR_PREFIX}DATA_SOURCE_STARTUP_WAIT": "0.1"}):
+        get_event_loop().run_until_complete(
+            configure(
+                FrontendConfiguration(
+                    asset_url_base="",
+                    api_url_base="",
+                    endpoint_format_switcher=_endpoint_format_switcher,
+                    next_page_link_generator=_next_page_link_generator,
+                    prev_page_link_generator=_prev_page_link_generator,
+                    openapi_path_html="/html",
+                    openapi_path_json="/json",
+                )
+            )
+        )
+    assert sorted(layer.id for layer in get_layers()) == ["layer1", "layer2"]
+    get_event_loop().run_until_complete(sleep(0.5))
+    assert sorted(layer.id for layer in get_layers()) == [
+        "layer1",
+        "layer2",
+        "layer3",
+    ]
+
+
+@patch("oaff.app.data.sources.postgresql.postgresql_manager.PostgresqlManager")
+def test_incremental_keeps_data_sources(PostgresqlManagerMock):
+    data_source = _ChangingTestDataSource(str(uuid4()))
+    PostgresqlManagerMock.return_value.get_data_sources.return_value = [data_source]
+    get_event_loop().run_until_complete(
+        configure(
+            FrontendConfiguration(
+                asset_url_base="",
+                api_url_base="",
+                endpoint_format_switcher=_endpoint_format_switcher,
+                next_page_link_generator=_next_page_link_generator,
+                prev_page_link_generator=_prev_page_link_generator,
+                openapi_path_html="/html",
+                openapi_path_json="/json",
+            )
+        )
+    )
+    assert [layer.id for layer in get_layers()] == ["layer3"]
+    get_event_loop().run_until_complete(discover(incremental=True))
+    assert [layer.id for layer in get_layers()] == ["layer4"]
+    assert data_source.initializations == 1
+    assert data_source.disconnections == 0
+    get_event_loop().run_until_complete(discover())
+    assert data_source.disconnections == 1
+    assert PostgresqlManagerMock.return_value.get_data_sources.call_count == 2
+
+
+@patch("oaff.app.data.sources.postgresql.postgresql_manager.PostgresqlManager")
+def test_layers_served_during_discovery(PostgresqlManagerMock):
+    previous = _ChangingTestDataSource(str(uuid4()))
+    PostgresqlManagerMock.return_value.get_data_sources.return_value = [previous]
+    get_event_loop().run_until_complete(discover())
+    PostgresqlManagerMock.return_value.get_data_sources.return_value = [
+        _SlowTestDataSource(str(uuid4()))
+    ]
+
+    async def rediscover():
+        discovery = create_task(discover())
+        await sleep(0.1)
+        # the previous registry is served until the new one is published
+        assert [layer.id for layer in get_layers()] == ["layer3"]
+        assert previous.disconnections == 0
+        await discovery
+
+    get_event_loop().run_until_complete(rediscover())
+    assert [layer.id for layer in get_layers()] == ["layer3"]
+    assert previous.disconnections == 1
+
+
+@patch("oaff.app.data.sources.postgresql.postgresql_manager.PostgresqlManager")
+def test_pages_invalidated_for_changed_layers(PostgresqlManagerMock):
+    invalidated = []
+
+    async def invalidate_pages(layer_id=None):
+        invalidated.append(layer_id)
+
+    data_source = _ChangingTestDataSource(str(uuid4()))
+    PostgresqlManagerMock.return_value.get_data_sources.return_value = [data_source]
+    with patch("oaff.app.configuration.data.invalidate_pages", invalidate_pages):
+        # a starting worker has no previous layers, so pages are kept
+        get_event_loop().run_until_complete(discover())
+        assert invalidated == []
+        get_event_loop().run_until_complete(discover(incremental=True))
+        assert invalidated == ["layer3"]
+        # an unchanged layer keeps its pages
+        get_event_loop().run_until_complete(discover())
+        assert invalidated == ["layer3"]
+        data_source.description_suffix = " changed"
+        get_event_loop().run_until_complete(discover())
+        assert invalidated == ["layer3", "layer4"]
+
+
+@patch("oaff.app.data.sources.postgresql.postgresql_manager.PostgresqlManager")
+def test_published_layers_replaced_by_updates(PostgresqlManagerMock):
+    data_source = _RefreshingTestDataSource(str(uuid4()))
+    PostgresqlManagerMock.return_value.get_data_sources.return_value = [data_source]
+    get_event_loop().run_until_complete(discover())
+    assert get_layer("layer3").bboxes == [[0, 0, 1, 1]]
+    # the layer that was published first is left as it was
+    assert data_source.published_layers[0].bboxes == [[31, 32, 33, 34]]
+
+
+@patch("oaff.app.data.sources.postgresql.postgresql_manager.PostgresqlManager")
+def test_retired_data_source_disconnected_after_requests(PostgresqlManagerMock):
+    previous = _ChangingTestDataSource(str(uuid4()))
+    previous.request_limiter = RequestLimiter(1)
+    PostgresqlManagerMock.return_value.get_data_sources.return_value = [previous]
+    get_event_loop().run_until_complete(discover())
+    PostgresqlManagerMock.return_value.get_data_sources.return_value = [
+        _ChangingTestDataSource(str(uuid4()))
+    ]
+
+    async def rediscover():
+        # a request, such as a streamed response, still reads the previous source
+        assert await previous.request_limiter.acquire()
+        await discover()
+        assert previous.disconnections == 0
+        previous.request_limiter.release()
+        await sleep(0)
+        await sleep(0)
+        assert previous.disconnections == 1
+
+    get_event_loop().run_until_complete(rediscover())
+
+
 def _endpoint_format_switcher(
     url: str, format: ResponseFormat, type: ResponseType
 ) -> str:
     return url
 
 
-def _next_page_link_generator(url: str) -> str:
+def _next_page_link_generator(url: str, cursor: Optional[str] = None) -> str:
     return url
 
 
@@ -130,6 +276,9 @@ class _TestDataSource1(DataSource):
     async def get_feature_provider(self) -> Type[FeatureProvider]:
         pass
 
+    async def get_tile_provider(self) -> Type[TileProvider]:
+        pass
+
     async def initialize(self):
         pass
 
@@ -159,5 +308,52 @@ class _TestDataSource2(DataSource):
     async def get_feature_provider(self) -> Type[FeatureProvider]:
         pass
 
+    async def get_tile_provider(self) -> Type[TileProvider]:
+        pass
+
     async def initialize(self):
         pass
+
+
+class _SlowTestDataSource(_TestDataSource2):
+    async def initialize(self):
+        await sleep(0.3)
+
+
+class _ChangingTestDataSource(_TestDataSource2):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.initializations = 0
+        self.disconnections = 0
+        self.layers_requested = False
+        self.description_suffix = ""
+
+    async def initialize(self):
+        self.initializations += 1
+
+    async def get_layers(self):
+        layers = await super().get_layers()
+        if self.layers_requested:
+            layers[0].id = "layer4"
+        layers[0].description += self.description_suffix
+        self.layers_requested = True
+        return layers
+
+    async def disconnect(self):
+        self.disconnections += 1
+
+
+class _RefreshingTestDataSource(_TestDataSource2):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.published_layers = None
+
+    def layers_published(self):
+        self.published_layers = get_layers()
+        update_layers(
+            self,
+            [
+                layer.copy(update={"bboxes": [[0, 0, 1, 1]]})
+                for layer in self.published_layers
+            ],
+        )
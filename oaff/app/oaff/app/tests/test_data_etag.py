@@ -0,0 +1,145 @@
+from http import HTTPStatus
+from typing import Final, Optional
+from unittest.mock import patch
+
+from oaff.app import gateway
+from oaff.app.cache.lru_cache import clear_lru_caches
+from oaff.app.data.sources.common.layer import Layer
+from oaff.app.i18n.locales import Locales
+from oaff.app.requests.feature import Feature
+from oaff.app.responses.error_response import ErrorResponse
+from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.responses.response_type import ResponseType
+from oaff.app.tests.common import CountingHandler, run_until_complete
+
+layer: Final = Layer(
+    id="layer",
+    title="title",
+    bboxes=[[-1, -1, 1, 1]],
+    intervals=[[None, None]],
+    data_source_id="source",
+    geometry_crs_auth_name="EPSG",
+    geometry_crs_auth_code=4326,
+    temporal_attributes=[],
+)
+
+
+class _VersionedDataSource:
+    def __init__(self, version: Optional[str]):
+        self.version = version
+        self.request_limiter = None
+        self.version_reads = 0
+
+    async def get_data_version(self, layer: Layer) -> Optional[str]:
+        self.version_reads += 1
+        return self.version
+
+
+def setup_function():
+    clear_lru_caches()
+
+
+def test_etag():
+    handler = CountingHandler()
+    response = _handle(handler, _VersionedDataSource("1"), _feature())
+    assert response.additional_headers["ETag"].startswith('W/"')
+    assert len(handler.calls) == 1
+
+
+def test_not_modified_skips_handler():
+    handler = CountingHandler()
+    data_source = _VersionedDataSource("1")
+    etag = _handle(handler, data_source, _feature()).additional_headers["ETag"]
+    response = _handle(handler, data_source, _feature(if_none_match=etag))
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.additional_headers["ETag"] == etag
+    assert len(handler.calls) == 1
+
+
+def test_etag_changes_with_version():
+    handler = CountingHandler()
+    etag = _handle(handler, _VersionedDataSource("1"), _feature()).additional_headers[
+        "ETag"
+    ]
+    response = _handle(handler, _VersionedDataSource("2"), _feature(if_none_match=etag))
+    assert response.status_code == HTTPStatus.OK
+    assert response.additional_headers["ETag"] != etag
+
+
+def test_version_reused_for_unconditional_requests():
+    handler = CountingHandler()
+    data_source = _VersionedDataSource("1")
+    etag = _handle(handler, data_source, _feature()).additional_headers["ETag"]
+    data_source.version = "2"
+    assert _handle(handler, data_source, _feature()).additional_headers["ETag"] == etag
+    assert data_source.version_reads == 1
+    response = _handle(handler, data_source, _feature(if_none_match=etag))
+    assert response.status_code == HTTPStatus.OK
+    assert data_source.version_reads == 2
+
+
+def test_version_reread_after_invalidation():
+    handler = CountingHandler()
+    data_source = _VersionedDataSource("1")
+    _handle(handler, data_source, _feature())
+    run_until_complete(gateway.invalidate_collection(layer.id))
+    _handle(handler, data_source, _feature())
+    assert data_source.version_reads == 2
+
+
+def test_etag_changes_with_request():
+    handler = CountingHandler()
+    data_source = _VersionedDataSource("1")
+    assert (
+        _handle(handler, data_source, _feature()).additional_headers["ETag"]
+        != _handle(
+            handler, data_source, _feature(format=ResponseFormat.html)
+        ).additional_headers["ETag"]
+    )
+
+
+def test_no_version():
+    handler = CountingHandler()
+    response = _handle(handler, _VersionedDataSource(None), _feature())
+    assert "ETag" not in response.additional_headers
+
+
+def test_no_etag_on_error():
+    handler = CountingHandler(ErrorResponse(status_code=HTTPStatus.NOT_FOUND))
+    response = _handle(handler, _VersionedDataSource("1"), _feature())
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def _handle(handler, data_source, request):
+    with patch.dict(gateway.handlers, {Feature.__name__: handler}), patch(
+        "oaff.app.gateway.get_layer", return_value=layer
+    ), patch("oaff.app.gateway.get_data_source", return_value=data_source):
+        return run_until_complete(gateway.handle(request))
+
+
+def _feature(**kwargs) -> Feature:
+    return Feature(
+        **{
+            "url": "http://test/collections/layer/items/1",
+            "root": "http://test",
+            "format": ResponseFormat.json,
+            "type": ResponseType.DATA,
+            "locale": Locales.en_US,
+            "collection_id": "layer",
+            "feature_id": "1",
+            **kwargs,
+        }
+    )
+
+
+def test_unsupported_format():
+    handler = CountingHandler()
+    with patch.dict(gateway.handlers, {Feature.__name__: handler}), patch(
+        "oaff.app.gateway.get_layer",
+        return_value=layer.copy(update={"data_formats": [ResponseFormat.json.name]}),
+    ):
+        response = run_until_complete(
+            gateway.handle(_feature(format=ResponseFormat.flatgeobuf))
+        )
+    assert response.status_code == HTTPStatus.NOT_ACCEPTABLE
+    assert len(handler.calls) == 0
@@ -0,0 +1,176 @@
+from asyncio import gather, sleep
+from functools import partial
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest.mock import patch
+
+import sqlalchemy as sa
+
+from oaff.app.data.sources.postgresql.stac_hybrid.discovery_snapshot import (
+    DiscoverySnapshot,
+)
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_data_source import (
+    PostgresqlDataSource,
+)
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_layer import PostgresqlLayer
+from oaff.app.tests.common import run_until_complete
+
+
+def test_round_trip():
+    with TemporaryDirectory() as directory:
+        snapshot = DiscoverySnapshot(directory, "source")
+        assert run_until_complete(snapshot.load("fingerprint")) is None
+        run_until_complete(snapshot.save("fingerprint", {"public.table": _layer()}))
+        loaded = run_until_complete(
+            DiscoverySnapshot(directory, "source").load("fingerprint")
+        )
+        assert list(loaded.keys()) == ["public.table"]
+        assert loaded["public.table"].model.columns.keys() == ["id", "location"]
+
+
+def test_fingerprint_mismatch():
+    with TemporaryDirectory() as directory:
+        snapshot = DiscoverySnapshot(directory, "source")
+        run_until_complete(snapshot.save("fingerprint", {"public.table": _layer()}))
+        assert run_until_complete(snapshot.load("changed")) is None
+
+
+def test_keyed_by_source():
+    with TemporaryDirectory() as directory:
+        run_until_complete(
+            DiscoverySnapshot(directory, "source1").save(
+                "fingerprint", {"public.table": _layer()}
+            )
+        )
+        assert (
+            run_until_complete(
+                DiscoverySnapshot(directory, "source2").load("fingerprint")
+            )
+            is None
+        )
+
+
+def test_corrupt():
+    with TemporaryDirectory() as directory:
+        snapshot = DiscoverySnapshot(directory, "source")
+        with open(snapshot.path, "wb") as snapshot_file:
+            snapshot_file.write(b"not a snapshot")
+        assert run_until_complete(snapshot.load("fingerprint")) is None
+
+
+def test_lock_is_exclusive():
+    events: List[str] = list()
+
+    async def discover(snapshot: DiscoverySnapshot, name: str):
+        async with snapshot.locked():
+            events.append(f"{name} start")
+            await sleep(0.2)
+            events.append(f"{name} end")
+
+    async def run(directory: str):
+        await gather(
+            discover(DiscoverySnapshot(directory, "source"), "first"),
+            discover(DiscoverySnapshot(directory, "source"), "second"),
+        )
+
+    with TemporaryDirectory() as directory:
+        run_until_complete(run(directory))
+    assert events in [
+        ["first start", "first end", "second start", "second end"],
+        ["second start", "second end", "first start", "first end"],
+    ]
+
+
+def test_locks_independent():
+    events: List[str] = list()
+
+    async def hold(snapshot: DiscoverySnapshot, purpose: str):
+        async with snapshot.locked(purpose):
+            events.append(f"{purpose} start")
+            await sleep(0.2)
+            events.append(f"{purpose} end")
+
+    async def run(directory: str):
+        await gather(
+            hold(DiscoverySnapshot(directory, "source"), "discovery"),
+            hold(DiscoverySnapshot(directory, "source"), "refresh"),
+        )
+
+    with TemporaryDirectory() as directory:
+        run_until_complete(run(directory))
+    assert events[:2] == ["discovery start", "refresh start"]
+
+
+def test_refreshed_extents_shared():
+    refreshes: List[str] = list()
+    published: List[List[PostgresqlLayer]] = list()
+
+    async def run(directory: str):
+        data_sources = [_estimated_data_source(directory) for _ in range(2)]
+        await data_sources[0]._save_snapshot()
+        for data_source in data_sources:
+            data_source._get_exact_extents = partial(
+                _get_exact_extents, refreshes, data_source.name
+            )
+        await gather(
+            *[
+                data_source._refresh_extents(
+                    {"public.table": data_source._layers[0]},
+                    {"public.table": (_layer().bboxes, _layer().intervals)},
+                )
+                for data_source in data_sources
+            ]
+        )
+        # a later worker finds exact extents in the snapshot
+        return await DiscoverySnapshot(directory, "source").load("fingerprint")
+
+    with TemporaryDirectory() as directory, patch(
+        "oaff.app.data.sources.postgresql.stac_hybrid.postgresql_data_source"
+        ".update_layers",
+        lambda data_source, layers: published.append(layers),
+    ):
+        content = run_until_complete(run(directory))
+    assert len(refreshes) == 1
+    assert [layers[0].bboxes for layers in published] == [[[0, 0, 1, 1]]] * 2
+    assert content["estimated"] == set()
+    assert content["discovered"]["public.table"][1].bboxes == [[0, 0, 1, 1]]
+
+
+async def _get_exact_extents(refreshes: List[str], name: str, layers):
+    refreshes.append(name)
+    return {key: ([[0, 0, 1, 1]], [[None, None]]) for key in layers.keys()}
+
+
+def _estimated_data_source(directory: str) -> PostgresqlDataSource:
+    data_source = PostgresqlDataSource(None, None)
+    data_source._snapshot = DiscoverySnapshot(directory, "source")
+    data_source._snapshot_fingerprint = "fingerprint"
+    data_source._table_fingerprints = {"public.table": ("definition", "1:0:0")}
+    data_source._discovered = {"public.table": (("definition", "1:0:0"), _layer())}
+    data_source._estimated = {"public.table"}
+    data_source._layers = [_layer()]
+    return data_source
+
+
+def _layer() -> PostgresqlLayer:
+    return PostgresqlLayer(
+        id="layer",
+        title="table",
+        bboxes=[[-1, -1, 1, 1]],
+        intervals=[[None, None]],
+        data_source_id="source",
+        geometry_crs_auth_name="EPSG",
+        geometry_crs_auth_code=4326,
+        temporal_attributes=[],
+        schema_name="public",
+        table_name="table",
+        geometry_field_name="location",
+        geometry_srid=4326,
+        model=sa.Table(
+            "table",
+            sa.MetaData(),
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("location", sa.String),
+            schema="public",
+        ),
+    )
@@ -0,0 +1,17 @@
+from oaff.app.util import etag_matches, strong_etag
+
+
+def test_strong_etag():
+    assert strong_etag("a") == strong_etag(b"a")
+    assert strong_etag("a") != strong_etag("b")
+    assert strong_etag("a").startswith('"')
+
+
+def test_etag_matches():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('"b", "a"', '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"a"', 'W/"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
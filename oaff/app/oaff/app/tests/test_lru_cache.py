@@ -0,0 +1,37 @@
+from oaff.app.cache.lru_cache import LruCache, clear_lru_caches
+
+
+def test_evicts_least_recently_used():
+    cache = LruCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_disabled():
+    cache = LruCache(0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+
+def test_clear_all():
+    cache = LruCache(2)
+    cache.put("a", 1)
+    clear_lru_caches()
+    assert len(cache) == 0
+
+
+def test_discard():
+    cache = LruCache(3)
+    cache.put(("a", 1), 1)
+    cache.put(("a", 2), 2)
+    cache.put(("b", 1), 3)
+    generation = cache.generation
+    cache.discard(lambda key: key[0] == "a")
+    assert len(cache) == 1
+    assert cache.get(("b", 1)) == 3
+    assert cache.generation > generation
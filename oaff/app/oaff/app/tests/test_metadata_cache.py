@@ -0,0 +1,86 @@
+from http import HTTPStatus
+from unittest.mock import patch
+
+from oaff.app import gateway
+from oaff.app.cache.lru_cache import clear_lru_caches
+from oaff.app.i18n.locales import Locales
+from oaff.app.requests.conformance import Conformance
+from oaff.app.requests.feature import Feature
+from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.responses.response_type import ResponseType
+from oaff.app.tests.common import CountingHandler, run_until_complete
+
+
+def setup_function():
+    clear_lru_caches()
+
+
+def test_metadata_cached():
+    handler = CountingHandler()
+    with patch.dict(gateway.handlers, {Conformance.__name__: handler}):
+        first = run_until_complete(gateway.handle(_conformance()))
+        second = run_until_complete(gateway.handle(_conformance()))
+    assert len(handler.calls) == 1
+    assert second.encoded_response == first.encoded_response
+    assert second.additional_headers["ETag"] == first.additional_headers["ETag"]
+
+
+def test_metadata_cache_keys():
+    handler = CountingHandler()
+    with patch.dict(gateway.handlers, {Conformance.__name__: handler}):
+        run_until_complete(gateway.handle(_conformance()))
+        run_until_complete(gateway.handle(_conformance(format=ResponseFormat.html)))
+        run_until_complete(gateway.handle(_conformance(url="http://other/conformance")))
+    assert len(handler.calls) == 3
+
+
+def test_metadata_cache_cleared():
+    handler = CountingHandler()
+    with patch.dict(gateway.handlers, {Conformance.__name__: handler}):
+        first = run_until_complete(gateway.handle(_conformance()))
+        clear_lru_caches()
+        second = run_until_complete(gateway.handle(_conformance()))
+    assert len(handler.calls) == 2
+    assert second.additional_headers["ETag"] != first.additional_headers["ETag"]
+
+
+def test_metadata_not_modified():
+    handler = CountingHandler()
+    with patch.dict(gateway.handlers, {Conformance.__name__: handler}):
+        etag = run_until_complete(gateway.handle(_conformance())).additional_headers[
+            "ETag"
+        ]
+        response = run_until_complete(gateway.handle(_conformance(if_none_match=etag)))
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.encoded_response == b""
+    assert response.additional_headers["ETag"] == etag
+
+
+def test_data_not_cached():
+    handler = CountingHandler()
+    request = Feature(
+        url="http://test/collections/a/items/1",
+        root="http://test",
+        format=ResponseFormat.json,
+        type=ResponseType.DATA,
+        locale=Locales.en_US,
+        collection_id="a",
+        feature_id="1",
+    )
+    with patch.dict(gateway.handlers, {Feature.__name__: handler}):
+        run_until_complete(gateway.handle(request))
+        run_until_complete(gateway.handle(request))
+    assert len(handler.calls) == 2
+
+
+def _conformance(**kwargs) -> Conformance:
+    return Conformance(
+        **{
+            "url": "http://test/conformance",
+            "root": "http://test",
+            "format": ResponseFormat.json,
+            "type": ResponseType.METADATA,
+            "locale": Locales.en_US,
+            **kwargs,
+        }
+    )
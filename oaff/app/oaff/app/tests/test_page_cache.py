@@ -0,0 +1,110 @@
+from tempfile import TemporaryDirectory
+from time import sleep
+from unittest.mock import patch
+
+from oaff.app.cache.file_page_cache import FilePageCache
+from oaff.app.cache.memory_page_cache import MemoryPageCache
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_feature_set_provider import (  # noqa: E501
+    PostgresqlFeatureSetProvider,
+)
+from oaff.app.tests.common import run_until_complete
+
+
+def test_memory():
+    _exercise(MemoryPageCache(60, 10))
+
+
+def test_memory_expiry():
+    _exercise_expiry(MemoryPageCache(1, 10))
+
+
+def test_file():
+    with TemporaryDirectory() as directory:
+        _exercise(FilePageCache(60, directory))
+
+
+def test_file_expiry():
+    with TemporaryDirectory() as directory:
+        _exercise_expiry(FilePageCache(1, directory))
+
+
+def test_file_shared():
+    with TemporaryDirectory() as directory:
+        writer = FilePageCache(60, directory)
+        reader = FilePageCache(60, directory)
+        run_until_complete(writer.put("layer", "key", b"page"))
+        assert run_until_complete(reader.get("layer", "key")) == b"page"
+        run_until_complete(reader.invalidate("layer"))
+        assert run_until_complete(writer.get("layer", "key")) is None
+
+
+def _exercise(cache):
+    assert run_until_complete(cache.get("layer1", "key")) is None
+    run_until_complete(cache.put("layer1", "key", b"page1"))
+    run_until_complete(cache.put("layer2", "key", b"page2"))
+    assert run_until_complete(cache.get("layer1", "key")) == b"page1"
+    assert run_until_complete(cache.get("layer2", "key")) == b"page2"
+    run_until_complete(cache.put("layer1", "key", b"page1 updated"))
+    assert run_until_complete(cache.get("layer1", "key")) == b"page1 updated"
+
+    run_until_complete(cache.invalidate("layer1"))
+    assert run_until_complete(cache.get("layer1", "key")) is None
+    assert run_until_complete(cache.get("layer2", "key")) == b"page2"
+    run_until_complete(cache.put("layer1", "key", b"page1"))
+    assert run_until_complete(cache.get("layer1", "key")) == b"page1"
+
+    run_until_complete(cache.invalidate())
+    assert run_until_complete(cache.get("layer1", "key")) is None
+    assert run_until_complete(cache.get("layer2", "key")) is None
+
+
+def _exercise_expiry(cache):
+    run_until_complete(cache.put("layer", "key", b"page"))
+    assert run_until_complete(cache.get("layer", "key")) == b"page"
+    sleep(1.5)
+    assert run_until_complete(cache.get("layer", "key")) is None
+
+
+def test_large_pages_not_cached():
+    async def read(rows, cache):
+        provider = PostgresqlFeatureSetProvider(
+            _Database(rows),
+            lambda kind: None,
+            _Layer(),
+            limit=10,
+            total_count_provider=_no_count,
+            page_cache=cache,
+            page_key="page",
+        )
+        return "".join(
+            [chunk async for chunk in provider.as_geojson([], lambda more, last: {})]
+        )
+
+    cache = MemoryPageCache(60, 10)
+    with patch.dict("os.environ", {"APP_PAGE_CACHE_MAX_PAGE_SIZE": "10"}):
+        run_until_complete(read([{"feature": "{}", "id": 1}], cache))
+        assert run_until_complete(cache.get("layer", "page")) is not None
+        run_until_complete(cache.invalidate("layer"))
+        response = run_until_complete(
+            read([{"feature": "{}", "id": fid} for fid in range(5)], cache)
+        )
+    # the page is still streamed in full, but not held for the cache
+    assert response.startswith('{"type": "FeatureCollection", "features": [{},{},{}')
+    assert run_until_complete(cache.get("layer", "page")) is None
+
+
+class _Database:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def iterate(self, statement):
+        for row in self.rows:
+            yield row
+
+
+class _Layer:
+    id = "layer"
+
+
+async def _no_count():
+    return None
@@ -0,0 +1,183 @@
+from typing import Any, Final
+
+import geoalchemy2 as ga
+import sqlalchemy as sa
+from pygeofilter.ast import Attribute, BBox
+from sqlalchemy.dialects import postgresql
+
+from oaff.app.data.sources.common.crs import CRS84, parse_crs
+from oaff.app.data.sources.postgresql.stac_hybrid.filter_evaluator import (
+    PostgresqlFilterEvaluator,
+)
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_layer import PostgresqlLayer
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_statements import (
+    ItemsStatement,
+    output_geometry,
+)
+from oaff.app.settings import SPATIAL_FILTER_GEOMETRY_FIELD_ALIAS
+
+UUID: Final = "0f8fad5b-d9cb-469f-a165-70867728950e"
+
+
+def test_derived_without_prepare():
+    layer = _layer()
+    assert layer.crs == "EPSG:3857"
+    assert layer.unique_field_name == "fid"
+    assert layer.fields == ["fid", "name", "location"]
+    assert layer.columns[SPATIAL_FILTER_GEOMETRY_FIELD_ALIAS] is layer.model.c.location
+
+
+def test_prepared():
+    layer = _layer()
+    layer.prepare()
+    assert layer.crs == "EPSG:3857"
+    assert layer.unique_field_name == "fid"
+    assert layer.fields == ["fid", "name", "location"]
+    assert set(layer.columns.keys()) == {
+        SPATIAL_FILTER_GEOMETRY_FIELD_ALIAS,
+        "fid",
+        "name",
+        "location",
+    }
+    assert layer.columns["name"] is layer.model.c.name
+    assert layer.statements is layer.statements
+    # copies share what was derived from the layer's model
+    assert layer.copy().columns is layer.columns
+    assert str(layer.id_clause("x").compile()) == "false"
+    assert layer.id_clause("1").right.value == 1
+
+
+def test_prepared_uuid_primary_key():
+    layer = _layer(postgresql.UUID)
+    layer.prepare()
+    cursor_statement = layer.statements.items(
+        ItemsStatement.GEOJSON,
+        after_cursor=True,
+        limit=10,
+        cursor=layer.statements.cursor_value(UUID),
+    )
+    assert "> CAST(%(cursor)s AS UUID)" in cursor_statement.string
+    assert cursor_statement.params["cursor"] == UUID
+    # a malformed cursor is not cast by the database
+    assert layer.statements.cursor_value("not-a-uuid") is None
+    assert layer.statements.cursor_value(UUID.upper()) == UUID
+    assert _compile(layer.id_clause(UUID)) == (
+        f"CAST(public.\"table\".fid AS VARCHAR) = '{UUID}'"
+    )
+
+
+def test_inet_cursor():
+    layer = _layer(postgresql.INET)
+    layer.prepare()
+    assert layer.statements.cursor_value("10.0.0.1") == "10.0.0.1/32"
+    assert layer.statements.cursor_value("10.0.0.300") is None
+
+
+def test_flatgeobuf_spatial_index_for_whole_collection():
+    layer = _layer()
+    layer.prepare()
+    statement = layer.statements.items(
+        ItemsStatement.FLATGEOBUF,
+        after_cursor=False,
+        limit=11,
+        offset=0,
+        page_limit=10,
+        spatial_index=True,
+    )
+    # requested only if no items remain beyond the page
+    assert (
+        "ST_AsFlatGeobuf(page, %(spatial_index)s AND (SELECT count(*) AS count_1 "
+        "\nFROM ids) <= %(page_limit)s," in statement.string
+    )
+    assert statement.params["spatial_index"] is True
+
+
+def test_fingerprint():
+    layer = _layer()
+    assert layer.copy(update={"bboxes": [[0, 0, 1, 1]]}).fingerprint() == (
+        layer.fingerprint()
+    )
+    assert _layer(sa.BigInteger).fingerprint() != layer.fingerprint()
+    assert layer.copy(update={"title": "other"}).fingerprint() != layer.fingerprint()
+
+
+def test_statements_for_crs():
+    layer = _layer()
+    layer.prepare()
+    assert layer.statements_for(None) is layer.statements
+    assert layer.statements_for(parse_crs(CRS84)) is layer.statements
+    web_mercator = layer.statements_for(parse_crs("EPSG:3857"))
+    assert web_mercator is not layer.statements
+    assert web_mercator is layer.statements_for(parse_crs("EPSG:3857"))
+
+
+def test_output_geometry():
+    layer = _layer()
+    assert output_geometry("g", layer, parse_crs("EPSG:3857")) == "g"
+    assert (
+        output_geometry("g", layer, parse_crs(CRS84)) == "ST_Transform(g::geometry, 4326)"
+    )
+    assert (
+        output_geometry("g", layer, parse_crs("EPSG:4326"))
+        == "ST_FlipCoordinates(ST_Transform(g::geometry, 4326)::geometry)"
+    )
+
+
+def test_filter_bbox_transformed():
+    layer = _layer()
+    layer.prepare()
+    sql = _compile(PostgresqlFilterEvaluator(layer).evaluate(_bbox(4326)))
+    assert "ST_Transform(ST_Segmentize(ST_GeomFromEWKT('SRID=4326;" in sql
+    assert sql.endswith(", 3857))")
+
+
+def test_filter_bbox_same_crs():
+    layer = _layer()
+    layer.prepare()
+    sql = _compile(PostgresqlFilterEvaluator(layer).evaluate(_bbox(3857)))
+    assert "ST_Transform" not in sql
+    assert "ST_GeomFromEWKT('SRID=3857;" in sql
+
+
+def _bbox(crs: int) -> BBox:
+    return BBox(
+        lhs=Attribute(SPATIAL_FILTER_GEOMETRY_FIELD_ALIAS),
+        minx=0,
+        miny=0,
+        maxx=1,
+        maxy=1,
+        crs=crs,
+    )
+
+
+def _compile(clause) -> str:
+    return str(
+        clause.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def _layer(id_type: Any = sa.Integer) -> PostgresqlLayer:
+    return PostgresqlLayer(
+        id="layer",
+        title="table",
+        bboxes=[[-1, -1, 1, 1]],
+        intervals=[[None, None]],
+        data_source_id="source",
+        geometry_crs_auth_name="EPSG",
+        geometry_crs_auth_code=3857,
+        temporal_attributes=[],
+        schema_name="public",
+        table_name="table",
+        geometry_field_name="location",
+        geometry_srid=3857,
+        model=sa.Table(
+            "table",
+            sa.MetaData(),
+            sa.Column("fid", id_type, primary_key=True),
+            sa.Column("name", sa.String),
+            sa.Column("location", ga.Geometry("POINT", 3857)),
+            schema="public",
+        ),
+    )
@@ -0,0 +1,127 @@
+import os
+from typing import List
+from unittest.mock import Mock, patch
+
+import pytest
+
+from oaff.app.data.sources.common.request_limiter import BackpressureMode
+from oaff.app.data.sources.postgresql.postgresql_manager import PostgresqlManager
+from oaff.app.data.sources.postgresql.stac_hybrid.count_mode import CountMode
+from oaff.app.data.sources.postgresql.stac_hybrid.extent_mode import ExtentMode
+from oaff.app.data.sources.postgresql.stac_hybrid.settings import extent_mode
+from oaff.app.i18n.locales import Locales
+from oaff.app.requests.collection_items import CollectionItems
+from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.responses.response_type import ResponseType
+from oaff.app.settings import ENV_VAR_PREFIX
+from oaff.app.tests.common import run_until_complete
+
+
+class _Database:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.is_connected = False
+
+    async def connect(self):
+        if self.failures > 0:
+            self.failures -= 1
+            raise OSError("connection refused")
+        self.is_connected = True
+
+
+def setup_module():
+    os.environ[f"{ENV_VAR_PREFIX}POSTGRESQL_PROFILE"] = "stac_hybrid"
+    os.environ[f"{ENV_VAR_PREFIX}POSTGRESQL_CONNECT_RETRIES"] = "4"
+
+
+def teardown_module():
+    del os.environ[f"{ENV_VAR_PREFIX}POSTGRESQL_PROFILE"]
+    del os.environ[f"{ENV_VAR_PREFIX}POSTGRESQL_CONNECT_RETRIES"]
+
+
+def test_retries_with_backoff():
+    database = _Database(2)
+    delays = _test_connection(database)
+    assert database.is_connected
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 0.5
+    assert 0 <= delays[1] <= 1
+
+
+def test_gives_up():
+    database = _Database(4)
+    with pytest.raises(ConnectionError):
+        _test_connection(database)
+    assert not database.is_connected
+
+
+def test_invalid_count_mode_defaults():
+    with patch.dict(os.environ, {f"{ENV_VAR_PREFIX}POSTGRESQL_COUNT_MODE": "bad"}):
+        data_source = PostgresqlManager().get_data_sources()[0]
+    assert data_source.count_mode == CountMode.EXACT
+
+
+def test_invalid_pool_backpressure_defaults():
+    with patch.dict(os.environ, {f"{ENV_VAR_PREFIX}POSTGRESQL_POOL_BACKPRESSURE": "bad"}):
+        data_source = PostgresqlManager().get_data_sources()[0]
+    assert data_source.request_limiter.mode == BackpressureMode.NONE
+
+
+def test_invalid_extent_mode_defaults():
+    data_source = PostgresqlManager().get_data_sources()[0]
+    with patch.dict(os.environ, {f"{ENV_VAR_PREFIX}POSTGRESQL_EXTENT_MODE": "bad"}):
+        assert extent_mode(data_source.connection_name) == ExtentMode.EXACT
+
+
+def test_request_connections():
+    items = CollectionItems(
+        url="http://test/collections/layer/items",
+        root="http://test",
+        format=ResponseFormat.json,
+        type=ResponseType.DATA,
+        locale=Locales.en_US,
+        collection_id="layer",
+        limit=10,
+        offset=0,
+    )
+    data_source = PostgresqlManager().get_data_sources()[0]
+    # the page and its count use a connection each
+    assert data_source.get_request_connections(items) == 2
+    assert (
+        data_source.get_request_connections(
+            items.copy(update={"format": ResponseFormat.html})
+        )
+        == 1
+    )
+    with patch.dict(os.environ, {f"{ENV_VAR_PREFIX}POSTGRESQL_COUNT_MODE": "none"}):
+        data_source = PostgresqlManager().get_data_sources()[0]
+    assert data_source.get_request_connections(items) == 1
+
+
+def test_pool_metrics():
+    data_source = PostgresqlManager().get_data_sources()[0]
+    assert data_source.get_metrics()["pool"] is None
+    pool = Mock()
+    pool.get_size.return_value = 3
+    pool.get_idle_size.return_value = 1
+    pool.get_min_size.return_value = 2
+    pool.get_max_size.return_value = 10
+    with patch.object(data_source.db._backend, "_pool", pool):
+        assert data_source.get_metrics()["pool"] == {
+            "size": 3,
+            "idle": 1,
+            "minSize": 2,
+            "maxSize": 10,
+        }
+
+
+def _test_connection(database: _Database) -> List[float]:
+    delays = list()
+
+    async def record_sleep(delay: float):
+        delays.append(delay)
+
+    connection_tester = PostgresqlManager().get_data_sources()[0].connection_tester
+    with patch("oaff.app.data.sources.postgresql.postgresql_manager.sleep", record_sleep):
+        run_until_complete(connection_tester(database, None))
+    return delays
@@ -0,0 +1,237 @@
+from asyncio import get_running_loop, sleep
+from http import HTTPStatus
+from typing import Final
+from unittest.mock import patch
+
+from oaff.app import gateway
+from oaff.app.data.sources.common.layer import Layer
+from oaff.app.data.sources.common.request_limiter import BackpressureMode, RequestLimiter
+from oaff.app.i18n.locales import Locales
+from oaff.app.requests.feature import Feature
+from oaff.app.responses.data_response import DataResponse
+from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.responses.response_type import ResponseType
+from oaff.app.tests.common import run_until_complete
+
+layer: Final = Layer(
+    id="layer",
+    title="title",
+    bboxes=[[-1, -1, 1, 1]],
+    intervals=[[None, None]],
+    data_source_id="source",
+    geometry_crs_auth_name="EPSG",
+    geometry_crs_auth_code=4326,
+    temporal_attributes=[],
+)
+
+
+class _LimitedDataSource:
+    def __init__(self, limiter: RequestLimiter, connections: int = 1):
+        self.request_limiter = limiter
+        self.connections = connections
+
+    def get_request_connections(self, request) -> int:
+        return self.connections
+
+    async def get_data_version(self, layer: Layer):
+        return None
+
+
+class _StreamingHandler:
+    async def handle(self, request):
+        return DataResponse(
+            mime_type=request.format[request.type],
+            encoded_response=self._chunks(),
+        )
+
+    async def _chunks(self):
+        yield "{"
+        yield "}"
+
+
+def test_none_does_not_limit():
+    async def run():
+        limiter = RequestLimiter(1)
+        assert await limiter.acquire()
+        assert await limiter.acquire()
+        assert limiter.in_flight == 2
+        limiter.release()
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    run_until_complete(run())
+
+
+def test_reject():
+    async def run():
+        limiter = RequestLimiter(1, BackpressureMode.REJECT)
+        assert await limiter.acquire()
+        assert not await limiter.acquire()
+        limiter.release()
+        assert await limiter.acquire()
+        assert limiter.get_metrics()["rejected"] == 1
+
+    run_until_complete(run())
+
+
+def test_queue_times_out():
+    async def run():
+        limiter = RequestLimiter(1, BackpressureMode.QUEUE, 0.05)
+        assert await limiter.acquire()
+        assert not await limiter.acquire()
+        assert limiter.get_metrics() == {
+            "backpressure": "queue",
+            "limit": 1,
+            "inFlight": 1,
+            "connections": 1,
+            "waiting": 0,
+            "rejected": 1,
+        }
+
+    run_until_complete(run())
+
+
+def test_queue_waits_for_release():
+    async def run():
+        limiter = RequestLimiter(1, BackpressureMode.QUEUE, 5)
+        assert await limiter.acquire()
+        waiter = get_running_loop().create_task(limiter.acquire())
+        await sleep(0)
+        assert limiter.waiting == 1
+        limiter.release()
+        assert await waiter
+        assert limiter.in_flight == 1
+
+    run_until_complete(run())
+
+
+def test_connections_limited():
+    async def run():
+        limiter = RequestLimiter(3, BackpressureMode.REJECT)
+        assert await limiter.acquire(2)
+        assert not await limiter.acquire(2)
+        assert await limiter.acquire()
+        assert limiter.connections == 3
+        limiter.release(2)
+        assert limiter.connections == 1
+        # requests never wait for more connections than the limit
+        assert await RequestLimiter(1, BackpressureMode.REJECT).acquire(2)
+
+    run_until_complete(run())
+
+
+def test_queue_admits_in_order():
+    async def run():
+        limiter = RequestLimiter(2, BackpressureMode.QUEUE, 5)
+        assert await limiter.acquire()
+        assert await limiter.acquire()
+        first = get_running_loop().create_task(limiter.acquire(2))
+        await sleep(0)
+        second = get_running_loop().create_task(limiter.acquire())
+        await sleep(0)
+        limiter.release()
+        await sleep(0)
+        # the single connection released is held for the earlier request
+        assert not first.done() and not second.done()
+        limiter.release()
+        assert await first
+        assert limiter.connections == 2
+        limiter.release(2)
+        assert await second
+        assert limiter.connections == 1
+
+    run_until_complete(run())
+
+
+def test_queue_timeout_admits_next():
+    async def run():
+        limiter = RequestLimiter(2, BackpressureMode.QUEUE, 0.1)
+        assert await limiter.acquire()
+        first = get_running_loop().create_task(limiter.acquire(2))
+        await sleep(0.05)
+        second = get_running_loop().create_task(limiter.acquire())
+        # the second request fits once the first gives up waiting
+        assert not await first
+        assert await second
+        assert limiter.connections == 2
+        assert limiter.waiting == 0
+
+    run_until_complete(run())
+
+
+def test_drained_after_queued_requests():
+    async def run():
+        limiter = RequestLimiter(1, BackpressureMode.QUEUE, 5)
+        assert limiter.idle()
+        assert await limiter.acquire()
+        waiter = get_running_loop().create_task(limiter.acquire())
+        drained = get_running_loop().create_task(limiter.drained())
+        await sleep(0)
+        limiter.release()
+        assert await waiter
+        # the queued request was admitted, so requests remain in flight
+        await sleep(0)
+        assert not drained.done()
+        assert not await limiter.drained(0.05)
+        limiter.release()
+        assert await drained
+        assert limiter.idle()
+
+    run_until_complete(run())
+
+
+def test_gateway_acquires_request_connections():
+    limiter = RequestLimiter(2, BackpressureMode.REJECT)
+
+    async def run():
+        response = await _handle(_StreamingHandler(), limiter, connections=2)
+        assert limiter.connections == 2
+        [chunk async for chunk in response.encoded_response]
+        assert limiter.connections == 0
+
+    run_until_complete(run())
+
+
+def test_gateway_rejects_when_busy():
+    limiter = RequestLimiter(1, BackpressureMode.REJECT)
+
+    async def run():
+        assert await limiter.acquire()
+        return await _handle(_StreamingHandler(), limiter)
+
+    response = run_until_complete(run())
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert limiter.in_flight == 1
+
+
+def test_gateway_releases_after_stream():
+    limiter = RequestLimiter(1, BackpressureMode.REJECT)
+
+    async def run():
+        response = await _handle(_StreamingHandler(), limiter)
+        assert limiter.in_flight == 1
+        chunks = [chunk async for chunk in response.encoded_response]
+        assert chunks == ["{", "}"]
+        assert limiter.in_flight == 0
+
+    run_until_complete(run())
+
+
+async def _handle(handler, limiter, connections: int = 1):
+    with patch.dict(gateway.handlers, {Feature.__name__: handler}), patch(
+        "oaff.app.gateway.get_layer", return_value=layer
+    ), patch(
+        "oaff.app.gateway.get_data_source",
+        return_value=_LimitedDataSource(limiter, connections),
+    ):
+        return await gateway.handle(
+            Feature(
+                url="http://test/collections/layer/items/1",
+                root="http://test",
+                format=ResponseFormat.json,
+                type=ResponseType.DATA,
+                locale=Locales.en_US,
+                collection_id="layer",
+                feature_id="1",
+            )
+        )
@@ -0,0 +1,20 @@
+from oaff.app.data.sources.common.crs import CRS84, parse_crs
+from oaff.app.request_handlers.common.spatial_bounds import bounds_to_node
+
+
+def test_bounds_to_node():
+    node = bounds_to_node((10, 40, 20, 60), parse_crs(CRS84))
+    assert (node.minx, node.miny, node.maxx, node.maxy) == (10, 40, 20, 60)
+    assert node.crs == 4326
+
+
+def test_bounds_to_node_northing_first():
+    node = bounds_to_node((40, 10, 60, 20), parse_crs("EPSG:4326"))
+    assert (node.minx, node.miny, node.maxx, node.maxy) == (10, 40, 20, 60)
+    assert node.crs == 4326
+
+
+def test_bounds_to_node_in_other_crs():
+    node = bounds_to_node((1, 2, 3, 4), parse_crs("EPSG:32633"))
+    assert (node.minx, node.miny, node.maxx, node.maxy) == (1, 2, 3, 4)
+    assert node.crs == 32633
@@ -0,0 +1,26 @@
+import sqlalchemy as sa
+
+from oaff.app.data.sources.postgresql.stac_hybrid.statement_template import (
+    StatementTemplate,
+)
+
+table = sa.Table("tbl", sa.MetaData(), sa.Column("id", sa.Integer, primary_key=True))
+template = StatementTemplate(
+    sa.select([table.c.id])
+    .order_by(table.c.id)
+    .limit(sa.bindparam("limit", type_=sa.Integer))
+    .offset(sa.bindparam("offset", type_=sa.Integer))
+)
+
+
+def test_binds_values_to_stable_sql():
+    first = template.bind(limit=11, offset=0)
+    second = template.bind(limit=21, offset=20)
+    assert first.string == second.string
+    assert first.params == {"limit": 11, "offset": 0}
+    assert second.params == {"limit": 21, "offset": 20}
+
+
+def test_presents_own_compilation():
+    bound = template.bind(limit=11, offset=0)
+    assert bound.compile(dialect=None) is bound
@@ -1,5 +1,7 @@
 from datetime import datetime
-from typing import Final
+from hashlib import sha256
+from random import uniform
+from typing import Final, Optional, Union
 
 from pytz import timezone
 
@@ -40,3 +42,33 @@ def datetime_as_rfc3339(datetime: datetime) -> str:
     if datetime is None:
         return None
     return datetime.astimezone(timezone("UTC")).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def as_geojson_seq_record(geojson: str) -> str:
+    # RFC 8142 record: RS, GeoJSON text, LF
+    return f"\x1e{geojson}\n"
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    # exponential backoff with full jitter, so that retries from many workers spread out
+    return uniform(0, min(maximum, base * pow(2, attempt)))
+
+
+def strong_etag(content: Union[str, bytes]) -> str:
+    return '"{0}"'.format(
+        sha256(
+            content.encode("utf-8") if isinstance(content, str) else content
+        ).hexdigest()
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # RFC 7232 weak comparison, If-None-Match may list several tags or be "*"
+    if if_none_match is None:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or _opaque_tag(etag) in [_opaque_tag(tag) for tag in tags]
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
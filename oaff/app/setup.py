@@ -12,10 +12,11 @@ inst_reqs = [
     "httptools==0.2.0",
     "pygeofilter==0.0.2",
     "psycopg2==2.8.6",
-    "asyncpg==0.23.0",
+    "asyncpg==0.25.0",
 ]
 extra_reqs = {
     "test": ["pytest"],
+    "redis": ["redis==4.6.0"],
 }
 
 setup(
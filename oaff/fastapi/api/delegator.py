@@ -1,8 +1,8 @@
-from typing import Awaitable, Callable, Type
+from typing import AsyncIterator, Awaitable, Callable, Type
 
 from fastapi import status
 from fastapi.exceptions import HTTPException
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 
 from oaff.app.gateway import handle as gateway_handler
 from oaff.app.request_handlers.common.request_handler import RequestHandler
@@ -24,6 +24,12 @@ async def delegate(
 ) -> Response:
     try:
         app_response = await handler(request)
+        if hasattr(app_response, "encoded_response") and hasattr(
+            app_response.encoded_response, "__anext__"
+        ):
+            # read the first chunk before responding so that failures
+            # surface as an error status rather than a truncated body
+            first_chunk = await _first_chunk(app_response.encoded_response)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -32,6 +38,13 @@ async def delegate(
         raise HTTPException(
             status_code=app_response.status_code, detail=app_response.detail
         )
+    elif hasattr(app_response.encoded_response, "__anext__"):
+        return StreamingResponse(
+            content=_resume(first_chunk, app_response.encoded_response),
+            status_code=app_response.status_code,
+            headers=app_response.additional_headers,
+            media_type=app_response.mime_type,
+        )
     else:
         return Response(
             content=app_response.encoded_response,
@@ -39,3 +52,18 @@ async def delegate(
             headers=app_response.additional_headers,
             media_type=app_response.mime_type,
         )
+
+
+async def _first_chunk(chunks: AsyncIterator[str]) -> str:
+    # an empty stream, such as a page of no features as a text sequence, is an
+    # empty body
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return ""
+
+
+async def _resume(first_chunk: str, remaining: AsyncIterator[str]) -> AsyncIterator[str]:
+    yield first_chunk
+    async for chunk in remaining:
+        yield chunk
@@ -1,45 +1,84 @@
-from typing import Callable
+from copy import deepcopy
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional
 
 from fastapi.applications import FastAPI
 from fastapi.requests import Request
+from fastapi.responses import Response
+from starlette.routing import BaseRoute
 
-from oaff.fastapi.api.settings import ROOT_PATH
+from oaff.app.util import etag_matches, strong_etag
 from oaff.fastapi.api.openapi.vnd_response import VndResponse
+from oaff.fastapi.api.settings import ROOT_PATH
+
+
+class _OgcOpenApiDocument:
+    """
+    The OGC OpenAPI document, generated and serialized once and regenerated only
+    when the application's routes change.
+    """
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self.routes: Optional[List[BaseRoute]] = None
+        self.content = b""
+        self.etag = ""
+
+    def refresh(self) -> None:
+        if self.routes != self.app.routes:
+            # FastAPI caches its own schema, which is also stale once routes change
+            if self.routes is not None:
+                self.app.openapi_schema = None
+            self.routes = list(self.app.routes)
+            self.content = VndResponse(None).render(_ogc_definition(self.app.openapi()))
+            self.etag = strong_etag(self.content)
 
 
-def get_openapi_handler(app: FastAPI) -> Callable[[Request], VndResponse]:
-    def handler(_: Request):
-        # OpenAPI spec must be modified because FastAPI doesn't support
-        # encoding style: https://github.com/tiangolo/fastapi/issues/283
-        definition = app.openapi().copy()
-        for path in definition["paths"].values():
-            if "get" in path:
-                if "parameters" in path["get"]:
-                    for parameter in path["get"]["parameters"]:
-                        if "style" not in parameter:
-                            parameter["style"] = "form"
-
-        # This API actually expects BBOX as a string but OGC spec requires
-        # array with form-style, which is not possible in FastAPI.
-        # Continue to accept string but pretend it's form-style array.
-        # End result is the same. String BBOX param is validated by regex.
-        collection_items_bbox_param = list(
-            filter(
-                lambda parameter: parameter["name"] == "bbox",
-                definition["paths"][f"{ROOT_PATH}/collections/{{collection_id}}/items"][
-                    "get"
-                ]["parameters"],
+def get_openapi_handler(app: FastAPI) -> Callable[[Request], Response]:
+    document = _OgcOpenApiDocument(app)
+
+    def handler(request: Request):
+        document.refresh()
+        if etag_matches(request.headers.get("If-None-Match"), document.etag):
+            return Response(
+                status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": document.etag}
             )
-        )[0]
-        collection_items_bbox_param["schema"] = {
-            "type": "array",
-            "minItems": 4,
-            "maxItems": 6,
-            "items": {
-                "type": "number",
-            },
-        }
-
-        return VndResponse(definition)
+        return VndResponse(document.content, headers={"ETag": document.etag})
 
     return handler
+
+
+def _ogc_definition(openapi: Dict[str, Any]) -> Dict[str, Any]:
+    # OpenAPI spec must be modified because FastAPI doesn't support
+    # encoding style: https://github.com/tiangolo/fastapi/issues/283
+    # The copy leaves FastAPI's own document untouched.
+    definition = deepcopy(openapi)
+    for path in definition["paths"].values():
+        if "get" in path:
+            if "parameters" in path["get"]:
+                for parameter in path["get"]["parameters"]:
+                    if "style" not in parameter:
+                        parameter["style"] = "form"
+
+    # This API actually expects BBOX as a string but OGC spec requires
+    # array with form-style, which is not possible in FastAPI.
+    # Continue to accept string but pretend it's form-style array.
+    # End result is the same. String BBOX param is validated by regex.
+    collection_items_bbox_param = list(
+        filter(
+            lambda parameter: parameter["name"] == "bbox",
+            definition["paths"][f"{ROOT_PATH}/collections/{{collection_id}}/items"][
+                "get"
+            ]["parameters"],
+        )
+    )[0]
+    collection_items_bbox_param["schema"] = {
+        "type": "array",
+        "minItems": 4,
+        "maxItems": 6,
+        "items": {
+            "type": "number",
+        },
+    }
+
+    return definition
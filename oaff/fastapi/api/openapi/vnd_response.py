@@ -1,3 +1,5 @@
+from typing import Any
+
 from fastapi.responses import JSONResponse
 
 from oaff.app.settings import OPENAPI_OGC_TYPE
@@ -5,3 +7,7 @@ from oaff.app.settings import OPENAPI_OGC_TYPE
 
 class VndResponse(JSONResponse):
     media_type = OPENAPI_OGC_TYPE
+
+    def render(self, content: Any) -> bytes:
+        # content may already have been serialized
+        return content if isinstance(content, bytes) else super().render(content)
@@ -5,7 +5,7 @@ from urllib.parse import quote
 
 import iso8601
 import pytz
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Path, Query
 from fastapi.param_functions import Depends
 from fastapi.requests import Request
 
@@ -13,8 +13,10 @@ from oaff.app.requests.collection import Collection as CollectionRequestType
 from oaff.app.requests.collection_items import (
     CollectionItems as CollectionItemsRequestType,
 )
+from oaff.app.requests.collection_tile import CollectionTile as CollectionTileRequestType
 from oaff.app.requests.collections_list import CollectionsList as CollectionsListRequest
 from oaff.app.requests.feature import Feature as FeatureRequestType
+from oaff.app.responses.response_format import ResponseFormat
 from oaff.app.responses.response_type import ResponseType
 from oaff.fastapi.api import settings
 from oaff.fastapi.api.delegator import delegate, get_default_handler
@@ -25,10 +27,21 @@ PATH: Final = f"{settings.ROOT_PATH}/collections"
 ROUTER: Final = APIRouter()
 LOGGER: Final = getLogger(__file__)
 BBOX_MEMBER_REGEX: Final = r"(\-)?\d+(\.\d+)?"
+STREAMED_FORMATS: Final = [ResponseFormat.geojsonseq]
+ITEMS_LIMIT_DESCRIPTION: Final = " ".join(
+    [
+        f"Maximum number of items to return, at most {settings.ITEMS_LIMIT_MAX}",
+        f"or {settings.ITEMS_LIMIT_MAX_STREAMED} for streamed formats",
+        f"({', '.join([format.name for format in STREAMED_FORMATS])})",
+    ]
+)
 
 PATH_GET_COLLECTION: Final = "/{collection_id}"
 PATH_GET_COLLECTION_ITEMS: Final = "/{collection_id}/items"
 PATH_GET_FEATURE: Final = "/{collection_id}/items/{feature_id}"
+PATH_GET_COLLECTION_TILE: Final = (
+    "/{collection_id}/tiles/{tile_matrix_set_id}/{z}/{x}/{y}"
+)
 
 
 @ROUTER.get("")
@@ -45,6 +58,7 @@ async def get_collections_list(
             locale=common_parameters.locale,
             root=common_parameters.root,
             url=str(request.url),
+            if_none_match=common_parameters.if_none_match,
         ),
         handler,
     )
@@ -66,6 +80,7 @@ async def get_collection(
             locale=common_parameters.locale,
             url=_get_safe_url(PATH_GET_COLLECTION, request, common_parameters.root),
             root=common_parameters.root,
+            if_none_match=common_parameters.if_none_match,
         ),
         handler,
     )
@@ -81,13 +96,20 @@ async def get_collection_items(
         alias="limit",
         default=settings.ITEMS_LIMIT_DEFAULT,
         ge=settings.ITEMS_LIMIT_MIN,
-        le=settings.ITEMS_LIMIT_MAX,
+        # the greatest limit of any format, formats are checked by items_limit_max
+        le=settings.ITEMS_LIMIT_MAX_STREAMED,
+        description=ITEMS_LIMIT_DESCRIPTION,
     ),
     offset_param: int = Query(
         alias="offset",
         default=settings.ITEMS_OFFSET_DEFAULT,
         ge=settings.ITEMS_OFFSET_MIN,
     ),
+    cursor_param: Optional[str] = Query(
+        alias="cursor",
+        default=None,
+        min_length=1,
+    ),
     bbox_param: Optional[str] = Query(
         alias="bbox",
         default=settings.ITEMS_BBOX_DEFAULT,
@@ -132,20 +154,37 @@ async def get_collection_items(
         alias="filter-crs",
         default=None,
     ),
+    crs_param: Optional[str] = Query(
+        alias="crs",
+        default=None,
+    ),
 ):
     enforce_strict(
         request,
         [
             "limit",
             "offset",
+            "cursor",
             "bbox",
             "bbox-crs",
             "datetime",
             "filter",
             "filter-lang",
             "filter-crs",
+            "crs",
         ],
     )
+    limit_max = items_limit_max(common_parameters.format)
+    if limit_param > limit_max:
+        raise HTTPException(
+            status_code=400,
+            detail=" ".join(
+                [
+                    f"limit cannot exceed {limit_max} for",
+                    f"format {common_parameters.format.name}",
+                ]
+            ),
+        )
     return await delegate(
         CollectionItemsRequestType(
             type=ResponseType.DATA,
@@ -155,18 +194,29 @@ async def get_collection_items(
             collection_id=collection_id,
             limit=limit_param,
             offset=offset_param,
+            cursor=cursor_param,
             spatial_bounds=bbox_param.split(",") if bbox_param is not None else None,
             spatial_bounds_crs=bbox_crs_param,
             temporal_bounds=_process_datetime(datetime_param),
             filter_cql=filter_param,
             filter_lang=filter_lang_param,
             filter_crs=filter_crs_param,
+            crs=crs_param,
             root=common_parameters.root,
+            if_none_match=common_parameters.if_none_match,
         ),
         handler,
     )
 
 
+def items_limit_max(format: ResponseFormat) -> int:
+    return (
+        settings.ITEMS_LIMIT_MAX_STREAMED
+        if format in STREAMED_FORMATS
+        else settings.ITEMS_LIMIT_MAX
+    )
+
+
 @ROUTER.get(PATH_GET_FEATURE)
 async def get_feature(
     collection_id: str,
@@ -174,17 +224,53 @@ async def get_feature(
     feature_id: str,
     common_parameters: CommonParameters = Depends(CommonParameters.populate),
     handler=Depends(get_default_handler),
+    crs_param: Optional[str] = Query(
+        alias="crs",
+        default=None,
+    ),
 ):
-    enforce_strict(request)
+    enforce_strict(request, ["crs"])
     return await delegate(
         FeatureRequestType(
             type=ResponseType.DATA,
             collection_id=collection_id,
             feature_id=feature_id,
+            crs=crs_param,
             format=common_parameters.format,
             locale=common_parameters.locale,
             url=_get_safe_url(PATH_GET_FEATURE, request, common_parameters.root),
             root=common_parameters.root,
+            if_none_match=common_parameters.if_none_match,
+        ),
+        handler,
+    )
+
+
+@ROUTER.get(PATH_GET_COLLECTION_TILE)
+async def get_collection_tile(
+    collection_id: str,
+    tile_matrix_set_id: str,
+    request: Request,
+    z: int = Path(..., ge=0, le=settings.TILES_ZOOM_MAX),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    common_parameters: CommonParameters = Depends(CommonParameters.populate),
+    handler=Depends(get_default_handler),
+):
+    enforce_strict(request)
+    return await delegate(
+        CollectionTileRequestType(
+            type=ResponseType.DATA,
+            collection_id=collection_id,
+            tile_matrix_set_id=tile_matrix_set_id,
+            z=z,
+            x=x,
+            y=y,
+            format=common_parameters.format,
+            locale=common_parameters.locale,
+            url=_get_safe_url(PATH_GET_COLLECTION_TILE, request, common_parameters.root),
+            root=common_parameters.root,
+            if_none_match=common_parameters.if_none_match,
         ),
         handler,
     )
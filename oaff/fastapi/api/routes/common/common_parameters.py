@@ -19,12 +19,21 @@ RESPONSE_FORMAT_BY_MIME: Final = {
 }
 RESPONSE_FORMAT_BY_NAME: Final = {format.name: format for format in ResponseFormat}
 COMMON_QUERY_PARAMS: Final = ["format"]
+IF_NONE_MATCH_DESCRIPTION: Final = " ".join(
+    [
+        "Responds with 304 Not Modified if the resource still has one of these ETags.",
+        "Item, feature and tile ETags follow PostgreSQL's table statistics, which are",
+        "reported shortly after a transaction commits, so a change can take around a",
+        "second to be detected.",
+    ]
+)
 
 
 class CommonParameters(BaseModel):
     format: ResponseFormat
     locale: Locales
     root: str
+    if_none_match: Optional[str]
 
     @classmethod
     async def populate(
@@ -42,6 +51,11 @@ class CommonParameters(BaseModel):
             alias="Accept-Language",
             default=None,
         ),
+        if_none_match: Optional[str] = Header(
+            alias="If-None-Match",
+            default=None,
+            description=IF_NONE_MATCH_DESCRIPTION,
+        ),
     ):
         locale = None
         if language_header is not None:
@@ -63,6 +77,7 @@ class CommonParameters(BaseModel):
             format=format or ResponseFormat.json,
             locale=locale or DEFAULT_LOCALE,
             root=sub("/$", "", str(request.base_url)),
+            if_none_match=if_none_match,
         )
 
     @classmethod
@@ -6,7 +6,7 @@ from fastapi import APIRouter, status
 from fastapi.exceptions import HTTPException
 from fastapi.requests import Request
 
-from oaff.app.gateway import discover
+from oaff.app.gateway import discover, get_metrics, invalidate_collection
 from oaff.fastapi.api import settings
 
 PATH: Final = f"{settings.ROOT_PATH}/control"
@@ -17,9 +17,30 @@ LOGGER: Final = getLogger(__file__)
 @ROUTER.post("/reconfigure", include_in_schema=False)
 async def reconfigure(
     request: Request,
+    incremental: bool = False,
 ):
+    # incremental reconfiguration keeps connections and rediscovers changed tables
     if _permit(request):
-        await discover()
+        await discover(incremental)
+
+
+@ROUTER.post("/collections/{collection_id}/invalidate", include_in_schema=False)
+async def invalidate(
+    collection_id: str,
+    request: Request,
+):
+    # discards cached item pages and tiles after a collection's data changes
+    if _permit(request):
+        await invalidate_collection(collection_id)
+
+
+@ROUTER.get("/metrics", include_in_schema=False)
+async def metrics(
+    request: Request,
+):
+    # connection pool and request admission counters per data source
+    if _permit(request):
+        return get_metrics()
 
 
 # exercise basic control over who is allowed to update configuration
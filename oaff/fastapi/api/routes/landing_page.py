@@ -30,6 +30,7 @@ async def root(
             url=str(request.url),
             locale=common_parameters.locale,
             root=common_parameters.root,
+            if_none_match=common_parameters.if_none_match,
         ),
         handler,
     )
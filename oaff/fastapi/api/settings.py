@@ -26,8 +26,12 @@ CORS_ANY_LOCALHOST_REGEX: Final = r"http(s)?://localhost(:\d{1,5})?/.*"
 ITEMS_LIMIT_DEFAULT: Final = 10
 ITEMS_LIMIT_MIN: Final = 1
 ITEMS_LIMIT_MAX: Final = 10000
+# streamed formats hold no more than a chunk of features in memory
+ITEMS_LIMIT_MAX_STREAMED: Final = 1000000
 ITEMS_OFFSET_DEFAULT: Final = 0
 ITEMS_OFFSET_MIN: Final = 0
 ITEMS_BBOX_DEFAULT: Final = None
 ITEMS_BBOX_CRS_DEFAULT: Final = "http://www.opengis.net/def/crs/OGC/1.3/CRS84"
 ITEMS_DATETIME_DEFAULT: Final = None
+# the deepest tile matrix of WebMercatorQuad
+TILES_ZOOM_MAX: Final = 24
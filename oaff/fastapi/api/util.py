@@ -1,4 +1,6 @@
 import re
+from typing import Optional
+from urllib.parse import quote
 
 from oaff.app.responses.response_format import ResponseFormat
 from oaff.fastapi.api import settings
@@ -18,15 +20,15 @@ def alternate_format_for_url(url: str, format: ResponseFormat) -> str:
         return f"{url}{connector}format={format.name}"
 
 
-def next_page(url: str) -> str:
-    return _change_page(url, True)
+def next_page(url: str, cursor: Optional[str] = None) -> str:
+    return _change_page(url, True, cursor)
 
 
 def prev_page(url: str) -> str:
     return _change_page(url, False)
 
 
-def _change_page(url: str, forward: bool) -> str:
+def _change_page(url: str, forward: bool, cursor: Optional[str] = None) -> str:
     url_parts = url.split("?")
     parameters = {
         key: value
@@ -49,18 +51,24 @@ def _change_page(url: str, forward: bool) -> str:
         if "offset" in parameters
         else settings.ITEMS_OFFSET_DEFAULT
     )
+    if cursor is not None:
+        # keyset pagination replaces offset entirely
+        page_parameters = {
+            **{key: value for key, value in parameters.items() if key != "offset"},
+            **{
+                "cursor": quote(cursor, safe=""),
+                "limit": str(limit),
+            },
+        }
+    else:
+        page_parameters = {
+            **{key: value for key, value in parameters.items() if key != "cursor"},
+            **{
+                "offset": str(max(offset + limit * (1 if forward else -1), 0)),
+                "limit": str(limit),
+            },
+        }
     return "{0}?{1}".format(
         url_parts[0],
-        "&".join(
-            [
-                f"{key}={value}"
-                for key, value in {
-                    **parameters,
-                    **{
-                        "offset": str(max(offset + limit * (1 if forward else -1), 0)),
-                        "limit": str(limit),
-                    },
-                }.items()
-            ]
-        ),
+        "&".join([f"{key}={value}" for key, value in page_parameters.items()]),
     )
@@ -1,5 +1,6 @@
+from asyncio import get_event_loop
 from datetime import datetime
-from typing import List, Type
+from typing import Any, Awaitable, List, Type
 
 from oaff.app.requests.common.request_type import RequestType
 from oaff.app.responses.data_response import DataResponse
@@ -23,3 +24,7 @@ def get_mock_handler_provider(handler_calls: List[Type[RequestType]]):
 
 def get_valid_datetime_parameter() -> str:
     return datetime.utcnow().isoformat("T") + "Z"
+
+
+def run_until_complete(aw: Awaitable[Any]) -> Any:
+    return get_event_loop().run_until_complete(aw)
@@ -164,6 +164,16 @@ def test_format_header_override(
     assert handler_calls[0].format == ResponseFormat.json
 
 
+def test_if_none_match(
+    test_app,
+    endpoint_path: str,
+    handler_calls: List[Type[RequestType]],
+):
+    request(test_app, endpoint_path, headers={"If-None-Match": '"etag"'})
+    assert len(handler_calls) == 1
+    assert handler_calls[0].if_none_match == '"etag"'
+
+
 def test_unknown_param(test_app, endpoint_path: str):
     assert (
         request(test_app, endpoint_path, f"?{str(uuid4())}={str(uuid4())}").status_code
@@ -1,6 +1,7 @@
 from typing import Final
 
 from oaff.app.requests.collection_items import CollectionItems
+from oaff.app.responses.response_format import ResponseFormat
 from oaff.fastapi.api.routes.collections import PATH as ROOT_PATH
 from oaff.fastapi.api.settings import ITEMS_LIMIT_DEFAULT, ITEMS_OFFSET_DEFAULT
 from oaff.fastapi.tests import common_delegation as common
@@ -31,6 +32,7 @@ def test_basic_defaults(test_app):
     assert handler_calls[0].collection_id == collection_id
     assert handler_calls[0].limit == ITEMS_LIMIT_DEFAULT
     assert handler_calls[0].offset == ITEMS_OFFSET_DEFAULT
+    assert handler_calls[0].cursor is None
 
 
 def test_format_html(test_app):
@@ -41,6 +43,26 @@ def test_format_json(test_app):
     common.test_format_json(test_app, endpoint_path, handler_calls)
 
 
+def test_format_geojsonseq(test_app):
+    common.request(test_app, endpoint_path, url_suffix="?format=geojsonseq")
+    assert len(handler_calls) == 1
+    assert handler_calls[0].format == ResponseFormat.geojsonseq
+
+
+def test_format_flatgeobuf(test_app):
+    common.request(test_app, endpoint_path, url_suffix="?format=flatgeobuf")
+    assert len(handler_calls) == 1
+    assert handler_calls[0].format == ResponseFormat.flatgeobuf
+
+
+def test_format_header_geojsonseq(test_app):
+    common.request(
+        test_app, endpoint_path, headers={"Accept": "application/geo+json-seq"}
+    )
+    assert len(handler_calls) == 1
+    assert handler_calls[0].format == ResponseFormat.geojsonseq
+
+
 def test_language_en_US(test_app):
     common.test_language_en_US(test_app, endpoint_path, handler_calls)
 
@@ -81,6 +103,13 @@ def test_non_default_limit_offset(test_app):
     assert handler_calls[0].offset == offset
 
 
+def test_cursor(test_app):
+    cursor: Final = "abc"
+    common.request(test_app, endpoint_path, f"?cursor={cursor}")
+    assert handler_calls[0].cursor == cursor
+    assert handler_calls[0].get_item_constraints().cursor == cursor
+
+
 def test_format_header_html(test_app):
     common.test_format_header_html(test_app, endpoint_path, handler_calls)
 
@@ -93,5 +122,9 @@ def test_format_header_override(test_app):
     common.test_format_header_override(test_app, endpoint_path, handler_calls)
 
 
+def test_if_none_match(test_app):
+    common.test_if_none_match(test_app, endpoint_path, handler_calls)
+
+
 def test_unknown_param(test_app):
     common.test_unknown_param(test_app, endpoint_path)
@@ -2,7 +2,12 @@ from http import HTTPStatus
 from typing import Final
 
 from oaff.fastapi.api.routes.collections import PATH as ROOT_PATH
-from oaff.fastapi.api.settings import ITEMS_LIMIT_MAX, ITEMS_LIMIT_MIN, ITEMS_OFFSET_MIN
+from oaff.fastapi.api.settings import (
+    ITEMS_LIMIT_MAX,
+    ITEMS_LIMIT_MAX_STREAMED,
+    ITEMS_LIMIT_MIN,
+    ITEMS_OFFSET_MIN,
+)
 from oaff.fastapi.tests import common_delegation as common
 from oaff.fastapi.tests.common import get_valid_datetime_parameter
 
@@ -60,6 +65,28 @@ def test_items_invalid_max_limit(test_app):
     )
 
 
+def test_items_valid_max_streamed(test_app):
+    assert (
+        common.request(
+            test_app,
+            endpoint_path,
+            url_suffix=f"?limit={ITEMS_LIMIT_MAX_STREAMED}&format=geojsonseq",
+        ).status_code
+        == HTTPStatus.OK
+    )
+
+
+def test_items_invalid_max_limit_streamed(test_app):
+    assert (
+        common.request(
+            test_app,
+            endpoint_path,
+            url_suffix=f"?limit={ITEMS_LIMIT_MAX_STREAMED + 1}&format=geojsonseq",
+        ).status_code
+        == HTTPStatus.BAD_REQUEST
+    )
+
+
 def test_items_invalid_max_offset(test_app):
     assert (
         common.request(
@@ -247,3 +274,17 @@ def test_items_invalid_datetime_format_2(test_app):
         ).status_code
         == HTTPStatus.BAD_REQUEST
     )
+
+
+def test_items_crs(test_app):
+    crs = "http://www.opengis.net/def/crs/EPSG/0/3857"
+    assert (
+        common.request(
+            test_app,
+            endpoint_path,
+            url_suffix=f"?crs={crs}&bbox=0,0,1,1&bbox-crs={crs}",
+        ).status_code
+        == HTTPStatus.OK
+    )
+    assert handler_calls[0].crs == crs
+    assert handler_calls[0].spatial_bounds_crs == crs
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+from typing import Final
+
+from oaff.app.requests.collection_tile import CollectionTile
+from oaff.fastapi.api.routes.collections import PATH as ROOT_PATH
+from oaff.fastapi.api.settings import TILES_ZOOM_MAX
+from oaff.fastapi.tests import common_delegation as common
+
+handler_calls, collection_id, _ = common.make_params_common()
+endpoint_path: Final = f"{ROOT_PATH}/{collection_id}/tiles/WebMercatorQuad/3/2/1"
+
+
+def setup_module():
+    common.setup_module(handler_calls)
+
+
+def setup_function():
+    common.setup_function(handler_calls)
+
+
+def teardown_module():
+    common.teardown_module()
+
+
+def test_basic_defaults(test_app):
+    common.test_basic_defaults(
+        test_app,
+        endpoint_path,
+        CollectionTile,
+        handler_calls,
+    )
+    assert handler_calls[0].collection_id == collection_id
+    assert handler_calls[0].tile_matrix_set_id == "WebMercatorQuad"
+    assert handler_calls[0].z == 3
+    assert handler_calls[0].x == 2
+    assert handler_calls[0].y == 1
+
+
+def test_negative_tile_index(test_app):
+    assert (
+        common.request(
+            test_app, f"{ROOT_PATH}/{collection_id}/tiles/WebMercatorQuad/3/-1/1"
+        ).status_code
+        == HTTPStatus.BAD_REQUEST
+    )
+    assert len(handler_calls) == 0
+
+
+def test_if_none_match(test_app):
+    common.test_if_none_match(test_app, endpoint_path, handler_calls)
+
+
+def test_unknown_param(test_app):
+    common.test_unknown_param(test_app, endpoint_path)
+
+
+def test_zoom_beyond_tile_matrix_set(test_app):
+    assert (
+        common.request(
+            test_app,
+            f"{ROOT_PATH}/{collection_id}/tiles/WebMercatorQuad/{TILES_ZOOM_MAX + 1}/0/0",
+        ).status_code
+        == HTTPStatus.BAD_REQUEST
+    )
+    assert len(handler_calls) == 0
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
+
+from oaff.app.data.sources.postgresql.stac_hybrid.postgresql_feature_set_provider import (  # noqa: E501
+    PostgresqlFeatureSetProvider,
+)
+from oaff.app.responses.data_response import DataResponse
+from oaff.fastapi.api.delegator import delegate
+from oaff.fastapi.tests.common import run_until_complete
+
+
+def test_streamed_response():
+    async def chunks():
+        yield "a"
+        yield "b"
+
+    async def handler(_):
+        return DataResponse(mime_type="application/geo+json", encoded_response=chunks())
+
+    async def collect():
+        response = await delegate(None, handler)
+        assert isinstance(response, StreamingResponse)
+        return [chunk async for chunk in response.body_iterator]
+
+    assert run_until_complete(collect()) == ["a", "b"]
+
+
+def test_streamed_response_failure_before_first_chunk():
+    async def chunks():
+        raise ValueError("failed")
+        yield "a"
+
+    async def handler(_):
+        return DataResponse(mime_type="application/geo+json", encoded_response=chunks())
+
+    with pytest.raises(HTTPException) as e:
+        run_until_complete(delegate(None, handler))
+    assert e.value.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+def test_empty_streamed_response():
+    async def chunks():
+        return
+        yield
+
+    async def handler(_):
+        return DataResponse(
+            mime_type="application/geo+json-seq", encoded_response=chunks()
+        )
+
+    async def collect():
+        response = await delegate(None, handler)
+        return [chunk async for chunk in response.body_iterator]
+
+    assert run_until_complete(collect()) == [""]
+
+
+def test_streamed_items_query_failure():
+    class _Database:
+        async def iterate(self, statement):
+            raise ValueError("query failed")
+            yield
+
+    async def total_count():
+        return 0
+
+    provider = PostgresqlFeatureSetProvider(
+        _Database(), lambda kind: None, None, 10, total_count
+    )
+
+    async def handler(_):
+        return DataResponse(
+            mime_type="application/geo+json",
+            encoded_response=provider.as_geojson([], lambda *args: dict()),
+        )
+
+    with pytest.raises(HTTPException) as e:
+        run_until_complete(delegate(None, handler))
+    assert e.value.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert e.value.detail == "query failed"
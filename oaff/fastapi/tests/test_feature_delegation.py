@@ -1,3 +1,4 @@
+from http import HTTPStatus
 from typing import Final
 
 from oaff.app.requests.feature import Feature
@@ -69,5 +70,18 @@ def test_format_header_override(test_app):
     common.test_format_header_override(test_app, endpoint_path, handler_calls)
 
 
+def test_if_none_match(test_app):
+    common.test_if_none_match(test_app, endpoint_path, handler_calls)
+
+
 def test_unknown_param(test_app):
     common.test_unknown_param(test_app, endpoint_path)
+
+
+def test_crs(test_app):
+    crs = "http://www.opengis.net/def/crs/EPSG/0/3857"
+    assert (
+        common.request(test_app, endpoint_path, f"?crs={crs}").status_code
+        == HTTPStatus.OK
+    )
+    assert handler_calls[0].crs == crs
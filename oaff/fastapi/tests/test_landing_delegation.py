@@ -69,5 +69,9 @@ def test_format_header_override(test_app):
     common.test_format_header_override(test_app, endpoint_path, handler_calls)
 
 
+def test_if_none_match(test_app):
+    common.test_if_none_match(test_app, endpoint_path, handler_calls)
+
+
 def test_unknown_param(test_app):
     common.test_unknown_param(test_app, endpoint_path)
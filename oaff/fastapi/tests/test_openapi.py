@@ -0,0 +1,52 @@
+from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.settings import OPENAPI_OGC_TYPE
+from oaff.fastapi.api import settings
+from oaff.fastapi.api.routes.collections import items_limit_max
+
+
+def test_ogc_document(test_app):
+    response = test_app.get(settings.OPENAPI_OGC_PATH)
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == OPENAPI_OGC_TYPE
+    bbox = [
+        parameter
+        for parameter in response.json()["paths"][
+            f"{settings.ROOT_PATH}/collections/{{collection_id}}/items"
+        ]["get"]["parameters"]
+        if parameter["name"] == "bbox"
+    ][0]
+    assert bbox["style"] == "form"
+    assert bbox["schema"]["type"] == "array"
+
+
+def test_ogc_document_not_modified(test_app):
+    etag = test_app.get(settings.OPENAPI_OGC_PATH).headers["ETag"]
+    response = test_app.get(settings.OPENAPI_OGC_PATH, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_ogc_document_regenerated_on_route_change(test_app):
+    etag = test_app.get(settings.OPENAPI_OGC_PATH).headers["ETag"]
+    test_app.app.add_api_route(f"{settings.ROOT_PATH}/test-route", lambda: None)
+    try:
+        response = test_app.get(settings.OPENAPI_OGC_PATH)
+        assert response.headers["ETag"] != etag
+        assert f"{settings.ROOT_PATH}/test-route" in response.json()["paths"]
+    finally:
+        test_app.app.router.routes.pop()
+        test_app.app.openapi_schema = None
+
+
+def test_items_limit_documented(test_app):
+    limit = [
+        parameter
+        for parameter in test_app.get(settings.OPENAPI_PATH).json()["paths"][
+            f"{settings.ROOT_PATH}/collections/{{collection_id}}/items"
+        ]["get"]["parameters"]
+        if parameter["name"] == "limit"
+    ][0]
+    assert limit["schema"]["maximum"] == items_limit_max(ResponseFormat.geojsonseq)
+    assert str(items_limit_max(ResponseFormat.json)) in limit["description"]
+    assert str(items_limit_max(ResponseFormat.geojsonseq)) in limit["description"]
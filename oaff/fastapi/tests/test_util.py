@@ -1,7 +1,7 @@
 from typing import Final
 
 from oaff.app.responses.response_format import ResponseFormat
-from oaff.fastapi.api.util import alternate_format_for_url
+from oaff.fastapi.api.util import alternate_format_for_url, next_page, prev_page
 
 input_url_template: Final = "https://test.url/with/endpoint{0}"
 
@@ -29,3 +29,27 @@ def test_alternate_format_without_parameter_end_slash():
                     )
                     == input_url_template.format(f"{end}?format={target_format.name}")
                 )
+
+
+def test_next_page_offset():
+    assert next_page(input_url_template.format("?limit=5&offset=10")) == (
+        input_url_template.format("?limit=5&offset=15")
+    )
+
+
+def test_prev_page_offset():
+    assert prev_page(input_url_template.format("?limit=5&offset=3")) == (
+        input_url_template.format("?limit=5&offset=0")
+    )
+
+
+def test_next_page_cursor():
+    assert next_page(input_url_template.format("?limit=5&offset=10"), "a/b c") == (
+        input_url_template.format("?limit=5&cursor=a%2Fb%20c")
+    )
+
+
+def test_next_page_cursor_replaces_cursor():
+    assert next_page(
+        input_url_template.format("?cursor=41&format=json&limit=5"), "46"
+    ) == input_url_template.format("?cursor=46&format=json&limit=5")
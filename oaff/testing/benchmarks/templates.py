@@ -0,0 +1,128 @@
+"""
+Measures the latency of rendering each HTML page type, with the per-locale
+environments and their precompiled templates and with a new environment built for
+each render as before they were kept.
+
+    python -m oaff.testing.benchmarks.templates [iterations]
+"""
+
+import sys
+from os import path
+from time import perf_counter
+from typing import Callable, Final
+
+from jinja2 import Environment, PackageLoader, select_autoescape
+
+from oaff.app.configuration.frontend_configuration import FrontendConfiguration
+from oaff.app.configuration.frontend_interface import (
+    get_frontend_configuration,
+    set_frontend_configuration,
+)
+from oaff.app.data.sources.common.layer import Layer
+from oaff.app.i18n.locales import Locales
+from oaff.app.i18n.translations import get_translations_for_locale
+from oaff.app.responses.models.collection import CollectionHtml
+from oaff.app.responses.models.collection_item_html import CollectionItemHtml
+from oaff.app.responses.models.collection_items_html import CollectionItemsHtml
+from oaff.app.responses.models.collections import CollectionsHtml
+from oaff.app.responses.models.link import Link, LinkRel
+from oaff.app.responses.templates.templates import get_rendered_html
+
+ROOT: Final = "http://test"
+LOCALE: Final = Locales.en_US
+layer: Final = Layer(
+    id="layer",
+    title="layer",
+    description="A layer",
+    bboxes=[[-180, -90, 180, 90]],
+    intervals=[[None, None]],
+    data_source_id="source",
+    geometry_crs_auth_name="EPSG",
+    geometry_crs_auth_code=4326,
+    temporal_attributes=[],
+)
+format_links: Final = [
+    Link(
+        href=f"{ROOT}/collections/layer?format=json",
+        rel=LinkRel.ALTERNATE,
+        type="application/json",
+        title="This document",
+    )
+]
+features: Final = [
+    {"fid": fid, "name": f"feature {fid}", "height": fid * 1.5} for fid in range(10)
+]
+
+
+def pages():
+    collection = CollectionHtml.from_layer(layer, ROOT)
+    collection.format_links = format_links
+    return {
+        "CollectionsList": CollectionsHtml(
+            collections=[collection] * 10, format_links=format_links
+        ),
+        "Collection": collection,
+        "CollectionItems": CollectionItemsHtml(
+            format_links=format_links,
+            next_link=None,
+            prev_link=None,
+            features=features,
+            collection_id=layer.id,
+            unique_field_name="fid",
+        ),
+        "Feature": CollectionItemHtml(
+            collection_id=layer.id,
+            feature_id="0",
+            format_links=format_links,
+            properties={key: str(value) for key, value in features[0].items()},
+        ),
+    }
+
+
+def render_with_new_environment(template_name: str, data: object, locale: Locales):
+    env = Environment(
+        extensions=["jinja2.ext.i18n"],
+        loader=PackageLoader("oaff.app", path.join("responses", "templates", "html")),
+        autoescape=select_autoescape(["html"]),
+    )
+    env.install_gettext_translations(get_translations_for_locale(locale))  # type: ignore
+    frontend_config = get_frontend_configuration()
+    return env.get_template(f"{template_name}.jinja2").render(
+        response=data,
+        api_url_base=frontend_config.api_url_base,
+        asset_url_base=frontend_config.asset_url_base,
+    )
+
+
+def measure(
+    iterations: int,
+    render: Callable[[str, object, Locales], str],
+    template_name: str,
+    data: object,
+) -> float:
+    start = perf_counter()
+    for _ in range(iterations):
+        render(template_name, data, LOCALE)
+    return (perf_counter() - start) / iterations
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    set_frontend_configuration(
+        FrontendConfiguration(
+            asset_url_base="/assets",
+            api_url_base="",
+            endpoint_format_switcher=lambda url, format, type: url,
+            next_page_link_generator=lambda url, cursor=None: url,
+            prev_page_link_generator=lambda url: url,
+            openapi_path_html="/docs",
+            openapi_path_json="/openapi.json",
+        )
+    )
+    for template_name, data in pages().items():
+        before = measure(iterations, render_with_new_environment, template_name, data)
+        after = measure(iterations, get_rendered_html, template_name, data)
+        print(
+            f"{template_name:<16} new environment: {before * 1e6:8.1f}µs, "
+            f"precompiled: {after * 1e6:6.1f}µs per page"
+        )
@@ -0,0 +1,86 @@
+import os
+from http import HTTPStatus
+from typing import Final
+
+from oaff.testing.data.load.db import update_db
+from oaff.testing.integration_tests.common import get_collection_id_for, reconfigure
+from oaff.testing.integration_tests.common_pg import (
+    create_common,
+    drop_common,
+    table_pnt_4326,
+    truncate_common,
+)
+
+SOURCE_NAME: Final = "stac"
+COUNT_MODE_VAR: Final = f"APP_POSTGRESQL_COUNT_MODE_{SOURCE_NAME}"
+BASE_URL: Final = "/collections/{collection_id}/items?limit={limit}&format=json"
+
+
+def setup_module():
+    drop_common(SOURCE_NAME)
+    os.environ["APP_DATA_SOURCE_TYPES"] = "postgresql"
+    os.environ["APP_POSTGRESQL_SOURCE_NAMES"] = SOURCE_NAME
+    os.environ[f"APP_POSTGRESQL_MAC_{SOURCE_NAME}"] = "0"
+    create_common(SOURCE_NAME)
+
+
+def teardown_module():
+    drop_common(SOURCE_NAME)
+
+
+def teardown_function():
+    truncate_common(SOURCE_NAME)
+    if COUNT_MODE_VAR in os.environ:
+        del os.environ[COUNT_MODE_VAR]
+
+
+def test_count_none(test_app):
+    os.environ[COUNT_MODE_VAR] = "none"
+    collection_id = _item_setup(test_app)
+    response = test_app.get(BASE_URL.format(collection_id=collection_id, limit=2))
+    assert response.status_code == HTTPStatus.OK
+    response_content = response.json()
+    assert "numberMatched" not in response_content
+    assert response_content["numberReturned"] == 2
+    assert (
+        len(list(filter(lambda link: link["rel"] == "next", response_content["links"])))
+        == 1
+    )
+
+
+def test_count_none_last_page(test_app):
+    os.environ[COUNT_MODE_VAR] = "none"
+    collection_id = _item_setup(test_app)
+    response_content = test_app.get(
+        BASE_URL.format(collection_id=collection_id, limit=3)
+    ).json()
+    assert response_content["numberReturned"] == 3
+    assert (
+        len(list(filter(lambda link: link["rel"] == "next", response_content["links"])))
+        == 0
+    )
+
+
+def test_count_estimated(test_app):
+    os.environ[COUNT_MODE_VAR] = "estimated"
+    collection_id = _item_setup(test_app)
+    update_db(f"ANALYZE {table_pnt_4326}", SOURCE_NAME)
+    response_content = test_app.get(
+        BASE_URL.format(collection_id=collection_id, limit=2)
+    ).json()
+    assert response_content["numberMatched"] == 3
+    assert response_content["numberMatchedEstimated"] is True
+
+
+def _item_setup(test_app) -> str:
+    update_db(
+        f"""
+        INSERT INTO {table_pnt_4326} (location) VALUES
+        (ST_GeomFromText('POINT(0 1)', 4326)),
+        (ST_GeomFromText('POINT(1 1)', 4326)),
+        (ST_GeomFromText('POINT(2 1)', 4326))
+        """,
+        SOURCE_NAME,
+    )
+    reconfigure(test_app)
+    return get_collection_id_for(test_app, table_pnt_4326)
@@ -0,0 +1,113 @@
+import os
+from http import HTTPStatus
+from typing import Final
+from uuid import uuid4
+
+from oaff.testing.data.load.db import update_db
+from oaff.testing.integration_tests.common import get_collection_id_for, reconfigure
+from oaff.testing.integration_tests.common_pg import (
+    create_common,
+    drop_common,
+    table_mply_4326,
+    truncate_common,
+)
+
+SOURCE_NAME: Final = "stac"
+ITEM_NAMES: Final = [str(uuid4()) for i in range(3)]
+BASE_URL: Final = "/collections/{collection_id}/items?limit={limit}&format=json"
+CURSOR_URL: Final = f"{BASE_URL}&cursor={{cursor}}"
+
+
+def setup_module():
+    drop_common(SOURCE_NAME)
+    os.environ["APP_DATA_SOURCE_TYPES"] = "postgresql"
+    os.environ["APP_POSTGRESQL_SOURCE_NAMES"] = SOURCE_NAME
+    os.environ[f"APP_POSTGRESQL_MAC_{SOURCE_NAME}"] = "0"
+    create_common(SOURCE_NAME)
+
+
+def teardown_module():
+    drop_common(SOURCE_NAME)
+
+
+def teardown_function():
+    truncate_common(SOURCE_NAME)
+    if "APP_KEYSET_PAGINATION" in os.environ:
+        del os.environ["APP_KEYSET_PAGINATION"]
+
+
+def test_cursor_pages(test_app):
+    _item_setup(test_app)
+    collection_id = get_collection_id_for(test_app, table_mply_4326)
+    first_page = test_app.get(
+        BASE_URL.format(collection_id=collection_id, limit=2)
+    ).json()
+    first_ids = [feature["id"] for feature in first_page["features"]]
+    assert first_ids == sorted(first_ids)
+    response = test_app.get(
+        CURSOR_URL.format(collection_id=collection_id, limit=2, cursor=first_ids[0])
+    )
+    assert response.status_code == HTTPStatus.OK
+    response_content = response.json()
+    assert response_content["numberMatched"] == 3
+    assert response_content["numberReturned"] == 2
+    assert [feature["id"] for feature in response_content["features"]][0] == (
+        first_ids[1]
+    )
+    assert (
+        len(list(filter(lambda link: link["rel"] == "prev", response_content["links"])))
+        == 0
+    )
+    assert list(filter(lambda link: link["rel"] == "next", response_content["links"]))[0][
+        "href"
+    ].endswith(
+        CURSOR_URL.format(
+            collection_id=collection_id,
+            limit=2,
+            cursor=response_content["features"][-1]["id"],
+        )
+    )
+
+
+def test_cursor_past_end(test_app):
+    _item_setup(test_app)
+    collection_id = get_collection_id_for(test_app, table_mply_4326)
+    last_page = test_app.get(BASE_URL.format(collection_id=collection_id, limit=3)).json()
+    response_content = test_app.get(
+        CURSOR_URL.format(
+            collection_id=collection_id,
+            limit=3,
+            cursor=last_page["features"][-1]["id"],
+        )
+    ).json()
+    assert response_content["numberReturned"] == 0
+    assert (
+        len(list(filter(lambda link: link["rel"] == "next", response_content["links"])))
+        == 0
+    )
+
+
+def test_keyset_pagination_setting(test_app):
+    os.environ["APP_KEYSET_PAGINATION"] = "1"
+    _item_setup(test_app)
+    collection_id = get_collection_id_for(test_app, table_mply_4326)
+    response_content = test_app.get(
+        BASE_URL.format(collection_id=collection_id, limit=1)
+    ).json()
+    assert list(filter(lambda link: link["rel"] == "next", response_content["links"]))[0][
+        "href"
+    ].endswith(f"&cursor={response_content['features'][0]['id']}")
+
+
+def _item_setup(test_app):
+    for item_name in ITEM_NAMES:
+        update_db(
+            f"""
+            INSERT INTO {table_mply_4326} (name, boundary) VALUES
+            ('{item_name}', ST_GeomFromText('MULTIPOLYGON (((
+                0 0, 0 1, 1 1, 1 0, 0 0
+            )))', 4326))
+            """,
+            SOURCE_NAME,
+        )
+    reconfigure(test_app)
@@ -0,0 +1,107 @@
+import os
+from http import HTTPStatus
+from time import sleep
+from typing import Final
+
+from oaff.testing.data.load.db import update_db
+from oaff.testing.integration_tests.common import get_collection_id_for, reconfigure
+from oaff.testing.integration_tests.common_pg import (
+    create_common,
+    drop_common,
+    table_pnt_4326,
+    truncate_common,
+)
+
+SOURCE_NAME: Final = "stac"
+BASE_URL: Final = "/collections/{collection_id}/items?format=json"
+# table statistics are reported shortly after commit rather than at commit
+STATISTICS_DELAY_SECONDS: Final = 2
+
+
+def setup_module():
+    drop_common(SOURCE_NAME)
+    os.environ["APP_DATA_SOURCE_TYPES"] = "postgresql"
+    os.environ["APP_POSTGRESQL_SOURCE_NAMES"] = SOURCE_NAME
+    os.environ[f"APP_POSTGRESQL_MAC_{SOURCE_NAME}"] = "0"
+    create_common(SOURCE_NAME)
+
+
+def teardown_module():
+    drop_common(SOURCE_NAME)
+
+
+def teardown_function():
+    truncate_common(SOURCE_NAME)
+
+
+def test_etag(test_app):
+    collection_id = _item_setup(test_app)
+    response = test_app.get(BASE_URL.format(collection_id=collection_id))
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"].startswith('W/"')
+
+
+def test_not_modified(test_app):
+    collection_id = _item_setup(test_app)
+    etag = test_app.get(BASE_URL.format(collection_id=collection_id)).headers["ETag"]
+    response = test_app.get(
+        BASE_URL.format(collection_id=collection_id),
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert len(response.content) == 0
+
+
+def test_modified(test_app):
+    collection_id = _item_setup(test_app)
+    etag = test_app.get(BASE_URL.format(collection_id=collection_id)).headers["ETag"]
+    update_db(
+        f"INSERT INTO {table_pnt_4326} (location) "
+        "VALUES (ST_GeomFromText('POINT(3 1)', 4326))",
+        SOURCE_NAME,
+    )
+    sleep(STATISTICS_DELAY_SECONDS)
+    response = test_app.get(
+        BASE_URL.format(collection_id=collection_id),
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+    assert len(response.json()["features"]) == 4
+
+
+def test_etag_per_request(test_app):
+    collection_id = _item_setup(test_app)
+    assert (
+        test_app.get(BASE_URL.format(collection_id=collection_id)).headers["ETag"]
+        != test_app.get(
+            f"{BASE_URL.format(collection_id=collection_id)}&limit=1"
+        ).headers["ETag"]
+    )
+
+
+def test_feature_not_modified(test_app):
+    collection_id = _item_setup(test_app)
+    feature_id = test_app.get(BASE_URL.format(collection_id=collection_id)).json()[
+        "features"
+    ][0]["id"]
+    feature_url = f"/collections/{collection_id}/items/{feature_id}?format=json"
+    etag = test_app.get(feature_url).headers["ETag"]
+    response = test_app.get(feature_url, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def _item_setup(test_app) -> str:
+    update_db(
+        f"""
+        INSERT INTO {table_pnt_4326} (location) VALUES
+        (ST_GeomFromText('POINT(0 1)', 4326)),
+        (ST_GeomFromText('POINT(1 1)', 4326)),
+        (ST_GeomFromText('POINT(2 1)', 4326))
+        """,
+        SOURCE_NAME,
+    )
+    sleep(STATISTICS_DELAY_SECONDS)
+    reconfigure(test_app)
+    return get_collection_id_for(test_app, table_pnt_4326)
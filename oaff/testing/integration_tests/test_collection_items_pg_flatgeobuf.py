@@ -0,0 +1,97 @@
+import os
+from http import HTTPStatus
+from typing import Final
+
+from oaff.app.responses.response_format import ResponseFormat
+from oaff.app.responses.response_type import ResponseType
+from oaff.testing.data.load.db import query, update_db
+from oaff.testing.integration_tests.common import get_collection_id_for, reconfigure
+from oaff.testing.integration_tests.common_pg import (
+    create_common,
+    drop_common,
+    table_pnt_4326,
+    truncate_common,
+)
+
+SOURCE_NAME: Final = "stac"
+FLATGEOBUF_MIME_TYPE: Final = ResponseFormat.flatgeobuf[ResponseType.DATA]
+
+
+def setup_module():
+    drop_common(SOURCE_NAME)
+    os.environ["APP_DATA_SOURCE_TYPES"] = "postgresql"
+    os.environ["APP_POSTGRESQL_SOURCE_NAMES"] = SOURCE_NAME
+    os.environ[f"APP_POSTGRESQL_MAC_{SOURCE_NAME}"] = "0"
+    create_common(SOURCE_NAME)
+
+
+def teardown_module():
+    drop_common(SOURCE_NAME)
+
+
+def teardown_function():
+    truncate_common(SOURCE_NAME)
+
+
+def test_flatgeobuf_advertised_if_supported(test_app):
+    collection_id = _item_setup(test_app)
+    collection = test_app.get(f"/collections/{collection_id}?format=json").json()
+    items = test_app.get(f"/collections/{collection_id}/items?format=json").json()
+    for links in [collection["links"], items["links"]]:
+        assert (
+            FLATGEOBUF_MIME_TYPE in [link["type"] for link in links]
+        ) == _flatgeobuf_supported()
+
+
+def test_items(test_app):
+    collection_id = _item_setup(test_app)
+    response = test_app.get(f"/collections/{collection_id}/items?format=flatgeobuf")
+    if _flatgeobuf_supported():
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["content-type"] == FLATGEOBUF_MIME_TYPE
+        assert response.content.startswith(b"fgb")
+    else:
+        assert response.status_code == HTTPStatus.NOT_ACCEPTABLE
+
+
+def test_items_empty_page(test_app):
+    collection_id = _item_setup(test_app)
+    response = test_app.get(
+        f"/collections/{collection_id}/items?format=flatgeobuf&offset=10"
+    )
+    assert response.status_code == (
+        HTTPStatus.OK if _flatgeobuf_supported() else HTTPStatus.NOT_ACCEPTABLE
+    )
+
+
+def test_feature(test_app):
+    collection_id = _item_setup(test_app)
+    feature_id = test_app.get(f"/collections/{collection_id}/items?format=json").json()[
+        "features"
+    ][0]["id"]
+    response = test_app.get(
+        f"/collections/{collection_id}/items/{feature_id}?format=flatgeobuf"
+    )
+    if _flatgeobuf_supported():
+        assert response.status_code == HTTPStatus.OK
+        assert response.content.startswith(b"fgb")
+    else:
+        assert response.status_code == HTTPStatus.NOT_ACCEPTABLE
+
+
+def _flatgeobuf_supported() -> bool:
+    version = query("SELECT PostGIS_Lib_Version()", SOURCE_NAME)[0][0]
+    return tuple(int(part) for part in version.split(".")[:2]) >= (3, 2)
+
+
+def _item_setup(test_app) -> str:
+    update_db(
+        f"""
+        INSERT INTO {table_pnt_4326} (location) VALUES
+        (ST_GeomFromText('POINT(0 1)', 4326)),
+        (ST_GeomFromText('POINT(1 1)', 4326))
+        """,
+        SOURCE_NAME,
+    )
+    reconfigure(test_app)
+    return get_collection_id_for(test_app, table_pnt_4326)
@@ -0,0 +1,90 @@
+import os
+from http import HTTPStatus
+from typing import Final
+
+from oaff.testing.data.load.db import update_db
+from oaff.testing.integration_tests.common import get_collection_id_for, reconfigure
+from oaff.testing.integration_tests.common_pg import (
+    create_common,
+    drop_common,
+    table_pnt_4326,
+    truncate_common,
+)
+
+SOURCE_NAME: Final = "stac"
+BASE_URL: Final = "/collections/{collection_id}/items?format=json"
+
+
+def setup_module():
+    drop_common(SOURCE_NAME)
+    os.environ["APP_DATA_SOURCE_TYPES"] = "postgresql"
+    os.environ["APP_POSTGRESQL_SOURCE_NAMES"] = SOURCE_NAME
+    os.environ[f"APP_POSTGRESQL_MAC_{SOURCE_NAME}"] = "0"
+    os.environ["APP_PAGE_CACHE"] = "memory"
+    create_common(SOURCE_NAME)
+
+
+def teardown_module():
+    del os.environ["APP_PAGE_CACHE"]
+    drop_common(SOURCE_NAME)
+
+
+def teardown_function():
+    truncate_common(SOURCE_NAME)
+
+
+def test_cached_until_invalidated(test_app):
+    collection_id = _item_setup(test_app)
+    assert _feature_count(test_app, collection_id) == 3
+    _insert_point(3)
+    assert _feature_count(test_app, collection_id) == 3
+    response = test_app.post(f"/control/collections/{collection_id}/invalidate")
+    assert response.status_code == HTTPStatus.OK
+    assert _feature_count(test_app, collection_id) == 4
+
+
+def test_cached_per_page(test_app):
+    collection_id = _item_setup(test_app)
+    first_page = test_app.get(f"{BASE_URL.format(collection_id=collection_id)}&limit=2")
+    second_page = test_app.get(
+        f"{BASE_URL.format(collection_id=collection_id)}&limit=2&offset=2"
+    )
+    assert len(first_page.json()["features"]) == 2
+    assert len(second_page.json()["features"]) == 1
+    assert (
+        len(
+            test_app.get(
+                f"{BASE_URL.format(collection_id=collection_id)}&limit=2"
+            ).json()["features"]
+        )
+        == 2
+    )
+
+
+def test_cleared_on_reconfigure(test_app):
+    collection_id = _item_setup(test_app)
+    assert _feature_count(test_app, collection_id) == 3
+    _insert_point(3)
+    reconfigure(test_app)
+    assert _feature_count(test_app, collection_id) == 4
+
+
+def _feature_count(test_app, collection_id: str) -> int:
+    response = test_app.get(BASE_URL.format(collection_id=collection_id))
+    assert response.status_code == HTTPStatus.OK
+    return len(response.json()["features"])
+
+
+def _insert_point(x: int) -> None:
+    update_db(
+        f"INSERT INTO {table_pnt_4326} (location) "
+        f"VALUES (ST_GeomFromText('POINT({x} 1)', 4326))",
+        SOURCE_NAME,
+    )
+
+
+def _item_setup(test_app) -> str:
+    for x in range(3):
+        _insert_point(x)
+    reconfigure(test_app)
+    return get_collection_id_for(test_app, table_pnt_4326)
@@ -0,0 +1,95 @@
+import os
+from datetime import datetime
+from time import sleep
+from typing import Any, Dict, Final, List
+
+from pytz import timezone
+
+from oaff.app.util import datetime_as_rfc3339
+from oaff.testing.data.load.db import update_db
+from oaff.testing.integration_tests.common import get_collection_id_for, reconfigure
+from oaff.testing.integration_tests.common_pg import (
+    create_common,
+    drop_common,
+    insert_table_pnt_4326_2_instants_utc_with,
+    table_pnt_4326,
+    table_pnt_4326_2_instants_utc,
+    truncate_common,
+)
+
+SOURCE_NAME: Final = "stac"
+COLLECTION_URL: Final = "/collections/{collection_id}?format=json"
+
+
+def setup_module():
+    drop_common(SOURCE_NAME)
+    os.environ["APP_DATA_SOURCE_TYPES"] = "postgresql"
+    os.environ["APP_POSTGRESQL_SOURCE_NAMES"] = SOURCE_NAME
+    os.environ[f"APP_POSTGRESQL_MAC_{SOURCE_NAME}"] = "0"
+    os.environ[f"APP_POSTGRESQL_EXTENT_MODE_{SOURCE_NAME}"] = "estimated"
+    create_common(SOURCE_NAME)
+
+
+def teardown_module():
+    del os.environ[f"APP_POSTGRESQL_EXTENT_MODE_{SOURCE_NAME}"]
+    drop_common(SOURCE_NAME)
+
+
+def teardown_function():
+    truncate_common(SOURCE_NAME)
+
+
+def test_interval_converges_to_exact(test_app):
+    instants = [
+        timezone("UTC").localize(datetime(2020, month, 1)) for month in range(1, 7)
+    ]
+    insert_table_pnt_4326_2_instants_utc_with(SOURCE_NAME, instants[1], instants[2])
+    insert_table_pnt_4326_2_instants_utc_with(SOURCE_NAME, instants[3], instants[4])
+    update_db(f"ANALYZE {table_pnt_4326_2_instants_utc}", SOURCE_NAME)
+    # not yet reflected in statistics, so only found by the exact refresh
+    insert_table_pnt_4326_2_instants_utc_with(SOURCE_NAME, instants[0], instants[5])
+    reconfigure(test_app)
+    estimated = [datetime_as_rfc3339(instants[1]), datetime_as_rfc3339(instants[4])]
+    exact = [datetime_as_rfc3339(instants[0]), datetime_as_rfc3339(instants[5])]
+    intervals = _poll(
+        test_app,
+        table_pnt_4326_2_instants_utc,
+        lambda collection: collection["extent"]["temporal"]["interval"][0],
+        exact,
+    )
+    assert intervals[0] in [estimated, exact]
+    assert intervals[-1] == exact
+
+
+def test_bbox_converges_to_exact(test_app):
+    for x in range(4):
+        update_db(
+            f"INSERT INTO {table_pnt_4326} (location) "
+            f"VALUES (ST_GeomFromText('POINT({x} {x})', 4326))",
+            SOURCE_NAME,
+        )
+    update_db(f"ANALYZE {table_pnt_4326}", SOURCE_NAME)
+    reconfigure(test_app)
+    bboxes = _poll(
+        test_app,
+        table_pnt_4326,
+        lambda collection: collection["extent"]["spatial"]["bbox"][0],
+        [0, 0, 3, 3],
+    )
+    assert bboxes[-1] == [0, 0, 3, 3]
+
+
+def _poll(test_app, table_name: str, value_of, expected: Any) -> List[Any]:
+    # the exact refresh runs in the background, advancing as requests are served
+    values = list()
+    for _ in range(20):
+        values.append(value_of(_get_collection_by_title(test_app, table_name)))
+        if values[-1] == expected:
+            break
+        sleep(0.1)
+    return values
+
+
+def _get_collection_by_title(test_app, collection_title: str) -> Dict[str, Any]:
+    collection_id = get_collection_id_for(test_app, collection_title)
+    return test_app.get(COLLECTION_URL.format(collection_id=collection_id)).json()
@@ -0,0 +1,74 @@
+import os
+from http import HTTPStatus
+from time import sleep
+from typing import Any, Dict, Final
+
+from oaff.testing.data.load.db import update_db
+from oaff.testing.integration_tests.common import get_collection_id_for, reconfigure
+from oaff.testing.integration_tests.common_pg import (
+    create_common,
+    drop_common,
+    table_pnt_4326,
+    truncate_common,
+)
+
+SOURCE_NAME: Final = "stac"
+COLLECTION_URL: Final = "/collections/{collection_id}?format=json"
+ITEMS_URL: Final = "/collections/{collection_id}/items?format=json"
+
+
+def setup_module():
+    drop_common(SOURCE_NAME)
+    os.environ["APP_DATA_SOURCE_TYPES"] = "postgresql"
+    os.environ["APP_POSTGRESQL_SOURCE_NAMES"] = SOURCE_NAME
+    os.environ[f"APP_POSTGRESQL_MAC_{SOURCE_NAME}"] = "0"
+    create_common(SOURCE_NAME)
+
+
+def teardown_module():
+    drop_common(SOURCE_NAME)
+
+
+def teardown_function():
+    update_db(f"ALTER TABLE {table_pnt_4326} DROP COLUMN IF EXISTS note", SOURCE_NAME)
+    truncate_common(SOURCE_NAME)
+
+
+def test_changed_data_rediscovered(test_app):
+    reconfigure(test_app)
+    _insert_point(SOURCE_NAME, 3)
+    # row modification counts are reported to statistics asynchronously
+    sleep(1)
+    _reconfigure_incremental(test_app)
+    assert _get_collection_by_title(test_app, table_pnt_4326)["extent"]["spatial"][
+        "bbox"
+    ] == [[3, 3, 3, 3]]
+
+
+def test_altered_table_rediscovered(test_app):
+    reconfigure(test_app)
+    _insert_point(SOURCE_NAME, 1)
+    update_db(f"ALTER TABLE {table_pnt_4326} ADD COLUMN note TEXT", SOURCE_NAME)
+    _reconfigure_incremental(test_app)
+    collection_id = get_collection_id_for(test_app, table_pnt_4326)
+    response = test_app.get(ITEMS_URL.format(collection_id=collection_id))
+    assert response.status_code == HTTPStatus.OK
+    assert "note" in response.json()["features"][0]["properties"]
+
+
+def _reconfigure_incremental(test_app):
+    response = test_app.post("/control/reconfigure?incremental=true")
+    assert response.status_code == HTTPStatus.OK
+
+
+def _insert_point(source_name: str, coordinate: int) -> None:
+    update_db(
+        f"INSERT INTO {table_pnt_4326} (location) "
+        f"VALUES (ST_GeomFromText('POINT({coordinate} {coordinate})', 4326))",
+        source_name,
+    )
+
+
+def _get_collection_by_title(test_app, collection_title: str) -> Dict[str, Any]:
+    collection_id = get_collection_id_for(test_app, collection_title)
+    return test_app.get(COLLECTION_URL.format(collection_id=collection_id)).json()
@@ -0,0 +1,82 @@
+import os
+from http import HTTPStatus
+from typing import Final
+
+from oaff.testing.data.load.db import update_db
+from oaff.testing.integration_tests.common import get_collection_id_for, reconfigure
+from oaff.testing.integration_tests.common_pg import (
+    create_common,
+    drop_common,
+    table_pnt_4326,
+    truncate_common,
+)
+
+SOURCE_NAME: Final = "stac"
+TILE_URL: Final = "/collections/{collection_id}/tiles/{tms}/{z}/{x}/{y}"
+
+
+def setup_module():
+    drop_common(SOURCE_NAME)
+    os.environ["APP_DATA_SOURCE_TYPES"] = "postgresql"
+    os.environ["APP_POSTGRESQL_SOURCE_NAMES"] = SOURCE_NAME
+    os.environ[f"APP_POSTGRESQL_MAC_{SOURCE_NAME}"] = "0"
+    create_common(SOURCE_NAME)
+
+
+def teardown_module():
+    drop_common(SOURCE_NAME)
+
+
+def teardown_function():
+    truncate_common(SOURCE_NAME)
+
+
+def test_tile_with_features(test_app):
+    collection_id = _item_setup(test_app)
+    response = test_app.get(_tile_url(collection_id, 0, 0, 0))
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/vnd.mapbox-vector-tile"
+    assert len(response.content) > 0
+
+
+def test_tile_without_features(test_app):
+    collection_id = _item_setup(test_app)
+    # north-west corner of the world at zoom 4, far from all inserted points
+    response = test_app.get(_tile_url(collection_id, 4, 0, 0))
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.content) == 0
+
+
+def test_tile_out_of_range(test_app):
+    collection_id = _item_setup(test_app)
+    assert (
+        test_app.get(_tile_url(collection_id, 1, 2, 0)).status_code
+        == HTTPStatus.NOT_FOUND
+    )
+
+
+def test_tile_matrix_set_unsupported(test_app):
+    collection_id = _item_setup(test_app)
+    assert (
+        test_app.get(_tile_url(collection_id, 0, 0, 0, "WorldCRS84Quad")).status_code
+        == HTTPStatus.NOT_FOUND
+    )
+
+
+def _tile_url(
+    collection_id: str, z: int, x: int, y: int, tms: str = "WebMercatorQuad"
+) -> str:
+    return TILE_URL.format(collection_id=collection_id, tms=tms, z=z, x=x, y=y)
+
+
+def _item_setup(test_app) -> str:
+    update_db(
+        f"""
+        INSERT INTO {table_pnt_4326} (location) VALUES
+        (ST_GeomFromText('POINT(0 1)', 4326)),
+        (ST_GeomFromText('POINT(1 1)', 4326))
+        """,
+        SOURCE_NAME,
+    )
+    reconfigure(test_app)
+    return get_collection_id_for(test_app, table_pnt_4326)